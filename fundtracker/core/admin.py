@@ -1,10 +1,17 @@
+import os
+
 from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
 from .models import (
     Project, Fund, Progress, AuditLog, UserProfile,
     ContractorProfile, ContractorCertificate, ContractorSkill,
     Material, MaterialPayment, ProgressImage,
-    IssueReport, IssueEvidence, ContractorRating, RatingEvidence
+    IssueReport, IssueEvidence, ContractorRating, RatingEvidence,
+    ImageFingerprint, RequestProfile, DistrictStats
 )
+from .streaming import is_asgi, iterate_in_thread
 
 
 # Inline classes
@@ -56,7 +63,8 @@ class MaterialPaymentInline(admin.TabularInline):
 # Model Admin classes
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ("user", "role", "nepal_nid", "nid_verified")
+    list_display = ("user", "role", "nepal_nid", "nid_verified", "nid_checked_at", "nid_district", "nid_ward")
+    list_select_related = ("user",)
     list_filter = ("role", "nid_verified")
     search_fields = ("user__username", "nepal_nid")
 
@@ -64,6 +72,7 @@ class UserProfileAdmin(admin.ModelAdmin):
 @admin.register(ContractorProfile)
 class ContractorProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "rating", "is_suspended", "skill_level", "years_of_experience", "test_passed")
+    list_select_related = ("user",)
     list_filter = ("is_suspended", "skill_level", "test_passed")
     search_fields = ("user__username",)
     inlines = [CertificateInline, SkillInline]
@@ -89,6 +98,7 @@ class ContractorProfileAdmin(admin.ModelAdmin):
 @admin.register(ContractorCertificate)
 class ContractorCertificateAdmin(admin.ModelAdmin):
     list_display = ("name", "contractor", "issuing_authority", "issue_date", "expiry_date", "verified")
+    list_select_related = ("contractor__user",)
     list_filter = ("verified", "issuing_authority")
     search_fields = ("name", "contractor__user__username")
 
@@ -96,6 +106,7 @@ class ContractorCertificateAdmin(admin.ModelAdmin):
 @admin.register(ContractorSkill)
 class ContractorSkillAdmin(admin.ModelAdmin):
     list_display = ("skill_name", "contractor", "proficiency_level", "years_of_practice", "verified")
+    list_select_related = ("contractor__user",)
     list_filter = ("verified", "proficiency_level")
     search_fields = ("skill_name", "contractor__user__username")
 
@@ -130,6 +141,7 @@ class ProjectAdmin(admin.ModelAdmin):
 @admin.register(Fund)
 class FundAdmin(admin.ModelAdmin):
     list_display = ("project", "amount", "released_at", "blockchain_confirmed")
+    list_select_related = ("project",)
     list_filter = ("blockchain_confirmed",)
     search_fields = ("project__name",)
 
@@ -137,6 +149,7 @@ class FundAdmin(admin.ModelAdmin):
 @admin.register(Progress)
 class ProgressAdmin(admin.ModelAdmin):
     list_display = ("project", "physical_progress", "financial_progress", "date", "status", "submitted_by")
+    list_select_related = ("project", "submitted_by")
     list_filter = ("status", "date")
     search_fields = ("project__name",)
 
@@ -144,11 +157,13 @@ class ProgressAdmin(admin.ModelAdmin):
 @admin.register(ProgressImage)
 class ProgressImageAdmin(admin.ModelAdmin):
     list_display = ("progress", "uploaded_at")
+    list_select_related = ("progress__project",)
 
 
 @admin.register(Material)
 class MaterialAdmin(admin.ModelAdmin):
     list_display = ("name", "project", "unit", "planned_quantity", "unit_price", "total_planned_cost", "verified")
+    list_select_related = ("project",)
     list_filter = ("verified", "unit")
     search_fields = ("name", "project__name", "supplier_name")
     inlines = [MaterialPaymentInline]
@@ -158,6 +173,7 @@ class MaterialAdmin(admin.ModelAdmin):
 @admin.register(MaterialPayment)
 class MaterialPaymentAdmin(admin.ModelAdmin):
     list_display = ("material", "amount", "payment_date", "status", "payment_reference")
+    list_select_related = ("material__project",)
     list_filter = ("status",)
     search_fields = ("payment_reference", "material__name")
 
@@ -165,6 +181,7 @@ class MaterialPaymentAdmin(admin.ModelAdmin):
 @admin.register(IssueReport)
 class IssueReportAdmin(admin.ModelAdmin):
     list_display = ("title", "project", "issue_type", "severity", "status", "is_forgivable", "is_forgiven")
+    list_select_related = ("project",)
     list_filter = ("issue_type", "severity", "status", "is_forgiven")
     search_fields = ("title", "project__name")
     inlines = [IssueEvidenceInline]
@@ -187,12 +204,14 @@ class IssueReportAdmin(admin.ModelAdmin):
 @admin.register(IssueEvidence)
 class IssueEvidenceAdmin(admin.ModelAdmin):
     list_display = ("issue", "evidence_type", "uploaded_by", "uploaded_at")
+    list_select_related = ("issue__project", "uploaded_by")
     list_filter = ("evidence_type",)
 
 
 @admin.register(ContractorRating)
 class ContractorRatingAdmin(admin.ModelAdmin):
     list_display = ("contractor", "project", "rating_value", "rated_by", "is_negative", "evidence_required", "evidence_provided", "is_verified")
+    list_select_related = ("contractor__user", "project", "rated_by")
     list_filter = ("is_negative", "is_verified", "rating_value")
     search_fields = ("contractor__user__username", "project__name")
     inlines = [RatingEvidenceInline]
@@ -201,12 +220,146 @@ class ContractorRatingAdmin(admin.ModelAdmin):
 @admin.register(RatingEvidence)
 class RatingEvidenceAdmin(admin.ModelAdmin):
     list_display = ("rating", "evidence_type", "uploaded_at")
+    list_select_related = ("rating__contractor__user",)
     list_filter = ("evidence_type",)
 
 
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ("timestamp", "user", "action", "model_name", "object_id")
+    list_select_related = ("user",)
     list_filter = ("action", "model_name")
     search_fields = ("user__username", "model_name", "object_id")
 
+
+
+@admin.register(ImageFingerprint)
+class ImageFingerprintAdmin(admin.ModelAdmin):
+    list_display = ("source_model", "source_id", "project", "phash", "created_at")
+    list_select_related = ("project",)
+    list_filter = ("source_model",)
+    search_fields = ("phash",)
+
+
+# ✅ Request Profiling - Browse the `?_profile=1` ring buffer
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "method", "path", "status", "duration_ms", "db_ms", "queries", "mode", "user")
+    list_select_related = ("user",)
+    list_filter = ("mode", "method", "route")
+    search_fields = ("path", "route", "user__username")
+    fields = (
+        "created_at", "user", "mode", "method", "path", "route", "status",
+        "duration_ms", "db_ms", "serialize_ms", "queries",
+        "stacks", "field_tree", "sql_queries", "top_functions",
+    )
+    readonly_fields = ("stacks", "field_tree", "sql_queries", "top_functions")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<path:object_id>/stacks/",
+                self.admin_site.admin_view(self.download_stacks),
+                name="core_requestprofile_stacks",
+            ),
+        ] + super().get_urls()
+
+    def download_stacks(self, request, object_id):
+        profile = self.get_object(request, object_id)
+        if profile is None or not self.has_view_permission(request, profile):
+            raise Http404
+        filename = os.path.join(profile.directory, profile.stacks_filename)
+        if not os.path.exists(filename):
+            raise Http404
+        response = FileResponse(
+            open(filename, "rb"),
+            as_attachment=True,
+            filename=f"profile-{profile.id}-{profile.stacks_filename}",
+        )
+        if is_asgi(request):
+            # Under WSGI the file goes to wsgi.file_wrapper as is
+            response.streaming_content = iterate_in_thread(
+                response.streaming_content, thread_sensitive=False
+            )
+        return response
+
+    def profile_data(self, obj):
+        if not hasattr(obj, "_profile_data"):
+            obj._profile_data = obj.load()
+        return obj._profile_data
+
+    @admin.display(description="Stacks")
+    def stacks(self, obj):
+        url = reverse("admin:core_requestprofile_stacks", args=[obj.id])
+        if obj.mode == "SAMPLE":
+            samples = self.profile_data(obj).get("samples", 0)
+            return format_html(
+                '<a href="{}">{}</a> ({} samples) - open in speedscope.app or flamegraph.pl',
+                url, obj.stacks_filename, samples,
+            )
+        return format_html('<a href="{}">{}</a> - open with snakeviz or pstats', url, obj.stacks_filename)
+
+    @admin.display(description="Serializer fields")
+    def field_tree(self, obj):
+        rows = self.profile_data(obj).get("fields") or []
+        return format_html(
+            "<table><tr><th>Field</th><th>Calls</th><th>ms</th><th>Self ms</th></tr>{}</table>",
+            format_html_join(
+                "",
+                '<tr><td style="padding-left: {}em">{}</td><td>{}</td><td>{}</td><td>{}</td></tr>',
+                ((row["depth"] * 1.5, row["field"], row["calls"], row["ms"], row["self_ms"]) for row in rows),
+            ),
+        )
+
+    @admin.display(description="SQL")
+    def sql_queries(self, obj):
+        rows = self.profile_data(obj).get("sql") or []
+        return format_html(
+            "<table><tr><th>#</th><th>ms</th><th>From</th><th>SQL</th></tr>{}</table>",
+            format_html_join(
+                "",
+                "<tr><td>{}</td><td>{}</td><td>{}<br>{}</td><td><code>{}</code><br><small>{}</small></td></tr>",
+                (
+                    (number, row["ms"], row["field"] or "", row["location"] or "", row["sql"], row["params"])
+                    for number, row in enumerate(rows, 1)
+                ),
+            ),
+        )
+
+    @admin.display(description="cProfile (by cumulative time)")
+    def top_functions(self, obj):
+        rows = self.profile_data(obj).get("functions") or []
+        if not rows:
+            return "-"
+        return format_html(
+            "<table><tr><th>Function</th><th>Calls</th><th>Self ms</th><th>Cumulative ms</th></tr>{}</table>",
+            format_html_join(
+                "",
+                "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+                ((row["function"], row["calls"], row["self_ms"], row["cumulative_ms"]) for row in rows),
+            ),
+        )
+
+
+# ✅ District Rollups - Maintained by core.districts, read-only here
+@admin.register(DistrictStats)
+class DistrictStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "district_code", "name", "residents", "reporters", "reported_issues",
+        "projects", "total_budget", "issues", "refreshed_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -6,8 +6,11 @@ from .api_views import (
     ContractorProfileViewSet, ContractorCertificateViewSet, ContractorSkillViewSet,
     MaterialViewSet, MaterialPaymentViewSet,
     IssueReportViewSet, IssueEvidenceViewSet,
-    ContractorRatingViewSet, RatingEvidenceViewSet
+    ContractorRatingViewSet, RatingEvidenceViewSet,
+    UploadSessionViewSet, SyncView, SearchView, DistrictStatsView
 )
+from .event_views import event_stream
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'projects', ProjectViewSet, basename='project')
@@ -36,6 +39,21 @@ router.register(r'issue-evidence', IssueEvidenceViewSet, basename='issue-evidenc
 router.register(r'contractor-ratings', ContractorRatingViewSet, basename='contractor-rating')
 router.register(r'rating-evidence', RatingEvidenceViewSet, basename='rating-evidence')
 
+# ✅ Resumable Uploads
+router.register(r'upload-sessions', UploadSessionViewSet, basename='upload-session')
+
 urlpatterns = [
+    # ✅ Incremental Sync
+    path('sync/', SyncView.as_view(), name='sync'),
+    path('search/', SearchView.as_view(), name='search'),
+    # ✅ District Rollups
+    path('districts/', DistrictStatsView.as_view(), name='district-stats'),
+    # ✅ Live Activity
+    path('events/', event_stream, name='events'),
+    # ✅ Async Read Path - Same payloads as the project routes, for ASGI deployments
+    path('public/projects/', async_views.project_list, name='public-project-list'),
+    path('public/projects/<int:pk>/', async_views.project_detail, name='public-project-detail'),
+    path('public/projects/<int:pk>/materials/', async_views.project_materials, name='public-project-materials'),
+    path('public/projects/<int:pk>/issues/', async_views.project_issues, name='public-project-issues'),
     path('', include(router.urls)),
 ]
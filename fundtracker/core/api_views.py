@@ -1,17 +1,35 @@
+import csv
+import hashlib
+import json
+import os
+import re
+from itertools import islice
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Avg, Count, Sum
+from django.db.models.functions import Substr
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from rest_framework import viewsets, status
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import serializers
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import (
-    Project, Progress, ProgressImage, AuditLog,
+    Project, ProgressImage, AuditLog,
     ContractorProfile, ContractorCertificate, ContractorSkill,
-    Material, MaterialPayment, IssueReport, IssueEvidence,
-    ContractorRating, RatingEvidence
+    MaterialPayment, IssueReport, IssueEvidence,
+    RatingEvidence, UploadSession, ImageFingerprint, SearchEntry, DistrictStats
 )
 from .serializers import (
     ProjectSerializer,
+    ProjectMapSerializer,
     ProgressSerializer,
+    ProgressReviewSerializer,
     ProgressImageSerializer,
     AuditLogSerializer,
     ContractorProfileSerializer,
@@ -22,13 +40,26 @@ from .serializers import (
     IssueReportSerializer,
     IssueEvidenceSerializer,
     ContractorRatingSerializer,
-    RatingEvidenceSerializer
+    RatingEvidenceSerializer,
+    UploadSessionSerializer,
+    DistrictStatsSerializer
 )
 from .permissions import IsGovernment, IsAuditor, IsContractor
+from .sync import changes_since, SyncCursorError, SyncCursorExpired
+from .db_routers import pin_to_primary
+from .querysets import (
+    project_queryset, progress_queryset, material_queryset, issue_queryset,
+    issue_evidence_queryset, contractor_profile_queryset, contractor_rating_queryset,
+    audit_log_queryset
+)
+from .values_serializers import ValuesListMixin, ValuesSerializer
+from . import geo
+from .search import result, search
+from .streaming import streaming_content
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.all()
+    queryset = project_queryset()
     serializer_class = ProjectSerializer
     
     @action(detail=True, methods=['get'])
@@ -37,7 +68,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         ✅ Material Transparency - Get all materials for a project
         """
         project = self.get_object()
-        materials = Material.objects.filter(project=project)
+        materials = material_queryset().filter(project=project)
         serializer = MaterialSerializer(materials, many=True)
         return Response(serializer.data)
     
@@ -47,13 +78,135 @@ class ProjectViewSet(viewsets.ModelViewSet):
         ✅ Issue Reporting System - Get all issues for a project
         """
         project = self.get_object()
-        issues = IssueReport.objects.filter(project=project)
+        issues = issue_queryset().filter(project=project)
         serializer = IssueReportSerializer(issues, many=True)
         return Response(serializer.data)
 
+    # ✅ Project Map - Geocoded projects in an area, near a point, or counted per map cell
+
+    def map_projects(self, queryset):
+        """Map rows of queryset, or None when there are more than GEO_MAX_RESULTS"""
+        rows = ValuesSerializer(ProjectMapSerializer()).serialize(
+            queryset.order_by('-id')[:settings.GEO_MAX_RESULTS + 1]
+        )
+        return rows if len(rows) <= settings.GEO_MAX_RESULTS else None
+
+    def too_many_projects(self):
+        return Response(
+            {
+                'error': f'More than {settings.GEO_MAX_RESULTS} projects; '
+                         f'narrow the area or use /api/projects/grid/'
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    @action(detail=False, methods=['get'])
+    def bbox(self, request):
+        """
+        GET /api/projects/bbox/?bbox=min_lng,min_lat,max_lng,max_lat lists the
+        geocoded projects inside the box, at most GEO_MAX_RESULTS
+        """
+        try:
+            box = geo.parse_bbox(request.query_params.get('bbox', ''))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        rows = self.map_projects(Project.objects.filter(geo.bbox_filter(box)))
+        return self.too_many_projects() if rows is None else Response(rows)
+
+    @action(detail=False, methods=['get'])
+    def near(self, request):
+        """
+        GET /api/projects/near/?lat=27.7&lng=85.3&radius_km=10 lists the
+        geocoded projects within radius_km (GEO_NEAR_DEFAULT_KM, at most
+        GEO_NEAR_MAX_KM), nearest first, each with its distance_km
+        """
+        try:
+            latitude = float(request.query_params['lat'])
+            longitude = float(request.query_params['lng'])
+            radius = float(request.query_params.get('radius_km', settings.GEO_NEAR_DEFAULT_KM))
+        except (KeyError, ValueError):
+            return Response({'error': 'lat and lng are required numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and 0 < radius <= settings.GEO_NEAR_MAX_KM):
+            return Response(
+                {'error': f'lat must be within -90..90, lng -180..180 and radius_km 0..{settings.GEO_NEAR_MAX_KM}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        box = geo.radius_bbox(latitude, longitude, radius)
+        rows = self.map_projects(Project.objects.filter(geo.bbox_filter(box)))
+        if rows is None:
+            return self.too_many_projects()
+        nearby = []
+        for row in rows:
+            distance = geo.distance_km(latitude, longitude, row['latitude'], row['longitude'])
+            if distance <= radius:
+                row['distance_km'] = round(distance, 3)
+                nearby.append(row)
+        nearby.sort(key=lambda row: row['distance_km'])
+        return Response(nearby)
+
+    @action(detail=False, methods=['get'])
+    def grid(self, request):
+        """
+        GET /api/projects/grid/?zoom=7&bbox=... counts projects, their budget
+        and their issues per geohash cell, with cells sized for the web map
+        zoom level (or an explicit geohash ?precision=1-9). Without bbox it
+        covers every geocoded project.
+        """
+        params = request.query_params
+        try:
+            if 'precision' in params:
+                precision = int(params['precision'])
+            else:
+                precision = geo.precision_for_zoom(int(params.get('zoom', settings.GEO_DEFAULT_ZOOM)))
+        except ValueError:
+            return Response({'error': 'zoom and precision must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= precision <= geo.GEOHASH_PRECISION:
+            return Response(
+                {'error': f'precision must be within 1..{geo.GEOHASH_PRECISION}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        projects = Project.objects.exclude(geohash='')
+        issues = IssueReport.objects.exclude(project__geohash='')
+        if 'bbox' in params:
+            try:
+                box = geo.parse_bbox(params['bbox'])
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            projects = projects.filter(geo.bbox_filter(box))
+            issues = issues.filter(geo.bbox_filter(box, prefix='project__'))
+
+        issue_counts = dict(
+            issues.annotate(cell=Substr('project__geohash', 1, precision))
+            .values('cell').annotate(count=Count('id')).values_list('cell', 'count')
+        )
+        cells = (
+            projects.annotate(cell=Substr('geohash', 1, precision))
+            .values('cell')
+            .annotate(
+                projects=Count('id'), total_budget=Sum('total_budget'),
+                latitude=Avg('latitude'), longitude=Avg('longitude'),
+            )
+            .order_by('cell')
+        )
+        budget = serializers.DecimalField(max_digits=None, decimal_places=2)
+        result = []
+        for cell in cells:
+            min_lat, min_lng, max_lat, max_lng = geo.geohash_bounds(cell['cell'])
+            result.append({
+                'cell': cell['cell'],
+                # Mean of the projects' points, where a marker for the cell belongs
+                'latitude': round(cell['latitude'], 6),
+                'longitude': round(cell['longitude'], 6),
+                'bounds': [min_lng, min_lat, max_lng, max_lat],
+                'projects': cell['projects'],
+                'total_budget': budget.to_representation(cell['total_budget']),
+                'issues': issue_counts.get(cell['cell'], 0),
+            })
+        return Response({'precision': precision, 'cells': result})
+
 
 class ProgressViewSet(viewsets.ModelViewSet):
-    queryset = Progress.objects.all()
+    queryset = progress_queryset()
     serializer_class = ProgressSerializer
     
     def create(self, request, *args, **kwargs):
@@ -98,11 +251,17 @@ class ProgressViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def pending(self, request):
         """Get all pending progress submissions"""
-        pending_progress = Progress.objects.filter(status='PENDING')
-        serializer = self.get_serializer(pending_progress, many=True)
+        pending_progress = list(progress_queryset().filter(status='PENDING'))
+        context = self.get_serializer_context()
+        context['near_duplicates'] = ImageFingerprint.near_duplicates_by_source(
+            'ProgressImage',
+            [image.id for progress in pending_progress for image in progress.images.all()]
+        )
+        serializer = ProgressReviewSerializer(pending_progress, many=True, context=context)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[IsGovernment])
+    @pin_to_primary
     def approve(self, request, pk=None):
         """Approve a progress submission (Government only)"""
         progress = self.get_object()
@@ -124,6 +283,7 @@ class ProgressViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[IsGovernment])
+    @pin_to_primary
     def reject(self, request, pk=None):
         """Reject a progress submission (Government only)"""
         progress = self.get_object()
@@ -150,8 +310,8 @@ class ProgressImageViewSet(viewsets.ModelViewSet):
     serializer_class = ProgressImageSerializer
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = AuditLog.objects.all().order_by('-timestamp')
+class AuditLogViewSet(ValuesListMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = audit_log_queryset().order_by('-timestamp')
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
     
@@ -161,6 +321,94 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
             return [IsAuthenticated()]
         return super().get_permissions()
 
+    EXPORT_FIELDS = ['id', 'user', 'username', 'action', 'model_name', 'object_id', 'timestamp', 'description']
+    EXPORT_CHUNK_SIZE = 2000
+    timestamp_field = serializers.DateTimeField()
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        ✅ Audit Export - Stream the whole audit log as NDJSON (default) or CSV
+        Query params: export_format=ndjson|csv, start, end (ISO date or datetime),
+        model_name, action
+        """
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            return Response(
+                {'error': 'export_format must be "ndjson" or "csv"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = AuditLog.objects.select_related('user').only(
+            'id', 'user__username', 'action', 'model_name', 'object_id', 'timestamp', 'description'
+        ).order_by('timestamp', 'id')
+        for param, lookup in (('start', 'timestamp__gte'), ('end', 'timestamp__lte')):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                moment = parse_datetime(value)
+                if moment is None and parse_date(value) is not None:
+                    moment = parse_datetime(f'{value}T23:59:59.999999' if param == 'end' else f'{value}T00:00:00')
+            except ValueError:
+                # Well formed but impossible, e.g. 2024-13-45
+                moment = None
+            if moment is None:
+                return Response(
+                    {'error': f'Invalid {param}: expected an ISO date or datetime'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            queryset = queryset.filter(**{lookup: moment})
+        for param in ('model_name', 'action'):
+            value = request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(**{param: value})
+
+        content_type = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(
+            streaming_content(request, self.export_chunks(queryset, export_format)),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="audit-log.{export_format}"'
+        return response
+
+    def export_chunks(self, queryset, export_format):
+        """The export as one string per EXPORT_CHUNK_SIZE rows, read from the database as it goes"""
+        rows = (self.export_row(log) for log in queryset.iterator(chunk_size=self.EXPORT_CHUNK_SIZE))
+        if export_format == 'csv':
+            lines = self.csv_lines(rows)
+        else:
+            lines = (json.dumps(row) + '\n' for row in rows)
+        while chunk := ''.join(islice(lines, self.EXPORT_CHUNK_SIZE)):
+            yield chunk
+
+    def export_row(self, log):
+        return {
+            'id': log.id,
+            'user': log.user_id,
+            'username': log.user.username if log.user_id else None,
+            'action': log.action,
+            'model_name': log.model_name,
+            'object_id': log.object_id,
+            'timestamp': self.timestamp_field.to_representation(log.timestamp),
+            'description': log.description,
+        }
+
+    def csv_lines(self, rows):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(self.EXPORT_FIELDS)
+        for row in rows:
+            yield writer.writerow([row[field] for field in self.EXPORT_FIELDS])
+
+
+class EchoBuffer:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
 
 # ✅ Contractor Qualification System ViewSets
 class ContractorProfileViewSet(viewsets.ModelViewSet):
@@ -173,9 +421,9 @@ class ContractorProfileViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if hasattr(user, 'profile'):
             if user.profile.role in ['GOVERNMENT', 'AUDITOR']:
-                return ContractorProfile.objects.all()
+                return contractor_profile_queryset()
             elif user.profile.role == 'CONTRACTOR':
-                return ContractorProfile.objects.filter(user=user)
+                return contractor_profile_queryset().filter(user=user)
         return ContractorProfile.objects.none()
     
     @action(detail=True, methods=['get'])
@@ -204,7 +452,7 @@ class ContractorProfileViewSet(viewsets.ModelViewSet):
         """
         ✅ Suspension System - Get all suspended contractors
         """
-        suspended = ContractorProfile.objects.filter(is_suspended=True)
+        suspended = contractor_profile_queryset().filter(is_suspended=True)
         serializer = self.get_serializer(suspended, many=True)
         return Response(serializer.data)
 
@@ -242,17 +490,18 @@ class ContractorSkillViewSet(viewsets.ModelViewSet):
 
 
 # ✅ Material Transparency ViewSets
-class MaterialViewSet(viewsets.ModelViewSet):
-    queryset = Material.objects.all()
+class MaterialViewSet(ValuesListMixin, viewsets.ModelViewSet):
+    queryset = material_queryset()
     serializer_class = MaterialSerializer
     
     def get_queryset(self):
         project_id = self.request.query_params.get('project')
         if project_id:
-            return Material.objects.filter(project_id=project_id)
-        return Material.objects.all()
+            return material_queryset().filter(project_id=project_id)
+        return material_queryset()
     
     @action(detail=True, methods=['post'], permission_classes=[IsGovernment])
+    @pin_to_primary
     def verify(self, request, pk=None):
         """Government can verify material entries"""
         material = self.get_object()
@@ -280,13 +529,14 @@ class MaterialPaymentViewSet(viewsets.ModelViewSet):
 
 # ✅ Issue Reporting System ViewSets
 class IssueReportViewSet(viewsets.ModelViewSet):
-    queryset = IssueReport.objects.all()
+    queryset = issue_queryset()
     serializer_class = IssueReportSerializer
     
     def perform_create(self, serializer):
         serializer.save(reported_by=self.request.user if self.request.user.is_authenticated else None)
     
     @action(detail=True, methods=['post'], permission_classes=[IsGovernment])
+    @pin_to_primary
     def verify(self, request, pk=None):
         """
         ✅ Issue Reporting System - Government verifies issue reports
@@ -309,6 +559,7 @@ class IssueReportViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[IsGovernment])
+    @pin_to_primary
     def forgive(self, request, pk=None):
         """
         ✅ Forgiveness System - Natural disasters can be forgiven
@@ -341,6 +592,7 @@ class IssueReportViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[IsGovernment])
+    @pin_to_primary
     def penalize(self, request, pk=None):
         """
         ✅ Issue Reporting System - Apply penalty to contractor
@@ -379,7 +631,7 @@ class IssueReportViewSet(viewsets.ModelViewSet):
 
 
 class IssueEvidenceViewSet(viewsets.ModelViewSet):
-    queryset = IssueEvidence.objects.all()
+    queryset = issue_evidence_queryset()
     serializer_class = IssueEvidenceSerializer
     permission_classes = [IsAuthenticated]
     
@@ -388,8 +640,8 @@ class IssueEvidenceViewSet(viewsets.ModelViewSet):
 
 
 # ✅ Proof-Based Ratings ViewSets
-class ContractorRatingViewSet(viewsets.ModelViewSet):
-    queryset = ContractorRating.objects.all()
+class ContractorRatingViewSet(ValuesListMixin, viewsets.ModelViewSet):
+    queryset = contractor_rating_queryset()
     serializer_class = ContractorRatingSerializer
     permission_classes = [IsAuthenticated]
     
@@ -397,6 +649,7 @@ class ContractorRatingViewSet(viewsets.ModelViewSet):
         serializer.save(rated_by=self.request.user)
     
     @action(detail=True, methods=['post'], permission_classes=[IsGovernment])
+    @pin_to_primary
     def verify(self, request, pk=None):
         """
         ✅ Proof-Based Ratings - Verify and apply rating
@@ -438,3 +691,250 @@ class RatingEvidenceViewSet(viewsets.ModelViewSet):
     serializer_class = RatingEvidenceSerializer
     permission_classes = [IsAuthenticated]
 
+
+
+# ✅ Resumable Uploads - Chunked uploads for large evidence files (videos)
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+UPLOAD_READ_SIZE = 64 * 1024
+
+
+def remove_part_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def part_file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        while data := part.read(UPLOAD_READ_SIZE):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+class UploadSessionViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    Resumable upload protocol:
+    1. POST /upload-sessions/ with target, issue/rating, filename and total_size
+    2. PUT /upload-sessions/{id}/chunk/ with the raw bytes and a
+       "Content-Range: bytes <start>-<end>/<total>" header, repeated until done.
+       After a dropped connection, GET /upload-sessions/{id}/ returns
+       received_size, the offset to resume from.
+    3. POST /upload-sessions/{id}/finalize/ to create the evidence record,
+       optionally with {"sha256": "<hex digest>"} to have the bytes checked
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(uploaded_by=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(uploaded_by=self.request.user)
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        """Append one chunk, streamed from the request body straight to disk"""
+        session = self.get_object()
+        if session.status != 'ACTIVE':
+            return Response(
+                {'error': 'Upload session is already finalized'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        match = CONTENT_RANGE_RE.match(request.headers.get('Content-Range', ''))
+        if not match:
+            return Response(
+                {'error': 'Content-Range header required',
+                 'message': 'Expected "Content-Range: bytes <start>-<end>/<total>"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        start, end, total = (int(value) for value in match.groups())
+        length = end - start + 1
+        if total != session.total_size or end < start or end >= total:
+            return Response(
+                {'error': 'Invalid Content-Range for this upload',
+                 'total_size': session.total_size},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if length > settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE:
+            return Response(
+                {'error': 'Chunk too large',
+                 'max_chunk_size': settings.CHUNKED_UPLOAD_MAX_CHUNK_SIZE},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+        if int(request.META.get('CONTENT_LENGTH') or 0) != length:
+            return Response(
+                {'error': 'Content-Length does not match Content-Range'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+        part_exists = os.path.exists(session.part_path)
+        received = os.path.getsize(session.part_path) if part_exists else 0
+        if start > received:
+            return Response(
+                {'error': 'Chunk does not continue the upload',
+                 'received_size': received},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        remaining = length
+        with open(session.part_path, 'r+b' if part_exists else 'wb') as part:
+            part.seek(start)
+            while remaining:
+                data = request.stream.read(min(UPLOAD_READ_SIZE, remaining))
+                if not data:
+                    break
+                part.write(data)
+                remaining -= len(data)
+
+        received = max(received, end + 1 - remaining)
+        UploadSession.objects.filter(pk=session.pk).update(
+            received_size=received, updated_at=timezone.now()
+        )
+        return Response(
+            {'id': session.id, 'received_size': received, 'total_size': session.total_size},
+            status=status.HTTP_400_BAD_REQUEST if remaining else status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """Attach the completed upload to a new evidence record in one transaction"""
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=self.get_object().pk)
+            if session.target == 'ISSUE_EVIDENCE':
+                evidence_model, evidence_serializer = IssueEvidence, IssueEvidenceSerializer
+            else:
+                evidence_model, evidence_serializer = RatingEvidence, RatingEvidenceSerializer
+
+            if session.status == 'COMPLETED':
+                evidence = evidence_model.objects.get(pk=session.evidence_id)
+                return Response(evidence_serializer(evidence, context=self.get_serializer_context()).data)
+
+            received = os.path.getsize(session.part_path) if os.path.exists(session.part_path) else 0
+            if received != session.total_size:
+                return Response(
+                    {'error': 'Upload incomplete',
+                     'received_size': received,
+                     'total_size': session.total_size},
+                    status=status.HTTP_409_CONFLICT
+                )
+            expected_sha256 = str(request.data.get('sha256', '')).lower()
+            if expected_sha256 and part_file_sha256(session.part_path) != expected_sha256:
+                return Response(
+                    {'error': 'Checksum mismatch',
+                     'message': 'Re-send the chunks, then finalize again'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if session.target == 'ISSUE_EVIDENCE':
+                evidence = IssueEvidence(issue=session.issue, uploaded_by=session.uploaded_by)
+            else:
+                evidence = RatingEvidence(rating=session.rating)
+            evidence.evidence_type = session.evidence_type
+            evidence.description = session.description
+            with open(session.part_path, 'rb') as part:
+                evidence.file.save(session.filename, File(part), save=False)
+            evidence.save()
+
+            session.status = 'COMPLETED'
+            session.received_size = received
+            session.evidence_id = evidence.id
+            session.save()
+
+            part_path = session.part_path
+            transaction.on_commit(lambda: remove_part_file(part_path))
+
+        return Response(
+            evidence_serializer(evidence, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+# ✅ Incremental Sync
+class SyncView(APIView):
+    """
+    GET /api/sync/?since=<cursor> returns projects, funds, progress, materials,
+    issues and (for signed-in users) contractor ratings changed after the
+    cursor, plus the ids deleted since then:
+
+        {"changes": {"projects": [...], ...}, "deleted": {"projects": [3], ...},
+         "cursor": "<next since>", "has_more": false}
+
+    Omit `since` for the first sync. Keep requesting with the returned cursor
+    while has_more is true. A 410 response means the cursor is too old; drop
+    the local cache and sync from scratch.
+    """
+
+    def get(self, request):
+        try:
+            payload = changes_since(
+                request.query_params.get('since'),
+                request.user,
+                context={'request': request}
+            )
+        except SyncCursorExpired as e:
+            return Response({'error': str(e)}, status=status.HTTP_410_GONE)
+        except SyncCursorError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(payload)
+
+
+# ✅ Full-Text Search
+class SearchView(APIView):
+    """
+    GET /api/search/?q=kath road returns the best matching projects, issues,
+    materials and (for signed-in users) contractors, best first:
+
+        [{"type": "project", "id": 12, "project": 12, "title": "Kathmandu Road
+          Upgrade #12", "subtitle": "Kathmandu", "score": 8.31}, ...]
+
+    Every word must match the start of a word in the name, title, location,
+    ministry, contractor, description, supplier or username. `type` limits
+    the result to a comma-separated list of types; `limit` defaults to
+    SEARCH_RESULT_LIMIT, at most SEARCH_MAX_RESULTS.
+    """
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        if not query.strip():
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        kinds = [kind for kind, _ in SearchEntry.KIND_CHOICES]
+        if 'type' in request.query_params:
+            requested = [kind.strip() for kind in request.query_params['type'].split(',') if kind.strip()]
+            unknown = sorted(set(requested) - set(kinds))
+            if unknown:
+                return Response(
+                    {'error': f"Unknown type {', '.join(unknown)}; use {', '.join(kinds)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            kinds = [kind for kind in kinds if kind in requested]
+        if not request.user.is_authenticated:
+            # Contractor profiles are only listed to signed-in users
+            kinds = [kind for kind in kinds if kind != 'contractor']
+
+        try:
+            limit = int(request.query_params.get('limit', settings.SEARCH_RESULT_LIMIT))
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.SEARCH_MAX_RESULTS))
+
+        return Response([result(entry) for entry in search(query, kinds, limit)])
+
+
+# ✅ District Rollups
+class DistrictStatsView(APIView):
+    """
+    GET /api/districts/ lists every district (by NID district code) with its
+    residents, the residents who reported issues and their reports, and the
+    projects located there, their budget and the issues on them. The rows
+    are precomputed (core.districts); refreshed_at says when each was last
+    recomputed. Government and auditor users only.
+    """
+    permission_classes = [IsGovernment | IsAuditor]
+
+    def get(self, request):
+        return Response(DistrictStatsSerializer(DistrictStats.objects.all(), many=True).data)
@@ -0,0 +1,74 @@
+"""
+✅ Async Read Path - Async-native versions of the hot public read endpoints
+
+Served under /api/public/ with the same payloads as the matching
+ProjectViewSet routes. Queries go through Django's async ORM, so under ASGI
+(``fundtracker.asgi``) a request waiting on the database does not hold a
+worker thread. Every relation a serializer touches is loaded up front by
+core.querysets: lazy loading is not allowed in async code and would raise
+SynchronousOnlyOperation.
+
+The format is negotiated like DRF's views do (``Accept`` or ``?format=``),
+between JSON and MessagePack; the browsable API is only on the DRF routes.
+"""
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+
+from .models import Project
+from .querysets import project_queryset, material_queryset, issue_queryset
+from .renderers import ORJSONRenderer, MessagePackRenderer
+from .serializers import ProjectSerializer, MaterialSerializer, IssueReportSerializer
+
+RENDERERS = [ORJSONRenderer(), MessagePackRenderer()]
+
+
+def render(request, data, status=200):
+    # Same bytes, Content-Type and Vary as the API's DRF views
+    try:
+        renderer, media_type = DefaultContentNegotiation().select_renderer(Request(request), RENDERERS)
+    except NotAcceptable as exc:
+        renderer, media_type = RENDERERS[0], RENDERERS[0].media_type
+        data, status = {'detail': exc.detail}, exc.status_code
+    response = HttpResponse(renderer.render(data, media_type), content_type=renderer.media_type, status=status)
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def render_not_found(request):
+    return render(request, {'detail': 'No Project matches the given query.'}, status=404)
+
+
+@require_GET
+async def project_list(request):
+    projects = [project async for project in project_queryset()]
+    return render(request, ProjectSerializer(projects, many=True, context={'request': request}).data)
+
+
+@require_GET
+async def project_detail(request, pk):
+    try:
+        project = await project_queryset().aget(pk=pk)
+    except Project.DoesNotExist:
+        return render_not_found(request)
+    return render(request, ProjectSerializer(project, context={'request': request}).data)
+
+
+@require_GET
+async def project_materials(request, pk):
+    if not await Project.objects.filter(pk=pk).aexists():
+        return render_not_found(request)
+    materials = [material async for material in material_queryset().filter(project_id=pk)]
+    # Like ProjectViewSet.materials, without request context (relative file URLs)
+    return render(request, MaterialSerializer(materials, many=True).data)
+
+
+@require_GET
+async def project_issues(request, pk):
+    if not await Project.objects.filter(pk=pk).aexists():
+        return render_not_found(request)
+    issues = [issue async for issue in issue_queryset().filter(project_id=pk)]
+    return render(request, IssueReportSerializer(issues, many=True).data)
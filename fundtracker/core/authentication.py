@@ -0,0 +1,26 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .performance import timed
+
+
+class QueryParamJWTAuthentication(JWTAuthentication):
+    """
+    JWT passed as ?token=<access token>, for clients that cannot set an
+    Authorization header (<img>/<video> tags, EventSource). Only enabled
+    on the views that need it.
+    """
+
+    def authenticate(self, request):
+        raw_token = request.query_params.get('token')
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token.encode())
+        return self.get_user(validated_token), validated_token
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that reports its time to PerformanceMiddleware"""
+
+    def authenticate(self, request):
+        with timed('auth'):
+            return super().authenticate(request)
@@ -0,0 +1,175 @@
+"""
+✅ Benchmarks - Shared helpers for the benchmark management commands
+
+``api_cases`` lists one request per API route; the bench_api command times
+them and the endpoint suite in core.tests checks them for N+1 queries.
+"""
+import json
+import math
+
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from .models import Project
+
+API_URLCONFS = ('core.api_urls', 'core.auth_urls')
+
+# Routes that are not plain request/response reads
+SKIPPED_ROUTES = {
+    'events': 'endless event stream',
+    'register': 'creates a user on every request',
+}
+
+# Unsafe routes that are still safe to repeat: name -> body builder
+POST_BODIES = {
+    'login': lambda username, password: {'username': username, 'password': password},
+}
+
+# Reads that need a query string: name -> query string
+QUERY_STRINGS = {
+    'search': 'q=road',
+    'project-bbox': 'bbox=85.2,27.6,85.5,27.8',
+    'project-near': 'lat=27.7172&lng=85.324&radius_km=25',
+    'project-grid': 'zoom=7',
+}
+
+# Plain Django views with a pk, which have no queryset to pick one from
+FUNCTION_VIEW_MODELS = {
+    'public-project-detail': Project,
+    'public-project-materials': Project,
+    'public-project-issues': Project,
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(latencies, elapsed):
+    """Throughput and latency percentiles (milliseconds) for one run"""
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def compare(baseline, current, max_latency_regression=0.2, latency_slack_ms=1.0):
+    """
+    Regressions of current against baseline, both {name: result} maps: p95
+    latency above baseline * (1 + max_latency_regression) + latency_slack_ms,
+    or more SQL queries per request. Names missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        limit = before['p95_ms'] * (1 + max_latency_regression) + latency_slack_ms
+        if result['p95_ms'] > limit:
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.2f} ms > {limit:.2f} ms (was {before['p95_ms']:.2f} ms)"
+            )
+        if result.get('queries') is not None and before.get('queries') is not None \
+                and result['queries'] > before['queries']:
+            regressions.append(f"{name}: {result['queries']} queries per request (was {before['queries']})")
+    return regressions
+
+
+class Case:
+    """One API request"""
+
+    def __init__(self, name, method, path, body=None, headers=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = json.dumps(body) if body is not None else None
+        self.headers = headers or {}
+
+    @property
+    def key(self):
+        return f'{self.method} {self.name}'
+
+
+def iter_routes(patterns, in_scope=False):
+    """(name, view, pattern chain) for every named route included from API_URLCONFS"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            urlconf = getattr(pattern.urlconf_name, '__name__', pattern.urlconf_name)
+            included = in_scope or urlconf in API_URLCONFS
+            for name, callback, chain in iter_routes(pattern.url_patterns, included):
+                yield name, callback, [pattern.pattern] + chain
+        elif isinstance(pattern, URLPattern) and in_scope and pattern.name:
+            yield pattern.name, pattern.callback, [pattern.pattern]
+
+
+def allowed_methods(callback):
+    if getattr(callback, 'actions', None):  # DRF viewset
+        return list(callback.actions)
+    view_class = getattr(callback, 'cls', None)  # DRF APIView or @api_view
+    if view_class is not None:
+        return [method for method in view_class.http_method_names if hasattr(view_class, method)]
+    return ['get']
+
+
+def route_model(name, callback):
+    view_class = getattr(callback, 'cls', None)
+    queryset = getattr(view_class, 'queryset', None)
+    if queryset is not None:
+        return queryset.model
+    serializer_class = getattr(view_class, 'serializer_class', None)
+    if serializer_class is not None:
+        return serializer_class.Meta.model
+    return FUNCTION_VIEW_MODELS.get(name)
+
+
+def api_cases(auth_headers, username, password, routes=()):
+    """
+    One read (or repeatable POST) per API route, with primary keys filled in
+    from the database. Returns (cases, {route name: reason it was skipped}).
+    routes optionally limits the result to names containing one of its items.
+    """
+    cases, skipped = [], {}
+    seen = set()
+    for name, callback, chain in iter_routes(get_resolver().url_patterns):
+        if name in seen:  # DRF also registers each route with a format suffix
+            continue
+        seen.add(name)
+        if routes and not any(part in name for part in routes):
+            continue
+        if name in SKIPPED_ROUTES:
+            skipped[name] = SKIPPED_ROUTES[name]
+            continue
+
+        methods = allowed_methods(callback)
+        if 'get' in methods:
+            method, body = 'GET', None
+        elif 'post' in methods and name in POST_BODIES:
+            method, body = 'POST', POST_BODIES[name](username, password)
+        else:
+            skipped[name] = f"{'/'.join(methods).upper()} only; writes are not benchmarked"
+            continue
+
+        kwargs = {}
+        for pattern in chain:
+            kwargs.update(dict.fromkeys(pattern.regex.groupindex))
+        if kwargs:
+            model = route_model(name, callback)
+            pk = model and model.objects.order_by('pk').values_list('pk', flat=True).first()
+            if pk is None:
+                skipped[name] = 'no row to read'
+                continue
+            kwargs = {key: pk for key in kwargs}
+
+        headers = {} if method == 'POST' else auth_headers
+        path = reverse(name, kwargs=kwargs)
+        if name in QUERY_STRINGS:
+            path += '?' + QUERY_STRINGS[name]
+        cases.append(Case(name, method, path, body, headers))
+    return cases, skipped
@@ -0,0 +1,203 @@
+"""
+✅ Response Compression - br, zstd and gzip negotiated from Accept-Encoding
+
+CompressionMiddleware picks the encoding the client accepts with the
+highest q-value, preferring COMPRESSION_ENCODINGS order on ties, and
+compresses the response at COMPRESSION_LEVELS[encoding]. Regular responses
+are compressed in one go; streaming ones (the audit export) chunk by
+chunk, flushed every COMPRESSION_STREAM_FLUSH_BYTES of input so rows keep
+reaching the client while the export runs.
+
+Only COMPRESSION_CONTENT_TYPES are touched: API formats, CSV, NDJSON and
+plain text. Server-sent events must not be buffered, and HTML is left
+alone because admin forms carry CSRF tokens (BREACH). Media passes through
+whatever its type: byte ranges (Accept-Ranges) index the uncompressed
+file, and with X-Accel-Redirect or X-Sendfile the front server sends the
+body. Bodies under COMPRESSION_MIN_SIZE, partial content and responses
+that already have a Content-Encoding pass through too.
+
+Brotli comes with requirements.txt; zstd needs ``pip install zstandard``
+and is simply not offered without it.
+"""
+import gzip
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+Q_VALUE_RE = re.compile(r'^\s*q\s*=\s*([0-9.]+)\s*$', re.IGNORECASE)
+UNCOMPRESSED_STATUSES = (204, 206, 304)
+# Media responses (core.media_views): ranges of the stored bytes, or a body the front server fills in
+PASS_THROUGH_HEADERS = ('Accept-Ranges', 'X-Accel-Redirect', 'X-Sendfile')
+
+
+class GzipStream:
+    def __init__(self, level):
+        # wbits 31: gzip container, zero mtime like gzip.compress(mtime=0)
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        return self.compressor.compress(chunk)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self, level):
+        self.compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self.compressor.process(chunk)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class ZstdStream:
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk):
+        return self.compressor.compress(chunk)
+
+    def flush(self):
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+# Content-Encoding -> (compress a whole body, incremental compressor class)
+ENCODINGS = {'gzip': (lambda data, level: gzip.compress(data, compresslevel=level, mtime=0), GzipStream)}
+if brotli:
+    ENCODINGS['br'] = (lambda data, level: brotli.compress(data, quality=level), BrotliStream)
+if zstandard:
+    ENCODINGS['zstd'] = (lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), ZstdStream)
+
+
+def available_encodings():
+    return [name for name in settings.COMPRESSION_ENCODINGS if name in ENCODINGS]
+
+
+def negotiate(accept_encoding):
+    """The best encoding the client accepts, or None to send the body as is"""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            match = Q_VALUE_RE.match(param)
+            if match:
+                try:
+                    q = float(match.group(1))
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    best, best_q = None, 0.0
+    for name in available_encodings():
+        q = accepted.get(name, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(encoding, data, level=None):
+    whole, _ = ENCODINGS[encoding]
+    return whole(data, settings.COMPRESSION_LEVELS[encoding] if level is None else level)
+
+
+class ChunkCompressor:
+    """Compresses a stream of chunks, flushing once enough input has gone in"""
+
+    def __init__(self, encoding, level):
+        self.stream = ENCODINGS[encoding][1](level)
+        self.flush_bytes = settings.COMPRESSION_STREAM_FLUSH_BYTES
+        self.pending = 0
+
+    def compress(self, chunk):
+        output = self.stream.compress(chunk)
+        self.pending += len(chunk)
+        if self.pending >= self.flush_bytes:
+            output += self.stream.flush()
+            self.pending = 0
+        return output
+
+
+def compress_stream(encoding, chunks, level):
+    compressor = ChunkCompressor(encoding, level)
+    for chunk in chunks:
+        output = compressor.compress(chunk)
+        if output:
+            yield output
+    yield compressor.stream.finish()
+
+
+async def acompress_stream(encoding, chunks, level):
+    compressor = ChunkCompressor(encoding, level)
+    async for chunk in chunks:
+        output = compressor.compress(chunk)
+        if output:
+            yield output
+    yield compressor.stream.finish()
+
+
+def compressible(response):
+    if response.status_code in UNCOMPRESSED_STATUSES or response.has_header('Content-Encoding'):
+        return False
+    if any(response.has_header(header) for header in PASS_THROUGH_HEADERS):
+        return False
+    content_type = response.get('Content-Type', '').partition(';')[0].strip().lower()
+    if content_type not in settings.COMPRESSION_CONTENT_TYPES:
+        return False
+    return response.streaming or len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+
+def compress_response(request, response):
+    if not compressible(response):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+    if encoding is None:
+        return response
+
+    level = settings.COMPRESSION_LEVELS[encoding]
+    if response.streaming:
+        if response.is_async:
+            response.streaming_content = acompress_stream(encoding, response.streaming_content, level)
+        else:
+            response.streaming_content = compress_stream(encoding, response.streaming_content, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        compressed = compress(encoding, response.content, level)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+
+    # The bytes differ per encoding, so a strong validator must not be shared
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    response['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,52 @@
+"""
+✅ Read Replicas - Send request reads to the replica, everything else to the primary
+
+Reads only go to the replica inside requests that ReplicaRoutingMiddleware
+marked as replica-safe: GET/HEAD/OPTIONS requests from clients that have
+not written in the last READ_YOUR_WRITES_SECONDS. Management commands,
+signals outside requests, transactions and views wrapped in
+``pin_to_primary`` always use the primary.
+"""
+import contextvars
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+
+replica_reads_allowed = contextvars.ContextVar('replica_reads_allowed', default=False)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            replica_reads_allowed.get()
+            and REPLICA_ALIAS in settings.DATABASES
+            # Reads inside a transaction must see its own uncommitted writes
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def pin_to_primary(view):
+    """Run a view (or viewset action) with every query on the primary"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = replica_reads_allowed.set(False)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            replica_reads_allowed.reset(token)
+    return wrapper
@@ -0,0 +1,83 @@
+"""
+✅ District Rollups - Per-district counts kept in DistrictStats
+
+A DistrictStats row puts two views of a district side by side: its
+residents (profiles whose NID was issued there, UserProfile.nid_district),
+how many of them reported issues and how many issues they reported, and its
+projects (Project.district_code, from the geocoded location) with their
+budget and the issues reported on them. /api/districts/ reads the 77 rows
+instead of scanning profiles, issues and projects.
+
+Rows are refreshed incrementally: signals collect the districts a write
+touches (the old and the new one when a project moves, an issue changes
+hands or a profile's NID changes) and refresh() recomputes just those rows
+once the transaction commits, a few aggregate queries over indexed columns.
+Bulk writes skip the signals; ``manage.py refresh_district_stats``
+recomputes every district.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import DistrictStats, IssueReport, Project, UserProfile
+
+DISTRICT_CODES = range(1, 78)
+STAT_FIELDS = ['residents', 'reporters', 'reported_issues', 'projects', 'total_budget', 'issues']
+
+
+def compute(codes):
+    """{district code: {stat: value}} for codes"""
+    stats = {code: {name: 0 for name in STAT_FIELDS} for code in codes}
+    for values in stats.values():
+        values['total_budget'] = Decimal('0')
+
+    def add(rows, key, **aggregates):
+        for row in rows.values(key).annotate(**aggregates).order_by():
+            for name in aggregates:
+                stats[row[key]][name] = row[name] or 0
+
+    add(UserProfile.objects.filter(nid_district__in=codes), 'nid_district', residents=Count('id'))
+    add(
+        IssueReport.objects.filter(reported_by__profile__nid_district__in=codes),
+        'reported_by__profile__nid_district',
+        reporters=Count('reported_by', distinct=True),
+        reported_issues=Count('id'),
+    )
+    add(
+        Project.objects.filter(district_code__in=codes),
+        'district_code',
+        projects=Count('id'),
+        total_budget=Sum('total_budget'),
+    )
+    add(IssueReport.objects.filter(project__district_code__in=codes), 'project__district_code', issues=Count('id'))
+    return stats
+
+
+def refresh(codes=None):
+    """Recompute the DistrictStats rows of codes (every district when None)"""
+    codes = sorted(set(DISTRICT_CODES) if codes is None else set(codes) & set(DISTRICT_CODES))
+    if not codes:
+        return
+    rows = [DistrictStats(district_code=code, **values) for code, values in compute(codes).items()]
+    DistrictStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['district_code'],
+        update_fields=[*STAT_FIELDS, 'refreshed_at'],
+    )
+
+
+def schedule_refresh(codes):
+    """Refresh the districts among codes (None entries are ignored) after the transaction commits"""
+    codes = {code for code in codes if code is not None}
+    if codes:
+        transaction.on_commit(lambda: refresh(codes))
+
+
+def project_districts(project_ids):
+    return Project.objects.filter(pk__in=project_ids).values_list('district_code', flat=True)
+
+
+def resident_districts(user_ids):
+    return UserProfile.objects.filter(user_id__in=user_ids).values_list('nid_district', flat=True)
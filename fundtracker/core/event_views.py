@@ -0,0 +1,80 @@
+"""
+✅ Live Activity - Server-sent events for government and auditor dashboards
+
+GET /api/events/ keeps the connection open and pushes progress submissions
+and reviews, issue status changes and contractor suspensions as they commit.
+EventSource cannot set headers, so the access token may also be passed as
+``?token=``. Each idle connection is a coroutine waiting on a queue, so
+serve this through the ASGI application (``fundtracker.asgi``). Under WSGI
+a stream would hold a worker thread for as long as the tab stays open, so
+the view answers 503 there instead and the dashboards poll.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .events import get_broker
+from .streaming import is_asgi
+
+# Tell EventSource how long to wait before reconnecting (milliseconds)
+RETRY_MS = 5000
+REVIEWER_ROLES = ('GOVERNMENT', 'AUDITOR')
+
+
+def reviewer_status(request):
+    """HTTP status refusing the request, or None if the user may watch activity"""
+    header = request.headers.get('Authorization', '')
+    raw_token = header[len('Bearer '):] if header.startswith('Bearer ') else request.GET.get('token')
+    if not raw_token:
+        return 401
+    authentication = JWTAuthentication()
+    try:
+        user = authentication.get_user(authentication.get_validated_token(raw_token.encode()))
+    except (InvalidToken, AuthenticationFailed):
+        return 401
+    profile = getattr(user, 'profile', None)
+    if profile is None or profile.role not in REVIEWER_ROLES:
+        return 403
+    return None
+
+
+async def stream(subscriber):
+    broker = get_broker()
+    heartbeat = settings.EVENT_STREAM_HEARTBEAT_SECONDS
+    try:
+        yield f'retry: {RETRY_MS}\n\n'.encode()
+        while not subscriber.overflowed:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # Comment line; keeps proxies from closing an idle connection
+                yield b': keep-alive\n\n'
+                continue
+            yield event.encode()
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+@require_GET
+async def event_stream(request):
+    if not is_asgi(request):
+        # Any non-200 answer closes an EventSource for good
+        return JsonResponse({'detail': 'Live activity needs the ASGI server.'}, status=503)
+
+    refused = await sync_to_async(reviewer_status)(request)
+    if refused:
+        detail = 'Authentication required.' if refused == 401 else 'Government or auditor role required.'
+        return JsonResponse({'detail': detail}, status=refused)
+
+    subscriber = get_broker().subscribe(request.headers.get('Last-Event-ID'))
+    response = StreamingHttpResponse(stream(subscriber), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Disable nginx response buffering for this stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
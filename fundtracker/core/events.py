@@ -0,0 +1,107 @@
+"""
+✅ Live Activity - In-process pub/sub for review and approval events
+
+Signals publish events after their transaction commits; the SSE view in
+``event_views`` subscribes one asyncio queue per open connection. Delivery is
+thread-safe (sync views run in worker threads under ASGI) and a short history
+is kept so reconnecting clients can replay what they missed via
+``Last-Event-ID``.
+
+InProcessBroker only reaches connections held by the same process. When the
+API runs in several processes, point EVENT_STREAM_BROKER at a class with the
+same ``publish``/``subscribe``/``unsubscribe`` methods backed by a shared
+pub/sub (e.g. Redis).
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Event:
+    def __init__(self, event_id, event_type, data):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+    def encode(self):
+        data = json.dumps(self.data, cls=DjangoJSONEncoder)
+        return f'id: {self.id}\nevent: {self.type}\ndata: {data}\n\n'.encode()
+
+
+class Subscriber:
+    """One open stream: an asyncio queue fed from any thread"""
+
+    def __init__(self, loop, queue_size):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self.put, event)
+        except RuntimeError:
+            # Event loop already closed
+            self.overflowed = True
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up; the stream ends and the client reconnects
+            # with Last-Event-ID to replay from history
+            self.overflowed = True
+
+
+class InProcessBroker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.history = deque(maxlen=settings.EVENT_STREAM_REPLAY_SIZE)
+        # Event ids are "<boot>-<sequence>", so ids from before a restart
+        # are recognised and answered with the whole history
+        self.boot = format(time.time_ns(), 'x')
+        self.sequence = 0
+
+    def publish(self, event_type, data):
+        with self.lock:
+            self.sequence += 1
+            event = Event(f'{self.boot}-{self.sequence}', event_type, data)
+            self.history.append((self.sequence, event))
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.deliver(event)
+        return event
+
+    def subscribe(self, last_event_id=None):
+        """Must be called from the event loop that will read the queue"""
+        subscriber = Subscriber(asyncio.get_running_loop(), settings.EVENT_STREAM_QUEUE_SIZE)
+        with self.lock:
+            if last_event_id:
+                boot, _, sequence = last_event_id.partition('-')
+                after = int(sequence) if boot == self.boot and sequence.isdigit() else 0
+                for event_sequence, event in self.history:
+                    if event_sequence > after:
+                        subscriber.put(event)
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.EVENT_STREAM_BROKER)()
+
+
+def publish_on_commit(event_type, data):
+    transaction.on_commit(lambda: get_broker().publish(event_type, data))
@@ -0,0 +1,296 @@
+"""
+✅ Project Map - Offline geocoding and the geohash index behind the map endpoints
+
+Project.location is free text ("Ward 4, Pokhara, Kaski"). geocode() finds
+the places of the bundled gazetteer (GAZETTEER_PATH: Nepal's 77 districts
+and the larger municipalities, with common spellings as aliases) named in
+it as whole words, and picks the most specific: a municipality over a
+district, and when a district is named too, only a municipality in that
+district. Project.save() stores the place's coordinates, district code
+(the NID district codes, 01-77) and geohash; ``manage.py geocode_projects``
+redoes every project after the gazetteer changes.
+
+The geohash column is indexed, so map queries are index range scans:
+
+- a bounding box is covered by at most GEO_MAX_COVER_CELLS geohash cells,
+  merged into ranges, and then filtered exactly on latitude/longitude;
+- "near me" reads the bounding box of the circle and keeps the projects
+  within the radius, nearest first;
+- the grid groups projects by geohash prefix, longer as the map zooms in.
+
+Coordinates are those of the place, not of the site, so every project in
+Pokhara shares one point.
+"""
+import csv
+import functools
+import math
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # stored length, cells of about 5 m
+EARTH_RADIUS_KM = 6371.0088
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+class Place:
+    """A gazetteer row"""
+
+    def __init__(self, kind, district_code, name, district, latitude, longitude):
+        self.kind = kind
+        self.district_code = district_code
+        self.name = name
+        self.district = district
+        self.latitude = latitude
+        self.longitude = longitude
+
+    def __str__(self):
+        return self.name if self.kind == 'district' else f"{self.name}, {self.district}"
+
+
+def words(text):
+    """Lowercase ASCII words of text, accents dropped"""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return tuple(WORD_RE.findall(text.lower()))
+
+
+@functools.lru_cache(maxsize=None)
+def gazetteer():
+    """{name as words: [Place, ...]} for every name and alias in GAZETTEER_PATH"""
+    index = {}
+    with open(settings.GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            place = Place(
+                row['kind'],
+                int(row['district_code']),
+                row['name'],
+                row['district'],
+                float(row['latitude']),
+                float(row['longitude']),
+            )
+            for name in [row['name'], *filter(None, row['aliases'].split('|'))]:
+                index.setdefault(words(name), []).append(place)
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def district_names():
+    """{district code: name} of the gazetteer's districts"""
+    return {
+        place.district_code: place.name
+        for places in gazetteer().values()
+        for place in places
+        if place.kind == 'district'
+    }
+
+
+def geocode(location):
+    """The most specific gazetteer Place named in location, or None"""
+    index = gazetteer()
+    longest = max(len(name) for name in index)
+    tokens = words(location)
+    found = []  # in the order they appear
+    for start in range(len(tokens)):
+        for length in range(min(longest, len(tokens) - start), 0, -1):
+            found.extend(index.get(tokens[start:start + length], ()))
+    municipalities = [place for place in found if place.kind == 'municipality']
+    districts = [place for place in found if place.kind == 'district']
+    if districts:
+        named = {place.district_code for place in districts}
+        municipalities = [place for place in municipalities if place.district_code in named]
+    candidates = municipalities or districts
+    return candidates[0] if candidates else None
+
+
+def map_fields(location):
+    """Project's map fields for a location"""
+    place = geocode(location)
+    if place is None:
+        return {'latitude': None, 'longitude': None, 'geohash': '', 'district_code': None, 'geocoded_place': ''}
+    return {
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'geohash': geohash_encode(place.latitude, place.longitude),
+        'district_code': place.district_code,
+        'geocoded_place': str(place),
+    }
+
+
+def locate(project):
+    """Set project's map fields from its location"""
+    for name, value in map_fields(project.location).items():
+        setattr(project, name, value)
+
+
+def locate_all(queryset, batch_size=2000):
+    """
+    Geocode every project of queryset in chunks of batch_size ids; returns
+    (geocoded, changed, total). Only projects whose map fields change are
+    written, with a new updated_at so incremental sync sends them, and those
+    at one place together: one UPDATE ... WHERE id IN per place, which beats
+    bulk_update's CASE per row.
+    """
+    names = list(map_fields(''))
+    geocoded = changed = total = 0
+    last_id = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'location', *names)[:batch_size]
+        )
+        if not rows:
+            return geocoded, changed, total
+        by_place = {}
+        for pk, location, *current in rows:
+            fields = map_fields(location)
+            geocoded += fields['geohash'] != ''
+            if list(fields.values()) != current:
+                by_place.setdefault(tuple(fields.values()), []).append(pk)
+        now = timezone.now()
+        for values, ids in by_place.items():
+            queryset.model.objects.filter(pk__in=ids).update(updated_at=now, **dict(zip(names, values)))
+            changed += len(ids)
+        total += len(rows)
+        last_id = rows[-1][0]
+
+
+# Geohash
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    ranges = [[-180.0, 180.0], [-90.0, 90.0]]  # bits alternate, longitude first
+    coordinates = [longitude, latitude]
+    chars, value, bit = [], 0, 0
+    while len(chars) < precision:
+        axis = bit % 2
+        middle = (ranges[axis][0] + ranges[axis][1]) / 2
+        if coordinates[axis] >= middle:
+            value = value * 2 + 1
+            ranges[axis][0] = middle
+        else:
+            value *= 2
+            ranges[axis][1] = middle
+        bit += 1
+        if bit % 5 == 0:
+            chars.append(BASE32[value])
+            value = 0
+    return ''.join(chars)
+
+
+def geohash_bounds(cell):
+    """(min_lat, min_lng, max_lat, max_lng) of a geohash cell"""
+    ranges = [[-180.0, 180.0], [-90.0, 90.0]]
+    bit = 0
+    for char in cell:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            axis = bit % 2
+            middle = (ranges[axis][0] + ranges[axis][1]) / 2
+            ranges[axis][0 if value >> shift & 1 else 1] = middle
+            bit += 1
+    return ranges[1][0], ranges[0][0], ranges[1][1], ranges[0][1]
+
+
+def cell_size(precision):
+    """(height, width) in degrees of the cells of a geohash length"""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** (bits - bits // 2)
+
+
+def precision_for_zoom(zoom):
+    """The shortest geohash whose cells are at most a quarter of a web map tile wide"""
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        if cell_size(precision)[1] <= 360.0 / 2 ** (zoom + 2):
+            return precision
+    return GEOHASH_PRECISION
+
+
+def covering_cells(bbox, max_cells):
+    """
+    The finest geohash cells, at most max_cells of them, that cover bbox;
+    one-character cells however many that takes (32 for the whole world)
+    """
+    min_lat, min_lng, max_lat, max_lng = bbox
+    cells = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(precision)
+        rows = cell_index(max_lat + 90, height, 180) - cell_index(min_lat + 90, height, 180) + 1
+        columns = cell_index(max_lng + 180, width, 360) - cell_index(min_lng + 180, width, 360) + 1
+        if cells is not None and rows * columns > max_cells:
+            break
+        first_row, first_column = cell_index(min_lat + 90, height, 180), cell_index(min_lng + 180, width, 360)
+        cells = sorted({
+            geohash_encode(-90 + (first_row + row + 0.5) * height, -180 + (first_column + column + 0.5) * width, precision)
+            for row in range(rows)
+            for column in range(columns)
+        })
+    return cells
+
+
+def cell_index(offset, size, span):
+    return min(int(offset // size), int(span // size) - 1)
+
+
+def cell_ranges(cells):
+    """Sorted cells of one length merged into (first, last) runs of consecutive geohashes"""
+    ranges = []
+    for cell in cells:
+        if ranges and geohash_number(cell) == geohash_number(ranges[-1][1]) + 1:
+            ranges[-1][1] = cell
+        else:
+            ranges.append([cell, cell])
+    return ranges
+
+
+def geohash_number(cell):
+    number = 0
+    for char in cell:
+        number = number * 32 + BASE32.index(char)
+    return number
+
+
+def bbox_filter(bbox, prefix=''):
+    """Q for the projects inside bbox; prefix is the path to the project, e.g. 'project__'"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    cells = Q()
+    for first, last in cell_ranges(covering_cells(bbox, settings.GEO_MAX_COVER_CELLS)):
+        # '~' sorts after every geohash character, so this takes all of last's sub-cells
+        cells |= Q(**{f'{prefix}geohash__gte': first, f'{prefix}geohash__lt': last + '~'})
+    return cells & Q(**{
+        f'{prefix}latitude__gte': min_lat,
+        f'{prefix}latitude__lte': max_lat,
+        f'{prefix}longitude__gte': min_lng,
+        f'{prefix}longitude__lte': max_lng,
+    })
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """The bounding box of a circle, as (min_lat, min_lng, max_lat, max_lng)"""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    lng_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * max(math.cos(math.radians(latitude)), 1e-6)))
+    return (
+        max(latitude - lat_delta, -90.0),
+        max(longitude - lng_delta, -180.0),
+        min(latitude + lat_delta, 90.0),
+        min(longitude + lng_delta, 180.0),
+    )
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Great-circle (haversine) distance"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_bbox(value):
+    """'min_lng,min_lat,max_lng,max_lat' (GeoJSON order) as (min_lat, min_lng, max_lat, max_lng)"""
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(part) for part in value.split(','))
+    except ValueError:
+        raise ValueError('bbox must be min_lng,min_lat,max_lng,max_lat')
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+        raise ValueError('bbox must be min_lng,min_lat,max_lng,max_lat within -180..180 and -90..90')
+    return min_lat, min_lng, max_lat, max_lng
@@ -0,0 +1,230 @@
+import http.client
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection, connections
+from django.test import Client
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.benchmarking import api_cases, compare, summarize
+from core.models import Project, UserProfile
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    # Headers and body are written separately; with Nagle on, each keep-alive
+    # response waits for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def count_queries(run):
+    """Run a request, returning (its result, the number of SQL queries it made on this thread)"""
+    queries = []
+
+    def counter(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(counter))
+        result = run()
+    return result, len(queries)
+
+
+def client_request(client, case):
+    response = client.generic(
+        case.method,
+        case.path,
+        case.body or '',
+        content_type='application/json',
+        headers=case.headers,
+    )
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    return response.status_code, len(body)
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ API Benchmarks - Throughput, p50/p95/p99 latency, SQL queries and "
+        "bytes per response for every route in core/api_urls.py and core/auth_urls.py"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Timed requests per route')
+        parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight at once')
+        parser.add_argument(
+            '--server',
+            nargs='?',
+            const='local',
+            help=(
+                'Send requests over HTTP instead of through the test client: to an '
+                'in-process threaded server, or to the given base URL (e.g. http://127.0.0.1:8000)'
+            )
+        )
+        parser.add_argument('--routes', nargs='*', default=[], help='Only routes whose name contains one of these')
+        parser.add_argument('--username', help='User to authenticate as (default: the first government user)')
+        parser.add_argument('--password', default='fundtracker', help="That user's password, for the login route")
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Fail if results regress against this earlier --output file')
+        parser.add_argument(
+            '--max-latency-regression',
+            type=float,
+            default=0.2,
+            help='Allowed p95 latency growth as a fraction of the baseline (default 0.2)'
+        )
+        parser.add_argument(
+            '--latency-slack-ms',
+            type=float,
+            default=1.0,
+            help='Absolute p95 growth always allowed, so sub-millisecond noise does not fail'
+        )
+
+    def handle(self, *args, **options):
+        if options['username'] is None:
+            profile = UserProfile.objects.filter(role='GOVERNMENT').select_related('user').order_by('id').first()
+            if profile is None:
+                raise CommandError("No government user; run `manage.py seed_fundtracker` first.")
+            options['username'] = profile.user.username
+        user = UserProfile.objects.select_related('user').get(user__username=options['username']).user
+        # Per-request timing lines would drown the report; N+1 warnings still show
+        logging.getLogger('core.performance').setLevel(logging.WARNING)
+        auth = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+        cases, skipped = api_cases(auth, options['username'], options['password'], options['routes'])
+        results = {}
+        warmup_client = Client(SERVER_NAME='localhost')
+        for case in cases:
+            # One untimed request per route: checks it works, and counts its queries
+            try:
+                (status, size), queries = count_queries(lambda: client_request(warmup_client, case))
+            except Exception as e:
+                skipped[case.key] = f'raised {e.__class__.__name__}: {e}'
+                continue
+            if status >= 400:
+                skipped[case.key] = f'returned {status}'
+                continue
+            results[case.key] = {'path': case.path, 'status': status, 'queries': queries, 'bytes': size}
+
+        header = (
+            f"{'route':<44} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'p99 ms':>9} {'queries':>8} {'bytes':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        with self.transport(options['server']) as send:
+            for case in cases:
+                if case.key not in results:
+                    continue
+                result = results[case.key]
+                summary, sizes = self.run(send, case, options['requests'], options['concurrency'])
+                result.update(summary, bytes=max(sizes))
+                self.stdout.write(
+                    f"{case.key:<44} {result['rps']:>9.1f} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                    f"{result['p99_ms']:>9.2f} {result['queries']:>8} {result['bytes']:>10,}"
+                )
+        for key, reason in skipped.items():
+            self.stdout.write(f"{key:<44} skipped: {reason}")
+        document = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'transport': options['server'] or 'test-client',
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'database': connection.vendor,
+                'projects': Project.objects.count(),
+            },
+            'results': results,
+            'skipped': skipped,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(document, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)['results']
+            regressions = compare(
+                baseline, results, options['max_latency_regression'], options['latency_slack_ms']
+            )
+            if regressions:
+                for line in regressions:
+                    self.stderr.write(line)
+                raise CommandError(f"{len(regressions)} regression(s) against {options['compare']}")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}"))
+
+    def transport(self, server):
+        """Context manager yielding send(case) -> (status, bytes) for one request"""
+        if server is None:
+            return self.client_transport()
+        return self.http_transport(server)
+
+    @contextmanager
+    def client_transport(self):
+        clients = threading.local()
+
+        def send(case):
+            if not hasattr(clients, 'client'):
+                clients.client = Client(SERVER_NAME='localhost')
+            return client_request(clients.client, case)
+
+        yield send
+
+    @contextmanager
+    def http_transport(self, server):
+        httpd = None
+        if server == 'local':
+            httpd = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+            httpd.set_app(get_internal_wsgi_application())
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            server = f'http://127.0.0.1:{httpd.server_port}'
+            self.stdout.write(f"Serving on {server}")
+
+        url = urlsplit(server)
+        connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        prefix = url.path.rstrip('/')
+        connections_by_thread = threading.local()
+
+        def send(case):
+            # One keep-alive connection per worker thread
+            if not hasattr(connections_by_thread, 'connection'):
+                connections_by_thread.connection = connection_class(url.hostname, url.port, timeout=60)
+            http_connection = connections_by_thread.connection
+            headers = dict(case.headers, **({'Content-Type': 'application/json'} if case.body else {}))
+            http_connection.request(case.method, prefix + case.path, body=case.body, headers=headers)
+            response = http_connection.getresponse()
+            return response.status, len(response.read())
+
+        try:
+            yield send
+        finally:
+            if httpd is not None:
+                httpd.shutdown()
+                httpd.server_close()
+
+    def run(self, send, case, total, concurrency):
+        def timed_request(_):
+            started = time.perf_counter()
+            status, size = send(case)
+            elapsed = time.perf_counter() - started
+            if status >= 400:
+                raise CommandError(f"{case.method} {case.path} returned {status}")
+            return elapsed, size
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(timed_request, range(total)))
+        elapsed = time.perf_counter() - started
+        return summarize([latency for latency, _ in samples], elapsed), [size for _, size in samples]
+
@@ -0,0 +1,144 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarking import summarize
+from core.models import Project
+
+# (sync WSGI path, async path); {id} is replaced by a project id
+ENDPOINTS = [
+    ('/api/projects/', '/api/public/projects/'),
+    ('/api/projects/{id}/', '/api/public/projects/{id}/'),
+    ('/api/projects/{id}/materials/', '/api/public/projects/{id}/materials/'),
+    ('/api/projects/{id}/issues/', '/api/public/projects/{id}/issues/'),
+]
+
+
+def wsgi_get(handler, path):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost',
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.url_scheme': 'http',
+    }
+    statuses = []
+    response = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        b''.join(response)
+    finally:
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+async def asgi_get(handler, path):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # The client never disconnects; the handler cancels this wait when done
+        await asyncio.Event().wait()
+
+    statuses = []
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    await handler(scope, receive, send)
+    return statuses[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Async Read Path - Compare the sync (WSGI) and async (ASGI) project "
+        "read endpoints in-process at equal concurrency"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and path')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='WSGI worker threads, and concurrent ASGI requests'
+        )
+
+    def handle(self, *args, **options):
+        project = Project.objects.order_by('id').first()
+        if project is None:
+            raise CommandError("No projects to read; seed the database first.")
+
+        total, concurrency = options['requests'], options['concurrency']
+        wsgi_handler, asgi_handler = WSGIHandler(), ASGIHandler()
+        header = f"{'endpoint':<40} {'path':<5} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for sync_path, async_path in ENDPOINTS:
+            sync_path = sync_path.format(id=project.id)
+            async_path = async_path.format(id=project.id)
+            results = [
+                ('wsgi', self.run_wsgi(wsgi_handler, sync_path, total, concurrency)),
+                ('asgi', asyncio.run(self.run_asgi(asgi_handler, async_path, total, concurrency))),
+            ]
+            for label, summary in results:
+                self.stdout.write(
+                    f"{sync_path:<40} {label:<5} {summary['rps']:>9.1f} "
+                    f"{summary['p50_ms']:>9.2f} {summary['p99_ms']:>9.2f}"
+                )
+
+    def run_wsgi(self, handler, path, total, concurrency):
+        def timed_request(_):
+            started = time.perf_counter()
+            status = wsgi_get(handler, path)
+            if status != 200:
+                raise CommandError(f"GET {path} returned {status}")
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed_request, range(total)))
+        return summarize(latencies, time.perf_counter() - started)
+
+    async def run_asgi(self, handler, path, total, concurrency):
+        latencies = []
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                started = time.perf_counter()
+                status = await asgi_get(handler, path)
+                if status != 200:
+                    raise CommandError(f"GET {path} returned {status}")
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return summarize(latencies, time.perf_counter() - started)
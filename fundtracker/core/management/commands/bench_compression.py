@@ -0,0 +1,88 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.benchmarking import api_cases
+from core.compression import available_encodings, compress, compressible
+from core.models import UserProfile
+
+
+def parse_level(value):
+    encoding, _, level = value.partition('=')
+    try:
+        return encoding, int(level)
+    except ValueError:
+        raise CommandError(f'--level takes ENCODING=LEVEL, e.g. br=5, not "{value}"')
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Response Compression - Compressed bytes and CPU time per response "
+        "for every API route the middleware would compress"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--routes', nargs='*', default=[], help='Only routes whose name contains one of these')
+        parser.add_argument('--repeat', type=int, default=10, help='Compressions timed per route and encoding')
+        parser.add_argument(
+            '--level',
+            action='append',
+            default=[],
+            type=parse_level,
+            help='Override COMPRESSION_LEVELS for this run, e.g. --level br=5 --level zstd=6'
+        )
+
+    def handle(self, *args, **options):
+        profile = UserProfile.objects.filter(role='GOVERNMENT').select_related('user').order_by('id').first()
+        if profile is None:
+            raise CommandError("No government user; run `manage.py seed_fundtracker` first.")
+        logging.getLogger('core.performance').setLevel(logging.WARNING)
+        auth = {'Authorization': f'Bearer {AccessToken.for_user(profile.user)}'}
+        levels = {**settings.COMPRESSION_LEVELS, **dict(options['level'])}
+        encodings = available_encodings()
+
+        client = Client(SERVER_NAME='localhost')
+        cases, _ = api_cases(auth, profile.user.username, 'fundtracker', options['routes'])
+        bodies = []
+        for case in cases:
+            if case.method != 'GET':
+                continue
+            response = client.get(case.path, headers=case.headers)
+            if response.status_code == 200 and compressible(response):
+                content = b''.join(response.streaming_content) if response.streaming else response.content
+                bodies.append((case.key, content))
+        if not bodies:
+            raise CommandError("No compressible responses; seed the database first.")
+        bodies.sort(key=lambda body: len(body[1]), reverse=True)
+
+        levels_used = ', '.join(f'{encoding} {levels[encoding]}' for encoding in encodings)
+        self.stdout.write(f"Levels: {levels_used}; CPU ms is process time per compression\n")
+        header = f"{'route':<44} {'bytes':>10}" + ''.join(
+            f" {encoding + ' bytes':>11} {'ratio':>6} {'cpu ms':>7}" for encoding in encodings
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        totals = {encoding: [0, 0.0] for encoding in encodings}
+        for key, content in bodies:
+            line = f"{key:<44} {len(content):>10,}"
+            for encoding in encodings:
+                started = time.process_time()
+                for _ in range(options['repeat']):
+                    compressed = compress(encoding, content, levels[encoding])
+                cpu = (time.process_time() - started) / options['repeat']
+                totals[encoding][0] += len(compressed)
+                totals[encoding][1] += cpu
+                line += f" {len(compressed):>11,} {len(content) / len(compressed):>5.1f}x {cpu * 1000:>7.2f}"
+            self.stdout.write(line)
+
+        raw = sum(len(content) for _, content in bodies)
+        line = f"{'total':<44} {raw:>10,}"
+        for encoding in encodings:
+            size, cpu = totals[encoding]
+            line += f" {size:>11,} {raw / size:>5.1f}x {cpu * 1000:>7.2f}"
+        self.stdout.write('-' * len(header))
+        self.stdout.write(line)
@@ -0,0 +1,82 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmarking import summarize
+from core.parsers import MessagePackParser, ORJSONParser
+from core.querysets import project_queryset
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from core.serializers import ProjectSerializer
+
+# (label, renderer, parser); the first is the baseline for the speedups
+FORMATS = [
+    ('drf json', JSONRenderer(), JSONParser()),
+    ('orjson', ORJSONRenderer(), ORJSONParser()),
+    ('msgpack', MessagePackRenderer(), MessagePackParser()),
+]
+
+
+def run(function, repeat):
+    """p50 and p95 of repeat timed calls"""
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    return summarize(latencies, sum(latencies))
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Fast Rendering - Time rendering and parsing a project list as DRF "
+        "JSON, orjson and MessagePack"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1000, help='Projects in the list payload')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per format and direction')
+
+    def handle(self, *args, **options):
+        projects = list(project_queryset().order_by('id')[:options['projects']])
+        if not projects:
+            raise CommandError("No projects to render; seed the database first.")
+
+        request = RequestFactory(SERVER_NAME='localhost').get('/api/projects/')
+        started = time.perf_counter()
+        data = ProjectSerializer(projects, many=True, context={'request': request}).data
+        self.stdout.write(
+            f"{len(projects)} projects serialized in {(time.perf_counter() - started) * 1000:.1f} ms "
+            f"(not included below)\n"
+        )
+
+        baseline = None
+        header = (
+            f"{'format':<10} {'bytes':>10} {'render p50':>11} {'p95 ms':>8} {'speedup':>8} "
+            f"{'parse p50':>10} {'p95 ms':>8} {'speedup':>8}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for label, renderer, parser in FORMATS:
+            content = renderer.render(data)
+            self.check_round_trip(label, parser, content, data)
+            rendering = run(lambda: renderer.render(data), options['repeat'])
+            parsing = run(lambda: parser.parse(io.BytesIO(content)), options['repeat'])
+            if baseline is None:
+                baseline = (rendering, parsing, content)
+            elif label == 'orjson' and content != baseline[2]:
+                raise CommandError("orjson output differs from DRF's JSONRenderer")
+            self.stdout.write(
+                f"{label:<10} {len(content):>10} {rendering['p50_ms']:>11.2f} {rendering['p95_ms']:>8.2f} "
+                f"{baseline[0]['p50_ms'] / rendering['p50_ms']:>7.1f}x "
+                f"{parsing['p50_ms']:>10.2f} {parsing['p95_ms']:>8.2f} "
+                f"{baseline[1]['p50_ms'] / parsing['p50_ms']:>7.1f}x"
+            )
+
+    def check_round_trip(self, label, parser, content, data):
+        expected = JSONParser().parse(io.BytesIO(JSONRenderer().render(data)))
+        if parser.parse(io.BytesIO(content)) != expected:
+            raise CommandError(f"{label} does not round-trip to the same data as DRF JSON")
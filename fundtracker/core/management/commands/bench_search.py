@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarking import summarize
+from core.models import SearchEntry
+from core.search import search
+
+# From specific to broad: whole names, prefixes, words in most entries
+QUERIES = [
+    'kathmandu road', 'kath ro', 'bridge', 'cement', 'suppliers', 'seed_contractor',
+    'ministry', 'ministry of', 'ka', 'pvt ltd', 'zzzz',
+]
+
+
+class Command(BaseCommand):
+    help = "✅ Full-Text Search - Latency of /api/search/ queries against the current index"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', nargs='*', default=QUERIES, help='Queries to time')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--limit', type=int, default=settings.SEARCH_RESULT_LIMIT, help='Results per query')
+
+    def handle(self, *args, **options):
+        entries = SearchEntry.objects.count()
+        if not entries:
+            raise CommandError("The search index is empty; run `manage.py rebuild_search_index` first.")
+        kinds = [kind for kind, _ in SearchEntry.KIND_CHOICES]
+
+        self.stdout.write(f"{entries:,} search entries, SEARCH_RANK_WINDOW {settings.SEARCH_RANK_WINDOW}\n")
+        header = f"{'query':<24} {'results':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for query in options['queries']:
+            latencies = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                results = search(query, kinds, options['limit'])
+                latencies.append(time.perf_counter() - started)
+            timing = summarize(latencies, sum(latencies))
+            self.stdout.write(
+                f"{query:<24} {len(results):>8} {timing['p50_ms']:>8.2f} {timing['p95_ms']:>8.2f} "
+                f"{max(latencies) * 1000:>8.2f}"
+            )
@@ -0,0 +1,117 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import FileField
+from django.utils import timezone
+
+from core.models import StoredBlob
+from core.storage import BLOB_DIR, TEMP_DIR, is_blob
+
+
+class Command(BaseCommand):
+    help = "✅ Deduplicated Uploads - Delete stored blobs that no file field references"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='Only collect blobs unreferenced for at least this long'
+        )
+        parser.add_argument(
+            '--recount',
+            action='store_true',
+            help='Rebuild reference counts from every FileField before collecting'
+        )
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        dry_run = options['dry_run']
+
+        if options['recount']:
+            self.recount(dry_run)
+
+        removed = 0
+        orphans = StoredBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff)
+        for blob in orphans.iterator():
+            if dry_run:
+                self.stdout.write(f"Would remove {blob.name}")
+                removed += 1
+                continue
+            # Re-check the conditions so a blob re-uploaded meanwhile survives
+            deleted, _ = StoredBlob.objects.filter(
+                pk=blob.pk, ref_count__lte=0, updated_at__lt=cutoff
+            ).delete()
+            if deleted:
+                self.remove_file(blob.name)
+                removed += 1
+
+        strays = self.remove_strays(cutoff.timestamp(), dry_run)
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} orphaned blobs and {strays} stray files"
+        ))
+
+    def recount(self, dry_run):
+        """Count references held by every FileField in every installed model"""
+        references = Counter()
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if not isinstance(field, FileField):
+                    continue
+                names = model._default_manager.filter(
+                    **{f'{field.name}__startswith': f'{BLOB_DIR}/'}
+                ).values_list(field.name, flat=True)
+                references.update(names.iterator())
+
+        changed = []
+        for blob in StoredBlob.objects.iterator():
+            count = references.pop(blob.name, 0)
+            if blob.ref_count != count:
+                blob.ref_count = count
+                changed.append(blob)
+        missing = [
+            StoredBlob(name=name, size=self.file_size(name), ref_count=count)
+            for name, count in references.items()
+        ]
+        self.stdout.write(
+            f"Recount: {len(changed)} blobs corrected, {len(missing)} rows recreated"
+        )
+        if not dry_run:
+            StoredBlob.objects.bulk_update(changed, ['ref_count'], batch_size=1000)
+            StoredBlob.objects.bulk_create(missing, batch_size=1000)
+
+    def remove_strays(self, cutoff, dry_run):
+        """Remove blob files without a row and abandoned temporary uploads"""
+        root = default_storage.path(BLOB_DIR)
+        temp_root = default_storage.path(TEMP_DIR)
+        removed = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                if dirpath != temp_root:
+                    name = os.path.relpath(path, default_storage.location).replace(os.sep, '/')
+                    if not is_blob(name) or StoredBlob.objects.filter(name=name).exists():
+                        continue
+                if not dry_run:
+                    os.remove(path)
+                removed += 1
+        return removed
+
+    def remove_file(self, name):
+        try:
+            os.remove(default_storage.path(name))
+        except FileNotFoundError:
+            pass
+
+    def file_size(self, name):
+        try:
+            return default_storage.size(name)
+        except OSError:
+            return 0
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.api_views import remove_part_file
+from core.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = "✅ Resumable Uploads - Remove stale upload sessions and their partial files"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=float,
+            default=settings.CHUNKED_UPLOAD_EXPIRY_HOURS,
+            help='Remove sessions not touched for this many hours'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+        removed = 0
+        for session in stale.iterator():
+            remove_part_file(session.part_path)
+            session.delete()
+            removed += 1
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} stale upload sessions"))
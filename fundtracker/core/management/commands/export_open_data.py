@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.open_data import DATASETS, FORMATS, SnapshotExporter
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Open Data - Write Parquet/Arrow snapshots of projects, funds, materials, "
+        "payments, progress and issues, partitioned by ministry and fiscal year"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'datasets',
+            nargs='*',
+            help=f"Datasets to export (default: all of {', '.join(DATASETS)})"
+        )
+        parser.add_argument('--format', dest='file_format', choices=list(FORMATS), default='parquet')
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Discard previous snapshots and export every row'
+        )
+        parser.add_argument('--output', help='Output directory (default: OPEN_DATA_ROOT)')
+
+    def handle(self, *args, **options):
+        unknown = set(options['datasets']) - set(DATASETS)
+        if unknown:
+            raise CommandError(f"Unknown datasets: {', '.join(sorted(unknown))}")
+
+        exporter = SnapshotExporter(
+            root=options['output'],
+            file_format=options['file_format'],
+            stdout=self.stdout
+        )
+        exporter.run(datasets=options['datasets'] or None, full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"Snapshots written to {exporter.root}"))
@@ -0,0 +1,33 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from core import districts, geo
+from core.models import Project
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Project Map - Geocode every project again, e.g. after editing "
+        "the gazetteer, and list the most common locations it does not know"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Projects geocoded per chunk')
+        parser.add_argument('--unmatched', type=int, default=10, help='Unmatched locations to list')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        geocoded, changed, total = geo.locate_all(Project.objects.all(), options['batch_size'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Geocoded {geocoded:,} of {total:,} projects, {changed:,} changed, in {elapsed:.1f}s"
+        ))
+        if changed:
+            # Updates skip the signals that keep the district rollups current
+            districts.refresh()
+
+        unmatched = Counter(Project.objects.filter(geohash='').values_list('location', flat=True))
+        for location, count in unmatched.most_common(options['unmatched']):
+            self.stdout.write(f"  {count:>8,}  {location}")
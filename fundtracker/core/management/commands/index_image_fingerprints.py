@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from core.models import ProgressImage, IssueEvidence, RatingEvidence, ImageFingerprint
+
+
+class Command(BaseCommand):
+    help = "✅ Duplicate Photo Detection - Fingerprint existing progress and evidence photos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute fingerprints for photos that are already indexed'
+        )
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        sources = (
+            (ProgressImage, ProgressImage.objects.select_related('progress')),
+            (IssueEvidence, IssueEvidence.objects.filter(evidence_type='PHOTO').select_related('issue')),
+            (RatingEvidence, RatingEvidence.objects.filter(evidence_type='PHOTO').select_related('rating')),
+        )
+        for model, queryset in sources:
+            if not options['rebuild']:
+                indexed = ImageFingerprint.objects.filter(
+                    source_model=model.__name__
+                ).values('source_id')
+                queryset = queryset.exclude(id__in=indexed)
+
+            indexed_count = skipped = 0
+            for instance in queryset.iterator(chunk_size=options['chunk_size']):
+                if ImageFingerprint.index_instance(instance):
+                    indexed_count += 1
+                else:
+                    skipped += 1
+
+            self.stdout.write(
+                f"{model.__name__}: indexed {indexed_count}, skipped {skipped} unreadable"
+            )
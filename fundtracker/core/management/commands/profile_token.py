@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.profiling import profile_token
+
+
+class Command(BaseCommand):
+    help = "✅ Request Profiling - Print a signed header that lets any request use ?_profile=1"
+
+    def handle(self, *args, **options):
+        minutes = settings.PROFILE_TOKEN_MAX_AGE // 60
+        self.stdout.write(f"{settings.PROFILE_HEADER}: {profile_token()}")
+        self.stderr.write(f"Valid for {minutes} minutes; profiles are listed in the admin under Request profiles")
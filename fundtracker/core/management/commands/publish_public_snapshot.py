@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.public_snapshot import SnapshotPublisher, publish_pending
+
+
+class Command(BaseCommand):
+    help = "✅ Public Snapshot - Render the public project list and project pages to static JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'project_ids',
+            nargs='*',
+            type=int,
+            help='Only re-render these projects and their project list shards'
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running, publishing the projects queued by writes (incremental, lower brotli quality)'
+        )
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between queue checks with --watch')
+
+    def handle(self, *args, **options):
+        if options['watch']:
+            return self.watch(options['interval'])
+        publisher = SnapshotPublisher(brotli_quality=11)
+        manifest = publisher.publish(options['project_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {len(manifest['files'])} files to {publisher.root}"
+        ))
+
+    def watch(self, interval):
+        publisher = SnapshotPublisher()
+        self.stdout.write(f"Watching for queued projects, publishing to {publisher.root}")
+        while True:
+            started = time.monotonic()
+            manifest = publish_pending(publisher)
+            if manifest is not None:
+                self.stdout.write(
+                    f"Published {len(manifest['files'])} files in {time.monotonic() - started:.2f}s"
+                )
+            # Do not hold a connection (and with it a snapshot) between checks
+            connection.close()
+            time.sleep(interval)
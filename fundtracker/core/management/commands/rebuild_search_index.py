@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import ContractorProfile, IssueReport, Material, Project, SearchEntry
+from core.search import FTS_TABLE, SQLITE_DROP_INDEX, SQLITE_INDEX
+
+# What each kind is built from, with the relations SearchEntry.describe reads
+SOURCES = [
+    Project.objects.all(),
+    IssueReport.objects.select_related('project'),
+    Material.objects.all(),
+    ContractorProfile.objects.select_related('user'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Full-Text Search - Recreate every SearchEntry, e.g. after bulk "
+        "loads such as seed_fundtracker that bypass the indexing signals"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Entries inserted per bulk_create')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sqlite = connection.vendor == 'sqlite'
+        started = time.monotonic()
+        total = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            if sqlite:
+                # Filling FTS5 in one pass beats a trigger call per row
+                for statement in SQLITE_DROP_INDEX:
+                    cursor.execute(statement)
+            SearchEntry.objects.all().delete()
+            for queryset in SOURCES:
+                entries, count = [], 0
+                for instance in queryset.order_by('pk').iterator(chunk_size=batch_size):
+                    entries.append(SearchEntry.for_instance(instance))
+                    if len(entries) >= batch_size:
+                        SearchEntry.objects.bulk_create(entries)
+                        count += len(entries)
+                        entries = []
+                SearchEntry.objects.bulk_create(entries)
+                count += len(entries)
+                total += count
+                self.stdout.write(f"  {queryset.model.__name__:<20} {count:>12,}")
+            if sqlite:
+                for statement in SQLITE_INDEX:
+                    cursor.execute(statement)
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total:,} search entries in {elapsed:.1f}s"))
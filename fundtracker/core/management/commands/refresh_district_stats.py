@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import districts
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ District Rollups - Recompute every DistrictStats row, e.g. after "
+        "bulk loads such as seed_fundtracker that bypass the refresh signals"
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        districts.refresh()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {len(districts.DISTRICT_CODES)} district rows in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,326 @@
+import random
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import geo
+from core.models import (
+    UserProfile, ContractorProfile, ContractorCertificate, ContractorSkill,
+    Project, Fund, Material, MaterialPayment, Progress, IssueReport,
+    ContractorRating, AuditLog, parse_nepal_nid
+)
+
+MINISTRIES = [
+    'Ministry of Physical Infrastructure and Transport',
+    'Ministry of Urban Development',
+    'Ministry of Energy, Water Resources and Irrigation',
+    'Ministry of Education, Science and Technology',
+    'Ministry of Health and Population',
+    'Ministry of Federal Affairs and General Administration',
+    'Ministry of Agriculture and Livestock Development',
+    'Ministry of Water Supply',
+    'Ministry of Culture, Tourism and Civil Aviation',
+]
+DISTRICTS = [
+    'Kathmandu', 'Lalitpur', 'Bhaktapur', 'Kaski', 'Morang', 'Sunsari', 'Jhapa',
+    'Chitwan', 'Rupandehi', 'Banke', 'Kailali', 'Kanchanpur', 'Dang', 'Surkhet',
+    'Dhanusha', 'Parsa', 'Makwanpur', 'Ilam', 'Gorkha', 'Jumla', 'Mustang', 'Dolakha',
+]
+WORKS = [
+    'Road Upgrade', 'Bridge Construction', 'Drinking Water Scheme', 'School Building',
+    'Health Post', 'Irrigation Canal', 'Micro Hydro Plant', 'Ward Office', 'Drainage',
+    'Bus Park', 'Community Hall', 'River Embankment',
+]
+# (name, unit, unit price range in NPR)
+MATERIALS = [
+    ('Cement (OPC)', 'BAG', (750, 950)),
+    ('TMT Steel Rod', 'KG', (95, 125)),
+    ('Bricks', 'UNIT', (14, 22)),
+    ('Sand', 'CUMT', (2500, 4200)),
+    ('Aggregate', 'CUMT', (2800, 4500)),
+    ('Bitumen', 'TON', (90000, 120000)),
+    ('HDPE Pipe', 'UNIT', (1200, 3500)),
+    ('Paint', 'LITER', (450, 900)),
+    ('Timber', 'CUFT', (3500, 6500)),
+    ('Gabion Wire', 'BUNDLE', (5500, 8000)),
+]
+SKILLS = ['Masonry', 'Road Works', 'Bridge Works', 'Plumbing', 'Electrical', 'Hydropower', 'Surveying']
+AUTHORITIES = ['Nepal Engineering Council', 'Department of Roads', 'CTEVT', 'Public Procurement Monitoring Office']
+ISSUE_TYPES = [choice for choice, _ in IssueReport.ISSUE_TYPE_CHOICES]
+SEVERITIES = [choice for choice, _ in IssueReport.SEVERITY_CHOICES]
+ISSUE_STATUSES = [choice for choice, _ in IssueReport.STATUS_CHOICES]
+PROJECT_STATUSES = ['PLANNING', 'IN_PROGRESS', 'IN_PROGRESS', 'COMPLETED', 'COMPLETED', 'DELAYED', 'ABANDONED']
+FORGIVABLE_TYPES = {'NATURAL_DISASTER'}
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Load Testing - Generate a large, reproducible synthetic dataset. "
+        "Rows are bulk inserted, so signals (audit logs, fingerprints, snapshots) do not run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1000, help='Number of projects (other tables scale with it)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed builds the same data')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per bulk_create')
+        parser.add_argument('--password', default='fundtracker', help='Password for every seeded user')
+        parser.add_argument(
+            '--skip-audit-logs',
+            action='store_true',
+            help='Do not write the CREATE audit rows the signals would have written'
+        )
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith='seed_').exists():
+            raise CommandError("Seed data already exists; run `manage.py flush` first.")
+
+        self.random = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        self.audit = not options['skip_audit_logs']
+        self.now = timezone.now()
+        self.counts = {}
+        started = time.monotonic()
+
+        projects = options['projects']
+        with transaction.atomic():
+            self.create_users(options['password'], projects)
+        for offset in range(0, projects, self.chunk_size):
+            with transaction.atomic():
+                self.create_projects(offset, min(self.chunk_size, projects - offset))
+            self.stdout.write(f"  {min(offset + self.chunk_size, projects)}/{projects} projects")
+
+        elapsed = time.monotonic() - started
+        total = sum(self.counts.values())
+        for name, count in self.counts.items():
+            self.stdout.write(f"{name:<24} {count:>12,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 0.001):,.0f} rows/s)"
+        ))
+        # bulk_create skips the signals that keep /api/search/ and /api/districts/ current
+        call_command('rebuild_search_index', stdout=self.stdout)
+        call_command('refresh_district_stats', stdout=self.stdout)
+
+    # Helpers
+
+    def insert(self, model, rows):
+        """bulk_create in chunks, returning the saved rows (with primary keys)"""
+        rows = list(rows)
+        for start in range(0, len(rows), self.chunk_size):
+            model.objects.bulk_create(rows[start:start + self.chunk_size], batch_size=self.chunk_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(rows)
+        if self.audit and model is not AuditLog:
+            self.insert(AuditLog, (
+                AuditLog(action='CREATE', model_name=model.__name__, object_id=row.pk, description='Seeded')
+                for row in rows
+            ))
+        return rows
+
+    def moment(self, day):
+        """An aware datetime during office hours on the given date"""
+        return timezone.make_aware(datetime(day.year, day.month, day.day, self.random.randint(9, 18)))
+
+    def money(self, low, high):
+        return Decimal(self.random.randint(low, high))
+
+    # Generators
+
+    def create_users(self, password, projects):
+        password_hash = make_password(password)  # hashed once, shared by every seeded user
+        roles = {
+            'GOVERNMENT': max(5, projects // 2000),
+            'AUDITOR': max(2, projects // 10000),
+            'CONTRACTOR': max(20, projects // 20),
+            'PUBLIC': max(50, projects // 100),
+        }
+        self.users = {}
+        sequence = 0
+        for role, count in roles.items():
+            users = self.insert(User, (
+                User(username=f'seed_{role.lower()}_{n}', email=f'{role.lower()}{n}@example.com', password=password_hash)
+                for n in range(count)
+            ))
+            profiles = []
+            for user in users:
+                sequence += 1
+                profile = UserProfile(
+                    user=user,
+                    role=role,
+                    nepal_nid=f'{self.random.randint(1, 77):02d}-{self.random.randint(1, 32):02d}-{sequence:08d}',
+                    nid_verified=self.random.random() < 0.8,
+                )
+                # Derived fields normally set by UserProfile.save()
+                profile.nid_district, profile.nid_ward = parse_nepal_nid(profile.nepal_nid)
+                profiles.append(profile)
+            self.insert(UserProfile, profiles)
+            self.users[role] = [user.pk for user in users]
+
+        contractors = []
+        for user_id in self.users['CONTRACTOR']:
+            rating = Decimal(self.random.randint(300, 500)) / 100
+            suspended = rating < Decimal('3.80')
+            test_score = self.random.randint(40, 100)
+            contractors.append(ContractorProfile(
+                user_id=user_id,
+                rating=rating,
+                total_projects_completed=self.random.randint(0, 40),
+                total_projects_failed=self.random.randint(0, 3),
+                is_suspended=suspended,
+                suspension_reason=f"Rating dropped below 3.8 (Current: {rating})" if suspended else '',
+                suspended_at=self.now - timedelta(days=self.random.randint(1, 365)) if suspended else None,
+                years_of_experience=self.random.randint(0, 30),
+                skill_level=self.random.choice(ContractorProfile.SKILL_LEVEL_CHOICES)[0],
+                qualification_test_score=test_score,
+                test_passed=test_score >= 60,
+                test_taken_at=self.now - timedelta(days=self.random.randint(30, 1500)),
+            ))
+        contractors = self.insert(ContractorProfile, contractors)
+        self.contractor_users = {contractor.pk: contractor.user_id for contractor in contractors}
+        self.contractors = list(self.contractor_users)
+
+        certificates, skills = [], []
+        for contractor in contractors:
+            for n in range(self.random.randint(1, 3)):
+                issued = date(2015, 1, 1) + timedelta(days=self.random.randint(0, 3500))
+                certificates.append(ContractorCertificate(
+                    contractor=contractor,
+                    name=f'Class {self.random.choice("ABCD")} Construction License',
+                    issuing_authority=self.random.choice(AUTHORITIES),
+                    certificate_number=f'LIC-{contractor.pk:06d}-{n}',
+                    issue_date=issued,
+                    expiry_date=issued + timedelta(days=365 * self.random.randint(2, 10)),
+                    verified=self.random.random() < 0.7,
+                ))
+            for skill_name in self.random.sample(SKILLS, self.random.randint(1, 4)):
+                skills.append(ContractorSkill(
+                    contractor=contractor,
+                    skill_name=skill_name,
+                    proficiency_level=self.random.randint(1, 10),
+                    years_of_practice=self.random.randint(0, 20),
+                    verified=self.random.random() < 0.5,
+                ))
+        self.insert(ContractorCertificate, certificates)
+        self.insert(ContractorSkill, skills)
+
+    def create_projects(self, offset, count):
+        projects = []
+        for n in range(offset, offset + count):
+            contractor_id = self.random.choice(self.contractors)
+            start = date(2018, 7, 16) + timedelta(days=self.random.randint(0, 2900))
+            project = Project(
+                name=f'{self.random.choice(DISTRICTS)} {self.random.choice(WORKS)} #{n + 1}',
+                location=self.random.choice(DISTRICTS),
+                ministry=self.random.choice(MINISTRIES),
+                contractor=f'Contractor {contractor_id} Construction Pvt. Ltd.',
+                contractor_profile_id=contractor_id,
+                # Log-uniform budgets: mostly small works, some large ones
+                total_budget=Decimal(int(10 ** self.random.uniform(5, 8.5))),
+                start_date=start,
+                end_date=start + timedelta(days=self.random.randint(90, 1200)),
+                status=self.random.choice(PROJECT_STATUSES),
+                expected_lifespan_years=self.random.choice([5, 10, 15, 20, 30]),
+                warranty_period_years=self.random.choice([1, 2, 3]),
+            )
+            # Derived fields normally set by Project.save()
+            project.contract_size = project.calculate_contract_size()
+            project.min_contractor_rating = Project.MIN_CONTRACTOR_RATINGS[project.contract_size]
+            geo.locate(project)
+            if project.status == 'COMPLETED':
+                project.completion_date = project.end_date
+            projects.append(project)
+        projects = self.insert(Project, projects)
+
+        funds, materials, progress, issues, ratings = [], [], [], [], []
+        for project in projects:
+            released = Decimal(0)
+            for _ in range(self.random.randint(0, 4)):
+                amount = (project.total_budget * Decimal(self.random.uniform(0.05, 0.3))).quantize(Decimal('0.01'))
+                if released + amount > project.total_budget:
+                    break
+                released += amount
+                funds.append(Fund(project=project, amount=amount, blockchain_confirmed=self.random.random() < 0.3))
+
+            for name, unit, (low, high) in self.random.sample(MATERIALS, self.random.randint(2, 6)):
+                planned = Decimal(self.random.randint(10, 5000))
+                price = self.money(low, high)
+                actual = planned * Decimal(self.random.uniform(0.8, 1.3)) if self.random.random() < 0.6 else None
+                actual = actual.quantize(Decimal('0.01')) if actual is not None else None
+                materials.append(Material(
+                    project=project,
+                    name=name,
+                    unit=unit,
+                    planned_quantity=planned,
+                    actual_quantity=actual,
+                    unit_price=price,
+                    # Derived fields normally set by Material.save()
+                    total_planned_cost=planned * price,
+                    total_actual_cost=actual * price if actual is not None else None,
+                    supplier_name=f'{self.random.choice(DISTRICTS)} Suppliers Pvt. Ltd.',
+                    verified=self.random.random() < 0.5,
+                ))
+
+            physical = 0
+            for n in range(self.random.randint(0, 6)):
+                physical = min(100, physical + self.random.randint(5, 30))
+                status = self.random.choice(['APPROVED', 'APPROVED', 'APPROVED', 'REJECTED', 'PENDING'])
+                reviewed = status != 'PENDING'
+                progress.append(Progress(
+                    project=project,
+                    physical_progress=physical,
+                    financial_progress=max(0, physical - self.random.randint(0, 15)),
+                    status=status,
+                    submitted_by_id=self.contractor_users[project.contractor_profile_id],
+                    reviewed_by_id=self.random.choice(self.users['GOVERNMENT']) if reviewed else None,
+                    reviewed_at=self.moment(project.start_date + timedelta(days=30 * (n + 1))) if reviewed else None,
+                ))
+
+            if self.random.random() < 0.35:
+                issue_type = self.random.choice(ISSUE_TYPES)
+                issues.append(IssueReport(
+                    project=project,
+                    title=f'{issue_type.replace("_", " ").title()} at site',
+                    description='Synthetic issue report for load testing.',
+                    issue_type=issue_type,
+                    severity=self.random.choice(SEVERITIES),
+                    status=self.random.choice(ISSUE_STATUSES),
+                    # Derived field normally set by IssueReport.save()
+                    is_forgivable=issue_type in FORGIVABLE_TYPES,
+                    reported_by_id=self.random.choice(self.users['PUBLIC']),
+                ))
+
+            if project.status == 'COMPLETED' and self.random.random() < 0.6:
+                value = self.random.choices([1, 2, 3, 4, 5], weights=[1, 2, 4, 6, 4])[0]
+                ratings.append(ContractorRating(
+                    contractor_id=project.contractor_profile_id,
+                    project=project,
+                    rated_by_id=self.random.choice(self.users['GOVERNMENT']),
+                    rating_value=value,
+                    comment='Synthetic rating.',
+                    # Derived fields normally set by ContractorRating.save()
+                    is_negative=value <= 2,
+                    evidence_required=value <= 2,
+                    is_verified=self.random.random() < 0.5,
+                ))
+
+        self.insert(Fund, funds)
+        self.insert(Progress, progress)
+        self.insert(IssueReport, issues)
+        self.insert(ContractorRating, ratings)
+
+        payments = []
+        for material in self.insert(Material, materials):
+            for n in range(self.random.randint(0, 2)):
+                payments.append(MaterialPayment(
+                    material=material,
+                    amount=(material.total_planned_cost * Decimal(self.random.uniform(0.2, 0.6))).quantize(Decimal('0.01')),
+                    payment_date=self.now - timedelta(days=self.random.randint(1, 2000)),
+                    payment_reference=f'PAY-{material.pk:08d}-{n}',
+                    status=self.random.choice(MaterialPayment.PAYMENT_STATUS)[0],
+                ))
+        self.insert(MaterialPayment, payments)
@@ -0,0 +1,58 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.nid_registry import RegistryError, RegistryIndex, profiles_to_check, verify
+
+
+class Command(BaseCommand):
+    help = (
+        "✅ Bulk NID Verification - Verify unverified UserProfile NIDs against a "
+        "registry extract (CSV, optionally gzipped), only those not checked yet"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('registry', help='Registry extract, e.g. registry-2026-10.csv.gz')
+        parser.add_argument('--column', default='nid', help='Header of the NID column')
+        parser.add_argument('--index', help='Index file (default: the extract path + .index.sqlite3)')
+        parser.add_argument('--rebuild-index', action='store_true', help='Rebuild the index even if it is current')
+        parser.add_argument('--recheck', action='store_true', help='Also check profiles not found by earlier runs')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Profiles looked up and updated per chunk')
+        parser.add_argument('--dry-run', action='store_true', help='Count matches without saving them')
+
+    def handle(self, *args, **options):
+        source = options['registry']
+        path = options['index'] or f'{source}.index.sqlite3'
+        try:
+            index = None if options['rebuild_index'] else RegistryIndex.open(source, path)
+            if index is None:
+                started = time.monotonic()
+                index, read, skipped = RegistryIndex.build(source, path, options['column'])
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"Indexed {len(index):,} NIDs from {read:,} lines ({skipped:,} malformed) "
+                    f"in {elapsed:.1f}s ({read / max(elapsed, 0.001):,.0f} lines/s) into {path}"
+                )
+            else:
+                self.stdout.write(f"Using {path}, {len(index):,} NIDs, built from this extract")
+        except (OSError, UnicodeDecodeError, csv.Error, RegistryError) as e:
+            raise CommandError(e)
+
+        started = time.monotonic()
+        checked = verified = 0
+        try:
+            for chunk_checked, chunk_verified in verify(
+                index, profiles_to_check(options['recheck']), options['batch_size'], options['dry_run']
+            ):
+                checked += chunk_checked
+                verified += chunk_verified
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"  {checked:>12,} checked, {verified:>12,} verified")
+        finally:
+            index.close()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Would verify' if options['dry_run'] else 'Verified'} {verified:,} of {checked:,} profiles "
+            f"({checked - verified:,} not in the registry) in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,185 @@
+"""
+✅ Protected Media - Serve uploaded files with the same role permissions as the API
+
+Files are looked up through the records that reference them, so a file can
+be read exactly when one of those records can be read through the API.
+In production the bytes are handed to the front web server with
+X-Accel-Redirect (nginx) or X-Sendfile (Apache/lighttpd), which also handles
+Range requests. Without a front server the view serves ranges itself,
+streamed chunk by chunk under both WSGI and ASGI.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .authentication import QueryParamJWTAuthentication
+from .models import ProgressImage, IssueEvidence, RatingEvidence, ContractorCertificate
+from .streaming import streaming_content
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def readable_file_owners(user):
+    """
+    (queryset, file field) pairs of records the user may read, mirroring
+    the permissions and querysets of the matching API viewsets
+    """
+    owners = [(ProgressImage.objects.all(), 'image')]
+    if user.is_authenticated:
+        owners += [
+            (IssueEvidence.objects.all(), 'file'),
+            (RatingEvidence.objects.all(), 'file'),
+        ]
+        role = getattr(getattr(user, 'profile', None), 'role', None)
+        if role in ('GOVERNMENT', 'AUDITOR'):
+            # Certificates are listed on every contractor profile these roles can read
+            owners.append((ContractorCertificate.objects.all(), 'document'))
+        elif hasattr(user, 'contractor_profile'):
+            owners.append((
+                ContractorCertificate.objects.filter(contractor=user.contractor_profile),
+                'document'
+            ))
+    return owners
+
+
+def all_file_owners():
+    return [
+        (ProgressImage.objects.all(), 'image'),
+        (IssueEvidence.objects.all(), 'file'),
+        (RatingEvidence.objects.all(), 'file'),
+        (ContractorCertificate.objects.all(), 'document'),
+    ]
+
+
+def is_referenced(owners, name):
+    return any(queryset.filter(**{field: name}).exists() for queryset, field in owners)
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) for a single byte range, None to ignore the header
+    (malformed or multiple ranges), or False if the range is unsatisfiable
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def iter_file_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(STREAM_CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Media responses are not rendered, so any Accept header is fine"""
+
+    def select_parser(self, request, parsers):
+        return parsers[0] if parsers else None
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class MediaView(APIView):
+    authentication_classes = [JWTAuthentication, QueryParamJWTAuthentication]
+    permission_classes = [AllowAny]
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, path):
+        name = posixpath.normpath(path).lstrip('/')
+        if name.startswith('..') or name == '.':
+            raise Http404
+        if not is_referenced(readable_file_owners(request.user), name):
+            if is_referenced(all_file_owners(), name):
+                self.permission_denied(request)
+            raise Http404
+
+        full_path = default_storage.path(name)
+        if not os.path.isfile(full_path):
+            raise Http404
+        stat = os.stat(full_path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = int(stat.st_mtime)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            backend = settings.MEDIA_SENDFILE_BACKEND
+            if backend == 'nginx':
+                response = HttpResponse(content_type=content_type)
+                response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(name)
+            elif backend == 'sendfile':
+                response = HttpResponse(content_type=content_type)
+                response['X-Sendfile'] = full_path
+            else:
+                response = self.file_response(request, full_path, stat.st_size, content_type,
+                                              etag, last_modified)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        response['Cache-Control'] = 'private, max-age=3600'
+        return response
+
+    def file_response(self, request, full_path, size, content_type, etag, last_modified):
+        """Fallback when no front server is configured: serve the bytes, honouring Range"""
+        byte_range = None
+        range_header = request.headers.get('Range')
+        if range_header and self.if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(range_header, size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        start, end = byte_range or (0, size - 1)
+        length = end - start + 1 if size else 0
+        # File reads need no database connection, so any worker thread will do
+        response = StreamingHttpResponse(
+            streaming_content(request, iter_file_range(full_path, start, length), thread_sensitive=False),
+            status=206 if byte_range else 200,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(length)
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        return response
+
+    def if_range_matches(self, request, etag, last_modified):
+        """A Range is only honoured if If-Range (when sent) still matches the file"""
+        if_range = request.headers.get('If-Range')
+        if not if_range:
+            return True
+        if if_range.startswith(('"', 'W/')):
+            return if_range == etag
+        return parse_http_date_safe(if_range) == last_modified
@@ -0,0 +1,36 @@
+"""
+✅ Performance Instrumentation - Prometheus scrape endpoint
+
+With METRICS_TOKEN set, only scrapers sending ``Authorization: Bearer
+<METRICS_TOKEN>`` are answered, wherever they connect from. Without it the
+view falls back to METRICS_ALLOWED_IPS (a scraper on the same host by
+default). Behind a reverse proxy every request arrives from the proxy's
+address, so requests carrying X-Forwarded-For are refused in that mode;
+still block /metrics in the proxy or set a token. Refused clients get a
+404, so the route does not advertise itself.
+"""
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from .performance import metrics
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def may_scrape(request):
+    if settings.METRICS_TOKEN:
+        header = request.headers.get('Authorization', '')
+        return hmac.compare_digest(header.encode(), f'Bearer {settings.METRICS_TOKEN}'.encode())
+    if 'X-Forwarded-For' in request.headers:
+        return False
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+@require_GET
+def metrics_view(request):
+    if not may_scrape(request):
+        raise Http404
+    return HttpResponse(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
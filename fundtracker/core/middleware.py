@@ -0,0 +1,170 @@
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+
+from .compression import compress_response
+from .db_routers import replica_reads_allowed
+from .performance import RequestTimings, current_timings, record_request
+from .profiling import requested_profiler, wants_profile
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_SALT = 'core.pin-primary'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    ✅ Read Replicas - Decide per request whether reads may use the replica
+
+    A successful write hands the client a signed marker, as the
+    PIN_PRIMARY_COOKIE cookie (admin, same-site clients) and the
+    PIN_PRIMARY_HEADER response header (API clients echo it back). While the
+    marker is fresh the client's reads stay on the primary, so it always
+    sees its own writes despite replication lag.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = replica_reads_allowed.set(self.replica_safe(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads_allowed.reset(token)
+        return self.mark_write(request, response)
+
+    async def __acall__(self, request):
+        token = replica_reads_allowed.set(self.replica_safe(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_reads_allowed.reset(token)
+        return self.mark_write(request, response)
+
+    def replica_safe(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        marker = (
+            request.headers.get(settings.PIN_PRIMARY_HEADER)
+            or request.COOKIES.get(settings.PIN_PRIMARY_COOKIE)
+        )
+        if not marker:
+            return True
+        try:
+            signing.TimestampSigner(salt=PIN_SALT).unsign(
+                marker, max_age=settings.READ_YOUR_WRITES_SECONDS
+            )
+        except signing.BadSignature:
+            # Expired or forged: nothing to wait for
+            return True
+        return False
+
+    def mark_write(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            marker = signing.TimestampSigner(salt=PIN_SALT).sign('primary')
+            response.set_cookie(
+                settings.PIN_PRIMARY_COOKIE,
+                marker,
+                max_age=settings.READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+            response[settings.PIN_PRIMARY_HEADER] = marker
+        return response
+
+
+class PerformanceMiddleware:
+    """
+    ✅ Performance Instrumentation - Per-request SQL, auth and serializer time
+
+    Sampled requests (PERFORMANCE_SAMPLE_RATE) get a Server-Timing header and
+    a JSON log line; every request updates the /metrics histograms. See
+    core.performance. Privileged ``?_profile=1`` requests are profiled as
+    well, see core.profiling. Keep it first in MIDDLEWARE so "total" covers
+    the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        profiler = requested_profiler(request)
+        timings = RequestTimings(profile=True) if profiler else self.sample()
+        token = current_timings.set(timings)
+        try:
+            if profiler:
+                profiler.start()
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+            if profiler:
+                profiler.stop()
+        response = record_request(request, response, started, timings)
+        if profiler:
+            profiler.save(request, response, timings)
+        return response
+
+    async def __acall__(self, request):
+        started, profiler = time.perf_counter(), None
+        if wants_profile(request):
+            profiler = await sync_to_async(requested_profiler)(request, asynchronous=True)
+        timings = RequestTimings(profile=True) if profiler else self.sample()
+        token = current_timings.set(timings)
+        try:
+            if profiler:
+                profiler.start()
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+            if profiler:
+                profiler.stop()
+        response = record_request(request, response, started, timings)
+        if profiler:
+            await sync_to_async(profiler.save)(request, response, timings)
+        return response
+
+    def sample(self):
+        rate = settings.PERFORMANCE_SAMPLE_RATE
+        if rate and (rate >= 1 or random.random() < rate):
+            return RequestTimings()
+        return None
+
+
+class CompressionMiddleware:
+    """
+    ✅ Response Compression - br/zstd/gzip for API payloads, see core.compression
+
+    Place it right after PerformanceMiddleware, so the response size
+    histograms count the bytes actually sent.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return compress_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return compress_response(request, await self.get_response(request))
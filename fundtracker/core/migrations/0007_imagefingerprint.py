@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_fund_blockchain_block_number_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_model', models.CharField(choices=[('ProgressImage', 'Progress Image'), ('IssueEvidence', 'Issue Evidence'), ('RatingEvidence', 'Rating Evidence')], max_length=20)),
+                ('source_id', models.PositiveIntegerField()),
+                ('phash', models.CharField(max_length=16)),
+                ('band_0', models.PositiveIntegerField(db_index=True)),
+                ('band_1', models.PositiveIntegerField(db_index=True)),
+                ('band_2', models.PositiveIntegerField(db_index=True)),
+                ('band_3', models.PositiveIntegerField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='image_fingerprints', to='core.project')),
+            ],
+            options={
+                'unique_together': {('source_model', 'source_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contractorcertificate',
+            name='document',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='certificates/'),
+        ),
+        migrations.AlterField(
+            model_name='issueevidence',
+            name='file',
+            field=models.FileField(db_index=True, upload_to='issue_evidence/'),
+        ),
+        migrations.AlterField(
+            model_name='progressimage',
+            name='image',
+            field=models.ImageField(db_index=True, upload_to='progress_images/'),
+        ),
+        migrations.AlterField(
+            model_name='ratingevidence',
+            name='file',
+            field=models.FileField(db_index=True, upload_to='rating_evidence/'),
+        ),
+    ]
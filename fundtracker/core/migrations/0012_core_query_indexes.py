@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_sync_updated_at_tombstone'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['model_name', 'object_id', 'timestamp'], name='auditlog_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['timestamp'], name='auditlog_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contractorcertificate',
+            index=models.Index(fields=['expiry_date'], name='certificate_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contractorprofile',
+            index=models.Index(condition=models.Q(('is_suspended', True)), fields=['suspended_at'], name='contractor_suspended_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issuereport',
+            index=models.Index(fields=['status', 'severity'], name='issue_status_severity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issuereport',
+            index=models.Index(fields=['severity', 'status'], name='issue_severity_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issuereport',
+            index=models.Index(fields=['issue_type', 'status'], name='issue_type_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='progress',
+            index=models.Index(fields=['status', 'submitted_at'], name='progress_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status'], name='project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['ministry', 'status'], name='project_ministry_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['contract_size', 'status'], name='project_size_status_idx'),
+        ),
+    ]
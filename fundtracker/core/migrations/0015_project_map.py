@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+from core import geo
+
+
+def geocode_projects(apps, schema_editor):
+    geo.locate_all(apps.get_model('core', 'Project').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_search_entry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='district_code',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, help_text='NID district code (1-77) of the geocoded place', null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='geocoded_place',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.RunPython(geocode_projects, migrations.RunPython.noop),
+    ]
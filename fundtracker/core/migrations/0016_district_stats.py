@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:09
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_project_map'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistrictStats',
+            fields=[
+                ('district_code', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('residents', models.PositiveIntegerField(default=0)),
+                ('reporters', models.PositiveIntegerField(default=0, help_text='Residents who reported at least one issue')),
+                ('reported_issues', models.PositiveIntegerField(default=0, help_text='Issues reported by residents, anywhere')),
+                ('projects', models.PositiveIntegerField(default=0)),
+                ('total_budget', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=16)),
+                ('issues', models.PositiveIntegerField(default=0, help_text="Issues reported on the district's projects")),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'district stats',
+                'ordering': ['district_code'],
+            },
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='nid_district',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='nid_ward',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['nid_district', 'nid_ward'], name='profile_nid_district_ward_idx'),
+        ),
+    ]
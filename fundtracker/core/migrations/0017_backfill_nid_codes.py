@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:05
+
+from django.db import migrations, models
+from django.db.models import Max
+from django.db.models.functions import Cast, Substr
+
+# core.models.NEPAL_NID_PATTERN when this was written
+NEPAL_NID_PATTERN = r'^(0[1-9]|[1-6][0-9]|7[0-7])-(0[1-9]|[12][0-9]|3[0-2])-\d{8}$'
+BATCH_SIZE = 10000
+
+
+def backfill_nid_codes(apps, schema_editor):
+    """Parse district and ward out of every well-formed NID, one id range per UPDATE"""
+    UserProfile = apps.get_model('core', 'UserProfile')
+    last_id = UserProfile.objects.aggregate(last=Max('id'))['last'] or 0
+    for start in range(0, last_id, BATCH_SIZE):
+        UserProfile.objects.filter(
+            id__gt=start, id__lte=start + BATCH_SIZE, nepal_nid__regex=NEPAL_NID_PATTERN
+        ).update(
+            nid_district=Cast(Substr('nepal_nid', 1, 2), models.PositiveSmallIntegerField()),
+            nid_ward=Cast(Substr('nepal_nid', 4, 2), models.PositiveSmallIntegerField()),
+        )
+
+
+class Migration(migrations.Migration):
+    # Each chunk commits on its own, so a large table is not locked and
+    # rewritten in one transaction; re-running the backfill is harmless
+    atomic = False
+
+    dependencies = [
+        ('core', '0016_district_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_nid_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_backfill_nid_codes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='nid_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(('nid_checked_at__isnull', True), ('nid_verified', False)), fields=['id'], name='profile_nid_unchecked_idx'),
+        ),
+    ]
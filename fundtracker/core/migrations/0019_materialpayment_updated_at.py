@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:05
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Existing payments were last changed when recorded"""
+    MaterialPayment = apps.get_model('core', 'MaterialPayment')
+    MaterialPayment.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_nid_checked_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='materialpayment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
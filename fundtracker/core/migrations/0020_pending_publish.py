@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_materialpayment_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingPublish',
+            fields=[
+                ('project_id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('queued_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
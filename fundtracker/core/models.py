@@ -1,10 +1,21 @@
+import json
+import os
 import re
+import uuid
 from decimal import Decimal
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils import timezone
+from PIL import UnidentifiedImageError
+
+from . import geo, perceptual_hash
+
+
+# District: 01-77 (01-09, 10-69, 70-77)
+# Ward: 01-32
+NEPAL_NID_PATTERN = r'^(0[1-9]|[1-6][0-9]|7[0-7])-(0[1-9]|[12][0-9]|3[0-2])-\d{8}$'
 
 
 def validate_nepal_nid(value):
@@ -15,15 +26,21 @@ def validate_nepal_nid(value):
     Ward: 01-32 (max wards in a municipality)
     Number: 8 digit unique number
     """
-    # District: 01-77 (01-09, 10-69, 70-77)
-    # Ward: 01-32
-    pattern = r'^(0[1-9]|[1-6][0-9]|7[0-7])-(0[1-9]|[12][0-9]|3[0-2])-\d{8}$'
-    if not re.match(pattern, value):
+    if not re.match(NEPAL_NID_PATTERN, value):
         raise ValidationError(
             'Invalid Nepal NID format. Expected: District-Ward-Number (e.g., 01-05-12345678)'
         )
 
 
+def parse_nepal_nid(value):
+    """
+    ✅ District Rollups - (district, ward) codes of a well-formed NID,
+    (None, None) for a missing or malformed one
+    """
+    match = re.match(NEPAL_NID_PATTERN, value or '')
+    return (int(match[1]), int(match[2])) if match else (None, None)
+
+
 class UserProfile(models.Model):
     ROLE_CHOICES = (
         ('PUBLIC', 'Public'),
@@ -42,10 +59,40 @@ class UserProfile(models.Model):
         help_text="Nepal NID format: District-Ward-Number (e.g., 01-05-12345678)"
     )
     nid_verified = models.BooleanField(default=False)
+    # ✅ Bulk NID Verification - When verify_nids last looked nepal_nid up; cleared when it changes
+    nid_checked_at = models.DateTimeField(null=True, blank=True)
+    # ✅ District Rollups - District and ward codes of nepal_nid, set by save()
+    nid_district = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    nid_ward = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['nid_district', 'nid_ward'], name='profile_nid_district_ward_idx'),
+            # The profiles an incremental verify_nids run reads
+            models.Index(
+                fields=['id'],
+                condition=models.Q(nid_verified=False, nid_checked_at__isnull=True),
+                name='profile_nid_unchecked_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.role}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_nepal_nid = instance.__dict__.get('nepal_nid')
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.nid_district, self.nid_ward = parse_nepal_nid(self.nepal_nid)
+        if self.nepal_nid != getattr(self, '_loaded_nepal_nid', self.nepal_nid):
+            # A new NID has not been looked up yet
+            self.nid_checked_at = None
+        super().save(*args, **kwargs)
+        self._loaded_nepal_nid = self.nepal_nid
+
 
 # ✅ Contractor Qualification System - Certificates, skills, experience, tests
 class ContractorProfile(models.Model):
@@ -112,6 +159,16 @@ class ContractorProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            # ✅ Suspension System - Suspended contractor list
+            models.Index(
+                fields=['suspended_at'],
+                condition=models.Q(is_suspended=True),
+                name='contractor_suspended_idx'
+            ),
+        ]
+    
     def __str__(self):
         return f"Contractor: {self.user.username} (Rating: {self.rating})"
     
@@ -174,9 +231,14 @@ class ContractorCertificate(models.Model):
     certificate_number = models.CharField(max_length=100, blank=True)
     issue_date = models.DateField()
     expiry_date = models.DateField(null=True, blank=True)
-    document = models.FileField(upload_to='certificates/', null=True, blank=True)
+    document = models.FileField(upload_to='certificates/', null=True, blank=True, db_index=True)
     verified = models.BooleanField(default=False)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['expiry_date'], name='certificate_expiry_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.name} - {self.contractor.user.username}"
     
@@ -227,6 +289,12 @@ class Project(models.Model):
         ('ABANDONED', 'Abandoned'),
     )
     
+    MIN_CONTRACTOR_RATINGS = {
+        'SMALL': Decimal('3.00'),
+        'MEDIUM': Decimal('3.50'),
+        'LARGE': Decimal('4.00'),
+    }
+    
     name = models.CharField(max_length=200)
     location = models.CharField(max_length=200)
     ministry = models.CharField(max_length=200)
@@ -272,6 +340,18 @@ class Project(models.Model):
     completion_date = models.DateField(null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PLANNING')
     
+    # ✅ Project Map - Set from location by save() against the bundled gazetteer (see core.geo)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, db_index=True)
+    district_code = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="NID district code (1-77) of the geocoded place"
+    )
+    geocoded_place = models.CharField(max_length=200, blank=True)
+    
     # ✅ Blockchain Ready - Schema prepared for transaction recording
     blockchain_tx_hash = models.CharField(
         max_length=100, 
@@ -287,7 +367,14 @@ class Project(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='project_status_idx'),
+            models.Index(fields=['ministry', 'status'], name='project_ministry_status_idx'),
+            models.Index(fields=['contract_size', 'status'], name='project_size_status_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -311,12 +398,9 @@ class Project(models.Model):
         # Auto-calculate contract size based on budget
         self.contract_size = self.calculate_contract_size()
         # Set minimum rating requirement based on contract size
-        rating_requirements = {
-            'SMALL': Decimal('3.00'),
-            'MEDIUM': Decimal('3.50'),
-            'LARGE': Decimal('4.00'),
-        }
-        self.min_contractor_rating = rating_requirements.get(self.contract_size, Decimal('3.00'))
+        self.min_contractor_rating = self.MIN_CONTRACTOR_RATINGS.get(self.contract_size, Decimal('3.00'))
+        # ✅ Project Map - Coordinates, geohash and district from the location
+        geo.locate(self)
         super().save(*args, **kwargs)
 
 
@@ -331,6 +415,7 @@ class Fund(models.Model):
     )
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     released_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     # ✅ Blockchain Ready - Transaction recording fields
     blockchain_tx_hash = models.CharField(
@@ -393,7 +478,7 @@ class Material(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def save(self, *args, **kwargs):
         # Calculate total planned cost
@@ -439,6 +524,7 @@ class MaterialPayment(models.Model):
     
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return f"Payment {self.payment_reference} - {self.material.name}"
@@ -467,10 +553,17 @@ class Progress(models.Model):
     
     # ✅ Time-Based Reporting - Track submission time
     submitted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     # ✅ Blockchain Ready
     blockchain_tx_hash = models.CharField(max_length=100, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Review queue: pending reports, oldest first
+            models.Index(fields=['status', 'submitted_at'], name='progress_status_submitted_idx'),
+        ]
+
     def clean(self):
         if self.physical_progress > 100 or self.financial_progress > 100:
             raise ValidationError("Progress cannot exceed 100%")
@@ -508,12 +601,29 @@ class AuditLog(models.Model):
     timestamp = models.DateTimeField(auto_now_add=True)
     description = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            # History of one record, and the newest-first list / dated exports
+            models.Index(fields=['model_name', 'object_id', 'timestamp'], name='auditlog_object_idx'),
+            models.Index(fields=['timestamp'], name='auditlog_timestamp_idx'),
+        ]
+
     def __str__(self):
         return f"{self.action} {self.model_name} ({self.object_id})"
 
+# ✅ Incremental Sync - Deleted rows, so sync clients can drop them from their cache
+class Tombstone(models.Model):
+    model_name = models.CharField(max_length=100)
+    object_id = models.PositiveIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.model_name} ({self.object_id}) deleted"
+
+
 class ProgressImage(models.Model):
     progress = models.ForeignKey(Progress, on_delete=models.CASCADE, related_name='images')
-    image = models.ImageField(upload_to='progress_images/')
+    image = models.ImageField(upload_to='progress_images/', db_index=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
@@ -609,7 +719,14 @@ class IssueReport(models.Model):
     resolved_at = models.DateTimeField(null=True, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'severity'], name='issue_status_severity_idx'),
+            models.Index(fields=['severity', 'status'], name='issue_severity_status_idx'),
+            models.Index(fields=['issue_type', 'status'], name='issue_type_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.project.name}"
@@ -655,7 +772,7 @@ class IssueEvidence(models.Model):
         on_delete=models.CASCADE
     )
     evidence_type = models.CharField(max_length=10, choices=EVIDENCE_TYPE_CHOICES, default='PHOTO')
-    file = models.FileField(upload_to='issue_evidence/')
+    file = models.FileField(upload_to='issue_evidence/', db_index=True)
     description = models.CharField(max_length=200, blank=True)
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -716,7 +833,7 @@ class ContractorRating(models.Model):
     verified_at = models.DateTimeField(null=True, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         unique_together = ['contractor', 'project', 'rated_by']
@@ -763,7 +880,7 @@ class RatingEvidence(models.Model):
         on_delete=models.CASCADE
     )
     evidence_type = models.CharField(max_length=10, choices=EVIDENCE_TYPE_CHOICES, default='PHOTO')
-    file = models.FileField(upload_to='rating_evidence/')
+    file = models.FileField(upload_to='rating_evidence/', db_index=True)
     description = models.CharField(max_length=200, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
@@ -776,3 +893,457 @@ class RatingEvidence(models.Model):
         self.rating.evidence_provided = True
         self.rating.save()
 
+
+
+# ✅ Duplicate Photo Detection - Perceptual hash index for uploaded photos
+class ImageFingerprint(models.Model):
+    """
+    Perceptual hash of an uploaded photo, split into indexed bands
+    so near-duplicates can be found with index lookups (see core.perceptual_hash)
+    """
+    SOURCE_CHOICES = (
+        ('ProgressImage', 'Progress Image'),
+        ('IssueEvidence', 'Issue Evidence'),
+        ('RatingEvidence', 'Rating Evidence'),
+    )
+
+    source_model = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.PositiveIntegerField()
+    project = models.ForeignKey(
+        Project,
+        related_name='image_fingerprints',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+    phash = models.CharField(max_length=16)
+    band_0 = models.PositiveIntegerField(db_index=True)
+    band_1 = models.PositiveIntegerField(db_index=True)
+    band_2 = models.PositiveIntegerField(db_index=True)
+    band_3 = models.PositiveIntegerField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['source_model', 'source_id']
+
+    def __str__(self):
+        return f"{self.source_model} {self.source_id} ({self.phash})"
+
+    @staticmethod
+    def photo_name(instance):
+        """
+        Name of the photo file of a ProgressImage, IssueEvidence or
+        RatingEvidence row, or None if it is not a photo. Reads __dict__, so
+        deferred fields are not loaded.
+        """
+        if instance.__dict__.get('evidence_type', 'PHOTO') != 'PHOTO':
+            return None
+        value = instance.__dict__.get('image' if isinstance(instance, ProgressImage) else 'file')
+        return getattr(value, 'name', value) or None
+
+    @staticmethod
+    def describe_source(instance):
+        """Return (file, project_id) for a photo upload, or None if not a photo"""
+        if isinstance(instance, ProgressImage):
+            return instance.image, instance.progress.project_id
+        if isinstance(instance, IssueEvidence) and instance.evidence_type == 'PHOTO':
+            return instance.file, instance.issue.project_id
+        if isinstance(instance, RatingEvidence) and instance.evidence_type == 'PHOTO':
+            return instance.file, instance.rating.project_id
+        return None
+
+    @classmethod
+    def index_instance(cls, instance):
+        """
+        Compute and store the fingerprint for a ProgressImage, IssueEvidence
+        or RatingEvidence row. Returns None for non-photos and unreadable files.
+        """
+        source = cls.describe_source(instance)
+        if source is None or not source[0]:
+            return None
+        file, project_id = source
+        try:
+            with file.open('rb') as fileobj:
+                value = perceptual_hash.dhash(fileobj)
+        except (OSError, UnidentifiedImageError):
+            return None
+
+        bands = perceptual_hash.split_bands(value)
+        fingerprint, _ = cls.objects.update_or_create(
+            source_model=instance.__class__.__name__,
+            source_id=instance.id,
+            defaults={
+                'project_id': project_id,
+                'phash': perceptual_hash.to_hex(value),
+                **{f'band_{i}': band for i, band in enumerate(bands)},
+            }
+        )
+        return fingerprint
+
+    @property
+    def value(self):
+        return int(self.phash, 16)
+
+    @classmethod
+    def find_near_duplicates(cls, value, max_distance=None, exclude=None):
+        """
+        Return (fingerprint, distance) pairs within max_distance of value,
+        closest first. exclude is an optional (source_model, source_id) pair.
+        """
+        if max_distance is None:
+            max_distance = settings.IMAGE_DUPLICATE_MAX_DISTANCE
+        max_distance = min(max_distance, perceptual_hash.MAX_SEARCH_DISTANCE)
+
+        query = models.Q()
+        for i, band in enumerate(perceptual_hash.split_bands(value)):
+            query |= models.Q(**{f'band_{i}__in': perceptual_hash.band_probes(band)})
+        candidates = cls.objects.filter(query)
+        if exclude:
+            candidates = candidates.exclude(source_model=exclude[0], source_id=exclude[1])
+
+        matches = []
+        for fingerprint in candidates:
+            distance = perceptual_hash.hamming(value, fingerprint.value)
+            if distance <= max_distance:
+                matches.append((fingerprint, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+    @classmethod
+    def near_duplicates_by_source(cls, source_model, source_ids, max_distance=None):
+        """
+        find_near_duplicates for the fingerprints of many rows at once, in two
+        queries. Returns {source_id: [(fingerprint, distance), ...]} for the
+        rows that have near-duplicates.
+        """
+        if max_distance is None:
+            max_distance = settings.IMAGE_DUPLICATE_MAX_DISTANCE
+        max_distance = min(max_distance, perceptual_hash.MAX_SEARCH_DISTANCE)
+
+        fingerprints = list(cls.objects.filter(source_model=source_model, source_id__in=source_ids))
+        if not fingerprints:
+            return {}
+        probes = [set() for _ in range(perceptual_hash.BAND_COUNT)]
+        for fingerprint in fingerprints:
+            for i, band in enumerate(perceptual_hash.split_bands(fingerprint.value)):
+                probes[i].update(perceptual_hash.band_probes(band))
+        query = models.Q()
+        for i, band_probes in enumerate(probes):
+            query |= models.Q(**{f'band_{i}__in': band_probes})
+        candidates = list(cls.objects.filter(query))
+
+        # Within MAX_SEARCH_DISTANCE, two hashes always share a band probe, so
+        # comparing against every candidate finds what find_near_duplicates would
+        results = {}
+        for fingerprint in fingerprints:
+            matches = []
+            for candidate in candidates:
+                if (candidate.source_model, candidate.source_id) == (source_model, fingerprint.source_id):
+                    continue
+                distance = perceptual_hash.hamming(fingerprint.value, candidate.value)
+                if distance <= max_distance:
+                    matches.append((candidate, distance))
+            if matches:
+                matches.sort(key=lambda match: match[1])
+                results[fingerprint.source_id] = matches
+        return results
+
+
+# ✅ Deduplicated Uploads - Reference counts for content-addressed blobs
+class StoredBlob(models.Model):
+    """
+    One file stored by core.storage.ContentAddressedStorage. Identical uploads
+    share a blob; ref_count tracks how many file fields point at it.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+    @classmethod
+    def register(cls, name, size):
+        """
+        Record an uploaded blob without a reference; the timestamp keeps an
+        unreferenced one from being collected before its row is saved
+        """
+        if not cls.objects.filter(name=name).update(updated_at=timezone.now()):
+            cls.objects.get_or_create(name=name, defaults={'size': size})
+
+    @classmethod
+    def retain(cls, name, size=0):
+        """Add a reference to a blob, creating its row if it has none"""
+        updated = cls.objects.filter(name=name).update(
+            ref_count=models.F('ref_count') + 1,
+            updated_at=timezone.now()
+        )
+        if not updated:
+            blob, created = cls.objects.get_or_create(
+                name=name, defaults={'size': size, 'ref_count': 1}
+            )
+            if not created:
+                cls.objects.filter(pk=blob.pk).update(ref_count=models.F('ref_count') + 1)
+
+    @classmethod
+    def release(cls, name):
+        """Drop a reference; blobs left at zero are removed by collect_orphan_blobs"""
+        # Never below zero, so a stray extra release cannot eat a later upload's reference
+        return cls.objects.filter(name=name, ref_count__gt=0).update(
+            ref_count=models.F('ref_count') - 1,
+            updated_at=timezone.now()
+        )
+
+
+# ✅ Resumable Uploads - Chunked upload sessions for large evidence files
+class UploadSession(models.Model):
+    """
+    A resumable upload of one evidence file. Chunks are appended to a
+    .part file on disk; finalizing attaches it to a new evidence record.
+    """
+    TARGET_CHOICES = (
+        ('ISSUE_EVIDENCE', 'Issue Evidence'),
+        ('RATING_EVIDENCE', 'Rating Evidence'),
+    )
+
+    STATUS_CHOICES = (
+        ('ACTIVE', 'Active'),
+        ('COMPLETED', 'Completed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    issue = models.ForeignKey(
+        IssueReport,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='upload_sessions'
+    )
+    rating = models.ForeignKey(
+        ContractorRating,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='upload_sessions'
+    )
+    evidence_type = models.CharField(
+        max_length=10,
+        choices=IssueEvidence.EVIDENCE_TYPE_CHOICES,
+        default='VIDEO'
+    )
+    description = models.CharField(max_length=200, blank=True)
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    received_size = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='ACTIVE')
+    evidence_id = models.PositiveIntegerField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.received_size}/{self.total_size})"
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f"{self.id}.part")
+
+    @property
+    def is_complete(self):
+        return self.received_size >= self.total_size
+
+
+# ✅ Request Profiling - One `?_profile=1` request; the profile data is on disk
+class RequestProfile(models.Model):
+    """
+    Summary of a profiled API request. The SQL list, serializer field tree
+    and stacks live in a directory under PROFILE_ROOT, and only the newest
+    PROFILE_RING_SIZE profiles are kept (see core.profiling).
+    """
+    MODE_CHOICES = (
+        ('SAMPLE', 'Sampling profiler'),
+        ('CPROFILE', 'cProfile'),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    route = models.CharField(max_length=200)
+    status = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    db_ms = models.FloatField()
+    serialize_ms = models.FloatField()
+    queries = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    @property
+    def directory(self):
+        return os.path.join(settings.PROFILE_ROOT, str(self.id))
+
+    @property
+    def stacks_filename(self):
+        return 'stacks.folded' if self.mode == 'SAMPLE' else 'cprofile.prof'
+
+    def load(self):
+        """The profile.json written with the profile, or {} once it is gone"""
+        try:
+            with open(os.path.join(self.directory, 'profile.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+
+# ✅ Full-Text Search - The searchable text of projects, issues, materials and contractors
+class SearchEntry(models.Model):
+    """
+    One row per searchable object. The database indexes title and content
+    (FTS5 on SQLite, a tsvector column on PostgreSQL; see core.search),
+    signals keep the rows current and ``manage.py rebuild_search_index``
+    recreates them after bulk loads.
+    """
+    KIND_CHOICES = (
+        ('project', 'Project'),
+        ('issue', 'Issue Report'),
+        ('material', 'Material'),
+        ('contractor', 'Contractor'),
+    )
+    MODEL_KINDS = {
+        Project: 'project',
+        IssueReport: 'issue',
+        Material: 'material',
+        ContractorProfile: 'contractor',
+    }
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    project = models.ForeignKey(
+        Project,
+        related_name='search_entries',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+    title = models.CharField(max_length=200)
+    subtitle = models.CharField(max_length=200, blank=True)
+    content = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        verbose_name_plural = 'search entries'
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title}"
+
+    @staticmethod
+    def describe(instance):
+        """The indexed fields of a Project, IssueReport, Material or ContractorProfile"""
+        if isinstance(instance, Project):
+            return {
+                'project_id': instance.id,
+                'title': instance.name,
+                'subtitle': instance.location,
+                'content': ' '.join((instance.location, instance.ministry, instance.contractor)),
+            }
+        if isinstance(instance, IssueReport):
+            return {
+                'project_id': instance.project_id,
+                'title': instance.title,
+                'subtitle': instance.project.name,
+                'content': instance.description,
+            }
+        if isinstance(instance, Material):
+            return {
+                'project_id': instance.project_id,
+                'title': instance.name,
+                'subtitle': instance.supplier_name,
+                'content': instance.supplier_name,
+            }
+        full_name = instance.user.get_full_name()
+        return {
+            'project_id': None,
+            'title': instance.user.username,
+            'subtitle': full_name[:200],
+            'content': full_name,
+        }
+
+    @classmethod
+    def for_instance(cls, instance):
+        """An unsaved entry for instance, for bulk_create"""
+        return cls(kind=cls.MODEL_KINDS[type(instance)], object_id=instance.id, **cls.describe(instance))
+
+    @classmethod
+    def index_instance(cls, instance):
+        entry, _ = cls.objects.update_or_create(
+            kind=cls.MODEL_KINDS[type(instance)],
+            object_id=instance.id,
+            defaults=cls.describe(instance)
+        )
+        if isinstance(instance, Project):
+            # Issues show the name of their project
+            cls.objects.filter(kind='issue', project=instance).exclude(
+                subtitle=instance.name
+            ).update(subtitle=instance.name)
+        return entry
+
+    @classmethod
+    def remove_instance(cls, instance):
+        cls.objects.filter(kind=cls.MODEL_KINDS[type(instance)], object_id=instance.id).delete()
+
+
+# ✅ District Rollups - Precomputed per-district counts (see core.districts)
+class DistrictStats(models.Model):
+    """
+    One row per NID district code: its residents (profiles with an NID from
+    the district) and their issue reports, next to the projects located in
+    the district, their budget and the issues reported on them
+    """
+    district_code = models.PositiveSmallIntegerField(primary_key=True)
+    residents = models.PositiveIntegerField(default=0)
+    reporters = models.PositiveIntegerField(default=0, help_text="Residents who reported at least one issue")
+    reported_issues = models.PositiveIntegerField(default=0, help_text="Issues reported by residents, anywhere")
+    projects = models.PositiveIntegerField(default=0)
+    total_budget = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0'))
+    issues = models.PositiveIntegerField(default=0, help_text="Issues reported on the district's projects")
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['district_code']
+        verbose_name_plural = 'district stats'
+
+    def __str__(self):
+        return f"{self.district_code:02d} {self.name}"
+
+    @property
+    def name(self):
+        return geo.district_names().get(self.district_code, '')
+
+
+# ✅ Public Snapshot - Projects waiting for publish_public_snapshot --watch to re-render them
+class PendingPublish(models.Model):
+    """
+    One row per project touched since the last publish; queued_at is the
+    first write, so a busy project is still published once the debounce
+    delay has passed since then
+    """
+    project_id = models.PositiveIntegerField(primary_key=True)
+    queued_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Project {self.project_id} queued at {self.queued_at:%Y-%m-%d %H:%M:%S}"
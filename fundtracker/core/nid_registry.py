@@ -0,0 +1,172 @@
+"""
+✅ Bulk NID Verification - Check UserProfile.nepal_nid against registry extracts
+
+Registry extracts are CSV files (gzipped or not) of millions of lines with
+an NID column. RegistryIndex.build() streams one into an SQLite file, sorted on disk
+into one integer primary key per NID (DD-WW-NNNNNNNN as DDWWNNNNNNNN), so the
+extract is read once and every lookup is a B-tree probe. The file records
+the size and modification time of the extract it was built from and is
+reused until the extract changes.
+
+verify() walks the profiles to check in primary-key chunks, looks each
+chunk up in one query and writes the outcome with two UPDATEs per chunk
+(found, not found), stamping nid_checked_at. verify_nids only reads
+profiles never checked, which a partial index covers: new registrations,
+and profiles whose NID changed since (UserProfile.save clears the stamp).
+"""
+import csv
+import gzip
+import json
+import os
+import re
+import sqlite3
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import UserProfile
+
+NID_RE = re.compile(r'(\d{2})-?(\d{2})-?(\d{8})')
+
+
+class RegistryError(Exception):
+    pass
+
+
+def nid_key(value):
+    """The NID as the integer DDWWNNNNNNNN, or None when it is malformed"""
+    match = NID_RE.fullmatch((value or '').strip())
+    return int(''.join(match.groups())) if match else None
+
+
+def open_extract(path):
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rt', newline='', encoding='utf-8')
+    return open(path, newline='', encoding='utf-8')
+
+
+class RegistryIndex:
+    """An on-disk index of the NIDs in a registry extract"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+
+    @staticmethod
+    def source_signature(source):
+        stat = os.stat(source)
+        return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+    @classmethod
+    def open(cls, source, path):
+        """The index at path if it was built from source as it is now, else None"""
+        if not os.path.exists(path):
+            return None
+        index = cls(path)
+        try:
+            row = index.connection.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        except sqlite3.DatabaseError:
+            row = None
+        if row is None or row[0] != cls.source_signature(source):
+            index.close()
+            return None
+        return index
+
+    @classmethod
+    def build(cls, source, path, column='nid'):
+        """
+        Index the NIDs of source's column into a new file at path; returns
+        (index, rows read, malformed rows skipped)
+        """
+        building = f'{path}.building'
+        if os.path.exists(building):
+            os.remove(building)
+        connection = sqlite3.connect(building)
+        # A half-built file is thrown away, so it needs no journal
+        connection.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TEMP TABLE staging (nid INTEGER);
+            CREATE TABLE registry (nid INTEGER PRIMARY KEY);
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        counts = {'read': 0, 'skipped': 0}
+
+        def keys(reader, position):
+            for row in reader:
+                counts['read'] += 1
+                key = nid_key(row[position]) if len(row) > position else None
+                if key is None:
+                    counts['skipped'] += 1
+                else:
+                    yield (key,)
+
+        try:
+            with open_extract(source) as f:
+                reader = csv.reader(f)
+                header = [name.strip().lower() for name in next(reader, [])]
+                if column.lower() not in header:
+                    raise RegistryError(f'{source} has no "{column}" column (columns: {", ".join(header)})')
+                connection.executemany("INSERT INTO staging (nid) VALUES (?)", keys(reader, header.index(column.lower())))
+            # Appending to an unindexed table and then filling the B-tree in
+            # key order (SQLite sorts on disk) beats inserting keys at random
+            connection.execute("INSERT OR IGNORE INTO registry (nid) SELECT nid FROM staging ORDER BY nid")
+            connection.execute("INSERT INTO meta VALUES ('source', ?)", [cls.source_signature(source)])
+            connection.commit()
+        except BaseException:
+            connection.close()
+            os.remove(building)
+            raise
+        connection.close()
+        os.replace(building, path)
+        return cls(path), counts['read'], counts['skipped']
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM registry").fetchone()[0]
+
+    def lookup(self, keys):
+        """The keys that are in the registry"""
+        rows = self.connection.execute(
+            "SELECT nid FROM registry WHERE nid IN (SELECT value FROM json_each(?))",
+            [json.dumps(list(keys))]
+        )
+        return {nid for nid, in rows}
+
+    def close(self):
+        self.connection.close()
+
+
+def profiles_to_check(recheck=False):
+    """Unverified profiles with an NID; only those never checked unless recheck"""
+    profiles = UserProfile.objects.filter(nid_verified=False, nepal_nid__isnull=False)
+    return profiles if recheck else profiles.filter(nid_checked_at__isnull=True)
+
+
+def verify(index, profiles, batch_size=5000, dry_run=False):
+    """
+    Look the profiles of a UserProfile queryset up in index, batch_size at a
+    time, and record the outcome unless dry_run; yields (checked, verified)
+    per chunk
+    """
+    last_id = 0
+    while True:
+        chunk = list(profiles.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'nepal_nid')[:batch_size])
+        if not chunk:
+            return
+        last_id = chunk[-1][0]
+        keys = {pk: nid_key(nid) for pk, nid in chunk}
+        found = index.lookup({key for key in keys.values() if key is not None})
+        verified = {pk: nid for pk, nid in chunk if keys[pk] in found}
+        not_found = {pk: nid for pk, nid in chunk if keys[pk] not in found}
+        if not dry_run:
+            now = timezone.now()
+            with transaction.atomic():
+                # Matching the NID too leaves a profile whose NID changed since
+                # it was read (and had its stamp cleared) for the next run
+                UserProfile.objects.filter(pk__in=verified, nepal_nid__in=verified.values()).update(
+                    nid_verified=True, nid_checked_at=now
+                )
+                UserProfile.objects.filter(pk__in=not_found, nepal_nid__in=not_found.values()).update(
+                    nid_checked_at=now
+                )
+        yield len(chunk), len(verified)
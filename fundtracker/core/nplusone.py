@@ -0,0 +1,95 @@
+"""
+✅ N+1 Detection - The same SELECT repeated within one request
+
+While PerformanceMiddleware instruments a request, every SELECT is reduced
+to its shape (the SQL template, with ``IN (%s, %s, ...)`` lists collapsed)
+and counted. When a shape reaches NPLUSONE_THRESHOLD the stack is inspected
+once to find what issued it: the serializer field being rendered (e.g.
+``ProgressSerializer.submitted_by_username``) and the closest line of
+project code. At the end of the request the repeats are logged as a
+warning, or raised as NPlusOneQueries when NPLUSONE_RAISE is set (the test
+runner sets it, see core.test_runner).
+
+The fix is nearly always a select_related/prefetch_related in
+core.querysets for the field named in the report.
+"""
+import os
+import re
+import sys
+
+from django.conf import settings
+from rest_framework.fields import Field
+from rest_framework.serializers import ListSerializer
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+INSTRUMENTATION_FILES = {
+    os.path.join(THIS_DIR, name) for name in ('nplusone.py', 'performance.py', 'middleware.py')
+}
+
+
+class NPlusOneQueries(Exception):
+    pass
+
+
+def query_shape(sql):
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+def serializer_field_path(field):
+    """Dotted path from the root serializer class to field"""
+    names = []
+    while field.parent is not None:
+        if field.field_name:
+            names.append(field.field_name)
+        field = field.parent
+    root = field.child if isinstance(field, ListSerializer) else field
+    return '.'.join([root.__class__.__name__] + names[::-1])
+
+
+def describe_origin():
+    """(serializer field path or None, project code location) of the running query"""
+    field_path = location = None
+    project_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(1)
+    while frame is not None and (field_path is None or location is None):
+        code = frame.f_code
+        if field_path is None and code.co_name in ('get_attribute', 'to_representation'):
+            field = frame.f_locals.get('self')
+            if isinstance(field, Field) and field.field_name:
+                field_path = serializer_field_path(field)
+        filename = os.path.abspath(code.co_filename)
+        if location is None and filename.startswith(project_dir) and filename not in INSTRUMENTATION_FILES:
+            location = f'{os.path.relpath(filename, project_dir)}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return field_path, location
+
+
+def note_query(timings, sql):
+    """Count a query's shape against the request; remember the origin of repeats"""
+    if not sql.lstrip()[:6].upper() == 'SELECT':
+        return
+    shape = query_shape(sql)
+    count = timings.shapes[shape] = timings.shapes.get(shape, 0) + 1
+    if count == settings.NPLUSONE_THRESHOLD:
+        timings.repeated[shape] = describe_origin()
+
+
+def repeated_queries(timings):
+    """One line per repeated query shape"""
+    lines = []
+    for shape, (field_path, location) in timings.repeated.items():
+        if field_path and location:
+            origin = f'{field_path} ({location})'
+        else:
+            origin = field_path or location or 'outside project code'
+        lines.append(f'{timings.shapes[shape]}x from {origin}: {shape}')
+    return lines
+
+
+def report(request, route, timings, logger):
+    lines = repeated_queries(timings)
+    message = f'N+1 queries in {request.method} {route}:\n  ' + '\n  '.join(lines)
+    if settings.NPLUSONE_RAISE:
+        raise NPlusOneQueries(message)
+    logger.warning(message)
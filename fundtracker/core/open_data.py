@@ -0,0 +1,265 @@
+"""
+✅ Open Data - Columnar snapshots of the public dataset
+
+Each dataset is written as Hive-style partitions:
+
+    <OPEN_DATA_ROOT>/<dataset>/ministry_slug=<slug>/fiscal_year=<yyyy-yy>/part-<run>.parquet
+
+A run only exports rows changed since the previous run (recorded in
+manifest.json), appending new part files. A row can therefore appear in
+several parts; readers keep the copy with the latest ``snapshot_at``.
+
+Rows deleted since the previous run (the Tombstone records also behind
+/api/sync/) are removed from the part files holding them, which are
+rewritten in place. Tombstones are pruned after
+SYNC_TOMBSTONE_RETENTION_DAYS, so a dataset whose previous run is older
+than that is exported again from scratch.
+"""
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta
+
+import pyarrow as pa
+import pyarrow.compute
+import pyarrow.ipc
+import pyarrow.parquet
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from .models import Project, Fund, Material, MaterialPayment, Progress, IssueReport, Tombstone
+
+MANIFEST_NAME = 'manifest.json'
+BATCH_SIZE = 50_000
+
+# name: (model, ministry lookup, fiscal-year date lookup, change-tracking fields)
+DATASETS = {
+    'projects': (Project, 'ministry', 'start_date', ('updated_at',)),
+    'funds': (Fund, 'project__ministry', 'released_at', ('updated_at',)),
+    'materials': (Material, 'project__ministry', 'created_at', ('updated_at',)),
+    'material_payments': (MaterialPayment, 'material__project__ministry', 'payment_date', ('updated_at',)),
+    'progress': (Progress, 'project__ministry', 'date', ('updated_at',)),
+    'issues': (IssueReport, 'project__ministry', 'reported_at', ('updated_at',)),
+}
+
+FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+
+def fiscal_year(value):
+    """Nepal's fiscal year starts in mid-July (Shrawan 1), e.g. 2024-07-16 -> '2024-25'"""
+    if value is None:
+        return 'unknown'
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    start = date(value.year, settings.FISCAL_YEAR_START_MONTH, settings.FISCAL_YEAR_START_DAY)
+    first_year = value.year if value >= start else value.year - 1
+    return f'{first_year}-{str(first_year + 1)[-2:]}'
+
+
+def arrow_type(field):
+    if isinstance(field, models.ForeignKey):
+        return pa.int64()
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return pa.int64()
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    return pa.string()
+
+
+class PartitionWriter:
+    """Writes record batches for one partition into a single part file"""
+
+    def __init__(self, path, schema, file_format):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.sink = None
+        if file_format == 'parquet':
+            self.writer = pa.parquet.ParquetWriter(path, schema, compression='zstd')
+        else:
+            self.sink = pa.OSFile(path, 'wb')
+            self.writer = pa.ipc.new_file(self.sink, schema)
+
+    def write(self, batch):
+        self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+        if self.sink:
+            self.sink.close()
+
+
+def read_part(path, file_format, columns=None):
+    if file_format == 'parquet':
+        return pa.parquet.read_table(path, columns=columns)
+    table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return table.select(columns) if columns else table
+
+
+def write_part(path, table, file_format):
+    """Replace a part file with table, atomically"""
+    temp_path = path + '.tmp'
+    if file_format == 'parquet':
+        pa.parquet.write_table(table, temp_path, compression='zstd')
+    else:
+        with pa.OSFile(temp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, path)
+
+
+class SnapshotExporter:
+    def __init__(self, root=None, file_format='parquet', stdout=None):
+        self.root = str(root or settings.OPEN_DATA_ROOT)
+        self.file_format = file_format
+        self.stdout = stdout
+        self.manifest_path = os.path.join(self.root, MANIFEST_NAME)
+
+    def load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {'datasets': {}}
+
+    def save_manifest(self, manifest):
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def run(self, datasets=None, full=False):
+        manifest = self.load_manifest()
+        for name in datasets or DATASETS:
+            state = manifest['datasets'].get(name, {})
+            stale = state.get('format', self.file_format) != self.file_format or not self.deletions_known(state)
+            if full or stale:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+                state = {}
+            manifest['datasets'][name] = self.export(name, state)
+            self.save_manifest(manifest)
+        return manifest
+
+    def deletions_known(self, state):
+        """Whether every deletion since the previous run still has its Tombstone"""
+        if not state.get('last_snapshot_at'):
+            return True
+        oldest = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        return parse_datetime(state['last_snapshot_at']) >= oldest
+
+    def remove_deleted(self, name, parts, since):
+        """Drop the rows deleted since the previous run from parts; returns (parts left, rows removed)"""
+        model = DATASETS[name][0]
+        pk = model._meta.pk.attname
+        deleted = pa.array(
+            Tombstone.objects.filter(model_name=model.__name__, deleted_at__gte=since)
+            .values_list('object_id', flat=True).distinct(),
+            type=pa.int64()
+        )
+        if not len(deleted):
+            return parts, 0
+        left, removed = [], 0
+        for relative_path in parts:
+            path = os.path.join(self.root, relative_path)
+            # Most parts hold none of them, which the id column alone shows
+            if not pa.compute.any(pa.compute.is_in(read_part(path, self.file_format, [pk])[pk], deleted)).as_py():
+                left.append(relative_path)
+                continue
+            table = read_part(path, self.file_format)
+            kept = table.filter(pa.compute.invert(pa.compute.is_in(table[pk], deleted)))
+            removed += table.num_rows - kept.num_rows
+            if kept.num_rows:
+                write_part(path, kept, self.file_format)
+                left.append(relative_path)
+            else:
+                os.remove(path)
+        return left, removed
+
+    def export(self, name, state):
+        model, ministry_lookup, date_lookup, change_fields = DATASETS[name]
+        started_at = timezone.now()
+        run_id = started_at.strftime('%Y%m%dT%H%M%S%fZ')
+
+        fields = list(model._meta.concrete_fields)
+        schema = pa.schema(
+            [pa.field(field.attname, arrow_type(field)) for field in fields]
+            + [pa.field('snapshot_at', pa.timestamp('us', tz='UTC'))]
+        )
+
+        queryset = model.objects.all()
+        since = parse_datetime(state['last_snapshot_at']) if state.get('last_snapshot_at') else None
+        if since:
+            changed = models.Q()
+            for field_name in change_fields:
+                changed |= models.Q(**{f'{field_name}__gte': since})
+            queryset = queryset.filter(changed)
+        # Ordering by partition keys means partitions arrive one after another,
+        # so only one file is open at a time
+        rows = queryset.order_by(ministry_lookup, date_lookup, 'pk').values_list(
+            *[field.attname for field in fields], ministry_lookup, date_lookup
+        )
+
+        parts, removed = list(state.get('parts', [])), 0
+        if since:
+            parts, removed = self.remove_deleted(name, parts, since)
+        writer = None
+        current_partition = None
+        columns = [[] for _ in schema]
+        row_count = 0
+
+        def flush():
+            if columns[0]:
+                writer.write(pa.record_batch(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                for values in columns:
+                    values.clear()
+
+        for row in rows.iterator(chunk_size=2000):
+            *values, ministry, partition_date = row
+            partition = (slugify(ministry or '') or 'unknown', fiscal_year(partition_date))
+            if partition != current_partition:
+                if writer:
+                    flush()
+                    writer.close()
+                current_partition = partition
+                relative_path = os.path.join(
+                    name, f'ministry_slug={partition[0]}', f'fiscal_year={partition[1]}',
+                    f'part-{run_id}{FORMATS[self.file_format]}'
+                )
+                writer = PartitionWriter(os.path.join(self.root, relative_path), schema, self.file_format)
+                parts.append(relative_path.replace(os.sep, '/'))
+
+            for column, value in zip(columns, values):
+                column.append(value)
+            columns[-1].append(started_at)
+            row_count += 1
+            if len(columns[0]) >= BATCH_SIZE:
+                flush()
+
+        if writer:
+            flush()
+            writer.close()
+
+        if self.stdout:
+            self.stdout.write(f"{name}: exported {row_count} rows, removed {removed} deleted")
+        return {
+            'format': self.file_format,
+            'last_snapshot_at': started_at.isoformat(),
+            'last_row_count': row_count,
+            'last_removed_count': removed,
+            'total_rows_written': state.get('total_rows_written', 0) + row_count,
+            'parts': parts,
+        }
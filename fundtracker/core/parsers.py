@@ -0,0 +1,34 @@
+"""
+✅ Fast Rendering - Request body parsers matching core.renderers
+
+ORJSONParser replaces DRF's JSONParser (UTF-8 bodies, which is what every
+client sends), and MessagePackParser accepts
+``Content-Type: application/msgpack``.
+"""
+import orjson
+import msgpack
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class ORJSONParser(parsers.JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f'MessagePack parse error - {str(exc) or exc.__class__.__name__}')
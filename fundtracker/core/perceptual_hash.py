@@ -0,0 +1,53 @@
+"""
+✅ Duplicate Photo Detection - Perceptual hashing helpers
+
+Images are reduced to a 64-bit difference hash (dHash). Visually identical
+photos (re-encoded, resized, lightly cropped) end up a few bits apart, so
+near-duplicates are found by Hamming distance.
+
+For fast lookups the hash is split into four 16-bit bands that are stored in
+indexed columns (multi-index hashing). By the pigeonhole principle, two hashes
+within distance ``d`` share at least one band that differs in at most
+``d // 4`` bits, so probing every band together with its 1-bit neighbours finds
+every match up to distance 7 using plain index lookups.
+"""
+from PIL import Image, ImageOps
+
+HASH_SIZE = 8
+BAND_COUNT = 4
+BAND_BITS = 16
+BAND_MASK = (1 << BAND_BITS) - 1
+MAX_SEARCH_DISTANCE = 7
+
+
+def dhash(fileobj):
+    """Return the 64-bit difference hash of an image file as an int"""
+    with Image.open(fileobj) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+        pixels = list(image.getdata())
+
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def to_hex(value):
+    return f'{value:016x}'
+
+
+def split_bands(value):
+    """Split a 64-bit hash into BAND_COUNT integers of BAND_BITS each"""
+    return [(value >> (BAND_BITS * i)) & BAND_MASK for i in range(BAND_COUNT)]
+
+
+def band_probes(band):
+    """A band value plus every value one bit away from it"""
+    return [band] + [band ^ (1 << bit) for bit in range(BAND_BITS)]
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
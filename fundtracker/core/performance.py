@@ -0,0 +1,227 @@
+"""
+✅ Performance Instrumentation - Where each request's time went
+
+PerformanceMiddleware opens a RequestTimings for a sampled fraction of
+requests (PERFORMANCE_SAMPLE_RATE). While it is open, every SQL query
+(``record_query``, installed on each new database connection), JWT
+authentication, top-level serializer ``to_representation`` call and
+response rendering (``core.renderers``) adds its time to it. The totals
+are returned as a ``Server-Timing`` header and logged as one JSON line on
+the ``core.performance`` logger, and repeated query shapes are reported
+by ``core.nplusone``. Profiled requests (``core.profiling``) also keep
+every query and the cost of each serializer field. Unsampled requests
+skip all of that; they only update the per-route histograms served at
+/metrics in the Prometheus text format.
+
+Histograms live in process memory, so each worker reports its own; let
+the scraper sum them across instances.
+"""
+import bisect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from rest_framework import serializers
+
+from . import nplusone
+
+logger = logging.getLogger('core.performance')
+
+current_timings = ContextVar('current_timings', default=None)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760)
+
+
+class RequestTimings:
+    """Time per phase (seconds), SQL query count and query shapes of one request"""
+
+    def __init__(self, profile=False):
+        self.durations = {'db': 0.0, 'auth': 0.0, 'serialize': 0.0, 'render': 0.0}
+        self.queries = 0
+        self.open_phases = set()
+        self.shapes = {}  # query shape -> times run
+        self.repeated = {}  # shapes run NPLUSONE_THRESHOLD+ times -> origin
+        # Profiled requests only
+        self.sql = [] if profile else None  # one dict per query, in order
+        self.field_costs = {} if profile else None  # field path -> [calls, seconds]
+
+    def server_timing(self, total):
+        parts = [
+            f'db;dur={self.durations["db"] * 1000:.1f};desc="{self.queries} queries"',
+            f'auth;dur={self.durations["auth"] * 1000:.1f}',
+            f'serialize;dur={self.durations["serialize"] * 1000:.1f}',
+            f'render;dur={self.durations["render"] * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ]
+        return ', '.join(parts)
+
+
+@contextmanager
+def timed(phase):
+    """Add the block's duration to the current request's phase, once per nesting"""
+    timings = current_timings.get()
+    if timings is None or phase in timings.open_phases:
+        yield
+        return
+    timings.open_phases.add(phase)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[phase] += time.perf_counter() - started
+        timings.open_phases.discard(phase)
+
+
+class TimedModelSerializer(serializers.ModelSerializer):
+    """Base for the API serializers, so their time shows up as 'serialize'"""
+
+    def to_representation(self, instance):
+        timings = current_timings.get()
+        if timings is not None and timings.field_costs is not None and not getattr(self, '_fields_timed', False):
+            time_fields(self, timings.field_costs)
+        with timed('serialize'):
+            return super().to_representation(instance)
+
+
+def time_fields(serializer, field_costs):
+    """Charge each readable field's get_attribute and to_representation to its path"""
+    serializer._fields_timed = True
+    for field in serializer._readable_fields:
+        cost = field_costs.setdefault(nplusone.serializer_field_path(field), [0, 0.0])
+        field.get_attribute = timed_call(field.get_attribute, cost, counts_call=True)
+        field.to_representation = timed_call(field.to_representation, cost)
+
+
+def timed_call(method, cost, counts_call=False):
+    def call(*args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            cost[1] += time.perf_counter() - started
+            if counts_call:
+                cost[0] += 1
+    return call
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper; costs one ContextVar lookup outside sampled requests"""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.durations['db'] += elapsed
+        timings.queries += 1
+        nplusone.note_query(timings, sql)
+        if timings.sql is not None:
+            field_path, location = nplusone.describe_origin()
+            timings.sql.append({
+                'sql': sql,
+                'params': repr(params)[:500],
+                'many': many,
+                'ms': round(elapsed * 1000, 3),
+                'field': field_path,
+                'location': location,
+            })
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Per (method, route) histograms, rendered in the Prometheus text format"""
+
+    METRICS = {
+        'fundtracker_request_duration_seconds': ('Request duration', DURATION_BUCKETS),
+        'fundtracker_response_size_bytes': ('Response body size (non-streaming responses)', SIZE_BUCKETS),
+        'fundtracker_request_queries': ('SQL queries per request (sampled requests)', QUERY_BUCKETS),
+        'fundtracker_request_db_seconds': ('Time spent in SQL (sampled requests)', DURATION_BUCKETS),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {name: {} for name in self.METRICS}
+
+    def observe(self, name, labels, value):
+        with self.lock:
+            histogram = self.histograms[name].get(labels)
+            if histogram is None:
+                histogram = self.histograms[name][labels] = Histogram(self.METRICS[name][1])
+            histogram.observe(value)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (description, buckets) in self.METRICS.items():
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for (method, route), histogram in sorted(self.histograms[name].items()):
+                    labels = f'method="{method}",route="{route}"'
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def route_label(request):
+    """URL name of the matched route; bounded, unlike the path"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name
+
+
+def record_request(request, response, started, timings):
+    """Update the histograms and, for sampled requests, add Server-Timing and log"""
+    total = time.perf_counter() - started
+    labels = (request.method, route_label(request))
+    size = None if response.streaming else len(response.content)
+    metrics.observe('fundtracker_request_duration_seconds', labels, total)
+    if size is not None:
+        metrics.observe('fundtracker_response_size_bytes', labels, size)
+    if timings is None:
+        return response
+
+    metrics.observe('fundtracker_request_queries', labels, timings.queries)
+    metrics.observe('fundtracker_request_db_seconds', labels, timings.durations['db'])
+    response['Server-Timing'] = timings.server_timing(total)
+    logger.info(json.dumps({
+        'method': request.method,
+        'route': labels[1],
+        'path': request.path,
+        'status': response.status_code,
+        'duration_ms': round(total * 1000, 2),
+        'db_ms': round(timings.durations['db'] * 1000, 2),
+        'queries': timings.queries,
+        'auth_ms': round(timings.durations['auth'] * 1000, 2),
+        'serialize_ms': round(timings.durations['serialize'] * 1000, 2),
+        'render_ms': round(timings.durations['render'] * 1000, 2),
+        'bytes': size,
+        'repeated_queries': [origin[0] or origin[1] for origin in timings.repeated.values()],
+    }))
+    if timings.repeated:
+        nplusone.report(request, labels[1], timings, logger)
+    return response
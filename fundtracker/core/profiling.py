@@ -0,0 +1,251 @@
+"""
+✅ Request Profiling - Profile a single API request on demand
+
+Some requests are only slow with production data, so they are profiled
+where they run: add ``?_profile=1`` to a request made with a government or
+auditor access token, or carrying a PROFILE_HEADER token printed by
+``manage.py profile_token``. PerformanceMiddleware then records
+
+- wall-clock stacks of the request sampled every PROFILE_SAMPLE_INTERVAL
+  seconds, in the folded format that speedscope and flamegraph.pl draw as
+  a flame graph (``?_profile=cprofile`` runs cProfile instead and keeps
+  its ``.prof`` file),
+- every SQL query with its duration and the serializer field that ran it,
+- the serializer field tree with calls and time per field
+  (``ProjectSerializer.progress.submitted_by_username``).
+
+Each profile is a RequestProfile row plus a directory under PROFILE_ROOT.
+Only the newest PROFILE_RING_SIZE are kept; browse them in the Django
+admin. One request per process is profiled at a time, and any other
+``?_profile`` request, allowed or not, is served as usual. Under ASGI the
+sampler watches every thread (sync views run in executor threads), so a
+concurrent request can show up in the stacks; cProfile is not available
+there, as it only sees the event loop thread.
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .models import RequestProfile
+from .performance import route_label
+
+PROFILE_PARAM = '_profile'
+TOKEN_SALT = 'core.profile'
+PROFILER_ROLES = ('GOVERNMENT', 'AUDITOR')
+TOP_FUNCTIONS = 50
+
+# cProfile and the sampler are process-wide; one profiled request at a time
+profiling_lock = threading.Lock()
+
+
+def profile_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def has_profile_token(request):
+    token = request.headers.get(settings.PROFILE_HEADER)
+    if not token:
+        return False
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def access_token_user(request):
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(header[len('Bearer '):].encode()))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def wants_profile(request):
+    return request.GET.get(PROFILE_PARAM, '0') != '0'
+
+
+def requested_profiler(request, asynchronous=False):
+    """A RequestProfiler holding profiling_lock if this request may be profiled, else None"""
+    if not wants_profile(request):
+        return None
+    user = access_token_user(request)
+    profile = getattr(user, 'profile', None)
+    allowed = profile is not None and profile.role in PROFILER_ROLES
+    if not (allowed or has_profile_token(request)):
+        return None
+    if not profiling_lock.acquire(blocking=False):
+        return None
+    mode = 'CPROFILE' if request.GET[PROFILE_PARAM] == 'cprofile' and not asynchronous else 'SAMPLE'
+    return RequestProfiler(mode, user, all_threads=asynchronous)
+
+
+class RequestProfiler:
+    def __init__(self, mode, user, all_threads=False):
+        self.mode = mode
+        self.user = user
+        self.all_threads = all_threads
+        self.profiler = self.sampler = None
+        self.started, self.duration = time.perf_counter(), 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        if self.mode == 'CPROFILE':
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            thread_id = None if self.all_threads else threading.get_ident()
+            self.sampler = StackSampler(thread_id, settings.PROFILE_SAMPLE_INTERVAL)
+            self.sampler.start()
+
+    def stop(self):
+        try:
+            if self.profiler is not None:
+                self.profiler.disable()
+            if self.sampler is not None:
+                self.sampler.stop()
+            self.duration = time.perf_counter() - self.started
+        finally:
+            profiling_lock.release()
+
+    def save(self, request, response, timings):
+        """Write the profile, drop the oldest beyond PROFILE_RING_SIZE, point the response at it"""
+        record = RequestProfile.objects.create(
+            user=self.user,
+            mode=self.mode,
+            method=request.method,
+            path=request.get_full_path()[:500],
+            route=route_label(request),
+            status=response.status_code,
+            duration_ms=round(self.duration * 1000, 2),
+            db_ms=round(timings.durations['db'] * 1000, 2),
+            serialize_ms=round(timings.durations['serialize'] * 1000, 2),
+            queries=timings.queries,
+        )
+        os.makedirs(record.directory, exist_ok=True)
+        data = {'sql': timings.sql, 'fields': field_tree(timings.field_costs)}
+        stacks_path = os.path.join(record.directory, record.stacks_filename)
+        if self.profiler is not None:
+            self.profiler.dump_stats(stacks_path)
+            data['functions'] = top_functions(self.profiler)
+        else:
+            data['samples'] = self.sampler.samples
+            with open(stacks_path, 'w') as f:
+                f.writelines(f'{stack} {count}\n' for stack, count in self.sampler.stacks.most_common())
+        with open(os.path.join(record.directory, 'profile.json'), 'w') as f:
+            json.dump(data, f)
+
+        stale = RequestProfile.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        # post_delete removes each profile's directory (core.signals)
+        RequestProfile.objects.filter(id__in=list(stale[settings.PROFILE_RING_SIZE:])).delete()
+        response['X-Profile-Id'] = str(record.id)
+        return record
+
+
+class StackSampler:
+    """
+    Counts the folded call stacks of one thread (all threads if thread_id is
+    None) every interval seconds. Stacks without project code, such as idle
+    worker threads, are dropped.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.labels = {}  # code object -> (frame label, is project code)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                frames = {self.thread_id: frames.get(self.thread_id)}
+            self.samples += 1
+            for thread_id, frame in frames.items():
+                if thread_id != own_id and frame is not None:
+                    stack = self.fold(frame)
+                    if stack:
+                        self.stacks[stack] += 1
+
+    def fold(self, frame):
+        """'outermost;...;innermost', or None without a project frame"""
+        names, in_project = [], False
+        while frame is not None:
+            label = self.labels.get(frame.f_code)
+            if label is None:
+                label = self.labels[frame.f_code] = frame_label(frame.f_code)
+            names.append(label[0])
+            in_project = in_project or label[1]
+            frame = frame.f_back
+        return ';'.join(reversed(names)) if in_project else None
+
+
+def short_path(filename):
+    """filename relative to the project, or to the sys.path entry it was imported from"""
+    filename = os.path.abspath(filename)
+    roots = sorted({str(settings.BASE_DIR), *(entry for entry in sys.path if entry)}, key=len, reverse=True)
+    for root in roots:
+        if filename.startswith(root.rstrip(os.sep) + os.sep):
+            return os.path.relpath(filename, root)
+    return filename
+
+
+def frame_label(code):
+    in_project = os.path.abspath(code.co_filename).startswith(str(settings.BASE_DIR) + os.sep)
+    return f'{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})', in_project
+
+
+def field_tree(field_costs):
+    """Fields in tree order; self time excludes the field's nested fields"""
+    rows = []
+    for path in sorted(field_costs, key=lambda path: path.split('.')):
+        calls, seconds = field_costs[path]
+        nested = sum(cost[1] for child, cost in field_costs.items() if child.rpartition('.')[0] == path)
+        rows.append({
+            'field': path,
+            'depth': path.count('.'),
+            'calls': calls,
+            'ms': round(seconds * 1000, 3),
+            'self_ms': round((seconds - nested) * 1000, 3),
+        })
+    return rows
+
+
+def top_functions(profiler):
+    stats = pstats.Stats(profiler).sort_stats('cumulative')
+    rows = []
+    for function in stats.fcn_list[:TOP_FUNCTIONS]:
+        _, calls, own_time, cumulative_time, _ = stats.stats[function]
+        filename, line, name = function
+        rows.append({
+            'function': f'{name} ({short_path(filename)}:{line})' if line else name,
+            'calls': calls,
+            'self_ms': round(own_time * 1000, 3),
+            'cumulative_ms': round(cumulative_time * 1000, 3),
+        })
+    return rows
@@ -0,0 +1,265 @@
+"""
+✅ Public Snapshot - Static JSON for the unauthenticated dashboard
+
+The public project list and one document per project are rendered to
+PUBLIC_SNAPSHOT_ROOT with content-hashed names (``projects/12.<hash>.json``),
+each stored alongside pre-compressed ``.gz`` and ``.br`` copies, so a static
+file server can answer public traffic without Python. ``manifest.json`` maps
+logical names to the current hashed files and is the only file that changes
+name-stably; hashed files can be cached forever.
+
+The project list is split into shards of PROJECT_LIST_SHARD_SIZE project
+ids (``project-list/0.json`` holds ids 0-499), listed in order under
+``project_list`` in the manifest, so publishing a few projects re-renders
+only the shards holding them rather than the whole list.
+
+Writes queue the projects they touch as PendingPublish rows in their own
+transaction, see ``schedule_publish``. ``publish_public_snapshot --watch``,
+a process of its own, publishes them once PUBLIC_SNAPSHOT_DEBOUNCE_SECONDS
+have passed since the oldest was queued, so request workers never render
+or compress. Incremental publishes use PUBLIC_SNAPSHOT_BROTLI_QUALITY;
+full rebuilds use quality 11. A publish holds an exclusive lock on
+``.publish.lock`` in the root from reading the manifest to removing the
+files it no longer references, and writes through temporary files with
+unique names.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils import timezone
+
+from .models import Project, Progress, IssueReport, ContractorProfile, MaterialPayment, PendingPublish
+from .serializers import ProjectSerializer, IssueReportSerializer
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: run one publishing process
+    fcntl = None
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.publish.lock'
+FILE_MODE = 0o644  # mkstemp creates 0600; the static file server must read the files
+PROJECT_LIST_SHARD_SIZE = 500
+
+
+def project_document_name(project_id):
+    return f'projects/{project_id}.json'
+
+
+def project_list_name(shard):
+    return f'project-list/{shard}.json'
+
+
+def project_list_shard(project_id):
+    return project_id // PROJECT_LIST_SHARD_SIZE
+
+
+def encode(document):
+    return json.dumps(document, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+class SnapshotPublisher:
+    def __init__(self, root=None, brotli_quality=None):
+        self.root = str(root or settings.PUBLIC_SNAPSHOT_ROOT)
+        self.manifest_path = os.path.join(self.root, MANIFEST_NAME)
+        if brotli_quality is None:
+            brotli_quality = settings.PUBLIC_SNAPSHOT_BROTLI_QUALITY
+        self.brotli_quality = brotli_quality
+
+    def load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {'files': {}}
+
+    def write_hashed(self, logical_name, content):
+        """Write content (plus .gz/.br) under a content-hashed name, return that name"""
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        stem, extension = os.path.splitext(logical_name)
+        hashed_name = f'{stem}.{digest}{extension}'
+        path = os.path.join(self.root, hashed_name)
+        if os.path.exists(path):
+            return hashed_name
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        variants = [(path, content), (path + '.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli:
+            variants.append((path + '.br', brotli.compress(content, quality=self.brotli_quality)))
+        # Compressed copies first, so a server never sees the plain file without them
+        for variant_path, data in reversed(variants):
+            self.replace(variant_path, data)
+        return hashed_name
+
+    def replace(self, path, data):
+        """Atomically replace path with data, through a temporary file only this call uses"""
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(temp_path, FILE_MODE)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    @contextmanager
+    def lock(self):
+        """Exclusive across processes: publishes in other workers wait"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, LOCK_NAME), 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def project_list(self, shard):
+        """The list entries of the projects in one shard"""
+        latest_progress = Progress.objects.filter(project=models.OuterRef('pk')).order_by('-id')
+        first_id = shard * PROJECT_LIST_SHARD_SIZE
+        projects = Project.objects.filter(
+            id__gte=first_id, id__lt=first_id + PROJECT_LIST_SHARD_SIZE
+        ).annotate(
+            latest_physical_progress=models.Subquery(latest_progress.values('physical_progress')[:1]),
+            funds_released=models.Sum('funds__amount'),
+        ).order_by('id')
+        return [
+            {
+                'id': project.id,
+                'name': project.name,
+                'location': project.location,
+                'ministry': project.ministry,
+                'contractor': project.contractor,
+                'total_budget': project.total_budget,
+                'funds_released': project.funds_released or 0,
+                'start_date': project.start_date,
+                'end_date': project.end_date,
+                'status': project.status,
+                'contract_size': project.contract_size,
+                'latest_physical_progress': project.latest_physical_progress or 0,
+            }
+            for project in projects
+        ]
+
+    def project_documents(self, project_ids):
+        projects = Project.objects.filter(id__in=project_ids).prefetch_related(
+            'funds', 'materials__payments', 'progress__images',
+            'contractor_profile__certificates', 'contractor_profile__skills',
+        )
+        issues = {}
+        for issue in IssueReport.objects.filter(project_id__in=project_ids).prefetch_related('evidence'):
+            issues.setdefault(issue.project_id, []).append(issue)
+        for project in projects:
+            document = dict(ProjectSerializer(project).data)
+            document['issues'] = IssueReportSerializer(issues.get(project.id, []), many=True).data
+            yield project.id, document
+
+    def publish(self, project_ids=None):
+        """
+        Rebuild the documents and project list shards for project_ids
+        (every project when None), then swap in a new manifest
+        """
+        # Held throughout: the manifest read here must be the newest one, and
+        # no other process may remove files this one has written but not yet
+        # listed in a manifest
+        with self.lock():
+            previous = self.load_manifest()
+            files = dict(previous['files'])
+
+            if project_ids is None:
+                files = {}
+                project_ids = list(Project.objects.values_list('id', flat=True))
+            project_ids = list(project_ids)
+
+            for shard in sorted({project_list_shard(project_id) for project_id in project_ids}):
+                name = project_list_name(shard)
+                entries = self.project_list(shard)
+                if entries:
+                    files[name] = self.write_hashed(name, encode(entries))
+                else:
+                    files.pop(name, None)
+            for project_id in project_ids:
+                files.pop(project_document_name(project_id), None)
+            for chunk_start in range(0, len(project_ids), 500):
+                for project_id, document in self.project_documents(project_ids[chunk_start:chunk_start + 500]):
+                    name = project_document_name(project_id)
+                    files[name] = self.write_hashed(name, encode(document))
+
+            project_list = sorted(
+                (name for name in files if name.startswith('project-list/')),
+                key=lambda name: int(name.split('/')[1].split('.')[0])
+            )
+            manifest = {'generated_at': timezone.now().isoformat(), 'project_list': project_list, 'files': files}
+            self.replace(self.manifest_path, json.dumps(manifest).encode())
+
+            # Keep the previous generation for clients still holding the old manifest
+            self.remove_unreferenced(set(files.values()) | set(previous['files'].values()))
+        return manifest
+
+    def remove_unreferenced(self, keep):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                base = name.removesuffix('.gz').removesuffix('.br')
+                if name not in (MANIFEST_NAME, LOCK_NAME) and base not in keep:
+                    os.remove(path)
+
+
+def publish_pending(publisher=None):
+    """
+    Publish every queued project once the oldest has waited
+    PUBLIC_SNAPSHOT_DEBOUNCE_SECONDS; return the manifest, or None if
+    nothing was due
+    """
+    delay = timedelta(seconds=settings.PUBLIC_SNAPSHOT_DEBOUNCE_SECONDS or 0)
+    if not PendingPublish.objects.filter(queued_at__lte=timezone.now() - delay).exists():
+        return None
+    # Claimed rows are deleted up front: a write during the publish queues
+    # its project again for the next round
+    with transaction.atomic():
+        pending = list(PendingPublish.objects.select_for_update())
+        PendingPublish.objects.filter(pk__in=[row.pk for row in pending]).delete()
+    try:
+        return (publisher or SnapshotPublisher()).publish([row.project_id for row in pending])
+    except BaseException:
+        PendingPublish.objects.bulk_create(pending, ignore_conflicts=True)
+        raise
+
+
+def affected_project_ids(instance):
+    """Projects whose public documents include the given saved or deleted row"""
+    if isinstance(instance, Project):
+        return [instance.id]
+    if isinstance(instance, MaterialPayment):
+        return [instance.material.project_id]
+    if isinstance(instance, ContractorProfile):
+        return list(instance.projects.values_list('id', flat=True))
+    return [instance.project_id]
+
+
+def schedule_publish(instance):
+    """Queue the projects touched by a write; the queue commits or rolls back with it"""
+    if settings.PUBLIC_SNAPSHOT_DEBOUNCE_SECONDS is None:
+        return
+    project_ids = [project_id for project_id in affected_project_ids(instance) if project_id]
+    # An existing row keeps its queued_at, so the debounce runs from the first write
+    PendingPublish.objects.bulk_create(
+        [PendingPublish(project_id=project_id) for project_id in project_ids], ignore_conflicts=True
+    )
@@ -0,0 +1,56 @@
+"""
+✅ N+1 Detection - Querysets that load every relation their serializer reads
+
+Used by the viewsets and the async views alike, so a list costs the same
+handful of queries whether it returns ten rows or ten thousand. When a
+serializer gains a field that follows a relation, add the relation here;
+the endpoint suite in core.tests fails until it is.
+"""
+from django.db.models import Prefetch
+
+from .models import (
+    Project, Progress, AuditLog, ContractorProfile, Material,
+    IssueReport, IssueEvidence, ContractorRating
+)
+
+
+def material_queryset():
+    return Material.objects.prefetch_related('payments')
+
+
+def progress_queryset():
+    return Progress.objects.select_related('submitted_by', 'reviewed_by').prefetch_related('images')
+
+
+def contractor_profile_queryset():
+    return ContractorProfile.objects.select_related('user').prefetch_related('certificates', 'skills')
+
+
+def project_queryset():
+    return Project.objects.select_related('contractor_profile__user').prefetch_related(
+        Prefetch('progress', queryset=progress_queryset()),
+        'funds',
+        Prefetch('materials', queryset=material_queryset()),
+        'contractor_profile__certificates',
+        'contractor_profile__skills',
+    )
+
+
+def issue_evidence_queryset():
+    return IssueEvidence.objects.select_related('uploaded_by')
+
+
+def issue_queryset():
+    return IssueReport.objects.select_related(
+        'reported_by', 'verified_by', 'forgiven_by'
+    ).prefetch_related(Prefetch('evidence', queryset=issue_evidence_queryset()))
+
+
+def contractor_rating_queryset():
+    return ContractorRating.objects.select_related(
+        'contractor__user', 'rated_by', 'verified_by'
+    ).prefetch_related('evidence')
+
+
+def audit_log_queryset():
+    return AuditLog.objects.select_related('user')
@@ -0,0 +1,179 @@
+"""
+✅ Full-Text Search - Ranked prefix search over SearchEntry rows
+
+SearchEntry holds a title and content per project, issue, material and
+contractor, and the database indexes both: an external-content FTS5 table
+(``core_searchentry_fts``, kept in step by triggers) on SQLite, a stored,
+generated ``search_vector`` tsvector column (title weighted A, content B)
+with a GIN index on PostgreSQL. Both use the language-neutral tokenizer
+('unicode61' / 'simple'), so names of places and people are not stemmed.
+
+Every word of the query must match the start of a word: ``kath road``
+finds "Kathmandu Road Upgrade #12". FTS5 keeps prefix indexes for two to
+MAX_PREFIX_LENGTH characters, so a prefix is one lookup instead of a merge
+of every word it starts; longer words are matched on their first
+MAX_PREFIX_LENGTH characters. One-character words only match whole words.
+
+Ranking is what makes a broad query slow, so it is bounded: only the
+newest SEARCH_RANK_WINDOW matches (highest ids; the index walks them in
+order and stops) are ranked. On SQLite they are ranked by cheap per-row
+signals rather than bm25, whose term statistics read every entry that
+contains a query word: title matches first, then shorter titles (the
+query covers more of them), then newer entries. PostgreSQL ranks the
+window with ts_rank. Either way a query costs about the same on ten
+thousand entries as on millions.
+"""
+import unicodedata
+from itertools import groupby
+
+from django.conf import settings
+from django.db import NotSupportedError, connections, router
+
+from .models import SearchEntry
+
+FTS_TABLE = 'core_searchentry_fts'
+TITLE_WEIGHT = 10.0  # SQLite score: 1 + TITLE_WEIGHT * share of the title's words matched
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_LENGTH = 10
+PREFIX_INDEXES = ' '.join(str(length) for length in range(MIN_PREFIX_LENGTH, MAX_PREFIX_LENGTH + 1))
+
+SQLITE_INDEX = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, content,
+        content='core_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='{PREFIX_INDEXES}'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF title, content ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+SQLITE_DROP_INDEX = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_INDEX = [
+    """
+    ALTER TABLE core_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', content), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX core_searchentry_vector_idx ON core_searchentry USING GIN (search_vector)",
+]
+POSTGRES_DROP_INDEX = [
+    "DROP INDEX IF EXISTS core_searchentry_vector_idx",
+    "ALTER TABLE core_searchentry DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def create_index(schema_editor):
+    """Create the full-text index of core_searchentry (called from migrations)"""
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_INDEX, 'postgresql': POSTGRES_INDEX}.get(vendor)
+    if statements is None:
+        raise NotSupportedError(f'Full-text search is not implemented for {vendor}')
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for statement in {'sqlite': SQLITE_DROP_INDEX, 'postgresql': POSTGRES_DROP_INDEX}.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def terms(query):
+    """
+    The lowercased words of query, split where FTS5's unicode61 tokenizer
+    splits (anything but letters, marks and digits), at most SEARCH_MAX_TERMS
+    """
+    words = [
+        ''.join(chars)
+        for is_word, chars in groupby(query.lower(), key=lambda char: unicodedata.category(char)[0] in 'LMN')
+        if is_word
+    ]
+    return words[:settings.SEARCH_MAX_TERMS]
+
+
+def fts5_term(word):
+    if len(word) < MIN_PREFIX_LENGTH:
+        return f'"{word}"'
+    return f'"{word[:MAX_PREFIX_LENGTH]}"*'
+
+
+def search(query, kinds, limit):
+    """
+    The best SearchEntry matches for query, best first, each with a ``score``
+    (higher is better). kinds limits the result to those SearchEntry kinds.
+    """
+    words = terms(query)
+    if not words or not kinds:
+        return []
+    database = router.db_for_read(SearchEntry)
+    vendor = connections[database].vendor
+    kind_placeholders = ', '.join(['%s'] * len(kinds))
+    if vendor == 'sqlite':
+        match = ' '.join(fts5_term(word) for word in words)
+        # highlight() marks each title word the query matched with char(1)
+        sql = f"""
+            SELECT id, kind, object_id, project_id, title, subtitle,
+                   1.0 + {TITLE_WEIGHT} * (length(marked) - length(replace(marked, char(1), '')))
+                       / (length(title) - length(replace(title, ' ', '')) + 1) AS score
+            FROM (
+                SELECT e.id, e.kind, e.object_id, e.project_id, e.title, e.subtitle,
+                       highlight({FTS_TABLE}, 0, char(1), '') AS marked
+                FROM {FTS_TABLE} JOIN core_searchentry e ON e.id = {FTS_TABLE}.rowid
+                WHERE {FTS_TABLE} MATCH %s AND e.kind IN ({kind_placeholders})
+                ORDER BY {FTS_TABLE}.rowid DESC
+                LIMIT %s
+            )
+            ORDER BY score DESC, id DESC
+            LIMIT %s
+        """
+    elif vendor == 'postgresql':
+        match = ' & '.join(f"'{word}':*" if len(word) >= MIN_PREFIX_LENGTH else f"'{word}'" for word in words)
+        sql = f"""
+            SELECT * FROM (
+                SELECT id, kind, object_id, project_id, title, subtitle, ts_rank(search_vector, query) AS score
+                FROM core_searchentry, to_tsquery('simple', %s) query
+                WHERE search_vector @@ query AND kind IN ({kind_placeholders})
+                ORDER BY id DESC
+                LIMIT %s
+            ) matches
+            ORDER BY score DESC, id DESC
+            LIMIT %s
+        """
+    else:
+        raise NotSupportedError(f'Full-text search is not implemented for {vendor}')
+    params = [match, *kinds, settings.SEARCH_RANK_WINDOW, limit]
+    return list(SearchEntry.objects.raw(sql, params, using=database))
+
+
+def result(entry):
+    return {
+        'type': entry.kind,
+        'id': entry.object_id,
+        'project': entry.project_id,
+        'title': entry.title,
+        'subtitle': entry.subtitle,
+        'score': round(entry.score, 4),
+    }
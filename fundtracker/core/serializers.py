@@ -1,13 +1,15 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import (
     Project, Fund, Progress, ProgressImage, UserProfile, AuditLog,
     ContractorProfile, ContractorCertificate, ContractorSkill,
     Material, MaterialPayment, IssueReport, IssueEvidence,
-    ContractorRating, RatingEvidence
+    ContractorRating, RatingEvidence, ImageFingerprint, UploadSession, DistrictStats
 )
+from .performance import TimedModelSerializer
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     email = serializers.CharField(source='user.email', read_only=True)
     
@@ -18,7 +20,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
 
 # ✅ Contractor Qualification System Serializers
-class ContractorCertificateSerializer(serializers.ModelSerializer):
+class ContractorCertificateSerializer(TimedModelSerializer):
     is_valid = serializers.BooleanField(read_only=True)
     
     class Meta:
@@ -27,14 +29,14 @@ class ContractorCertificateSerializer(serializers.ModelSerializer):
         read_only_fields = ['verified']
 
 
-class ContractorSkillSerializer(serializers.ModelSerializer):
+class ContractorSkillSerializer(TimedModelSerializer):
     class Meta:
         model = ContractorSkill
         fields = '__all__'
         read_only_fields = ['verified']
 
 
-class ContractorProfileSerializer(serializers.ModelSerializer):
+class ContractorProfileSerializer(TimedModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     certificates = ContractorCertificateSerializer(many=True, read_only=True)
     skills = ContractorSkillSerializer(many=True, read_only=True)
@@ -56,20 +58,20 @@ class ContractorProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class FundSerializer(serializers.ModelSerializer):
+class FundSerializer(TimedModelSerializer):
     class Meta:
         model = Fund
         fields = "__all__"
 
 
 # ✅ Material Transparency Serializers
-class MaterialPaymentSerializer(serializers.ModelSerializer):
+class MaterialPaymentSerializer(TimedModelSerializer):
     class Meta:
         model = MaterialPayment
         fields = '__all__'
 
 
-class MaterialSerializer(serializers.ModelSerializer):
+class MaterialSerializer(TimedModelSerializer):
     payments = MaterialPaymentSerializer(many=True, read_only=True)
     cost_variance = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
     
@@ -85,13 +87,13 @@ class MaterialSerializer(serializers.ModelSerializer):
         read_only_fields = ['total_planned_cost', 'total_actual_cost', 'verified', 'verified_by']
 
 
-class ProgressImageSerializer(serializers.ModelSerializer):
+class ProgressImageSerializer(TimedModelSerializer):
     class Meta:
         model = ProgressImage
         fields = "__all__"
 
 
-class ProgressSerializer(serializers.ModelSerializer):
+class ProgressSerializer(TimedModelSerializer):
     images = ProgressImageSerializer(many=True, read_only=True)
     submitted_by_username = serializers.CharField(source='submitted_by.username', read_only=True)
     reviewed_by_username = serializers.CharField(source='reviewed_by.username', read_only=True)
@@ -118,7 +120,41 @@ class ProgressSerializer(serializers.ModelSerializer):
         read_only_fields = ['submitted_by', 'reviewed_by', 'reviewed_at', 'submitted_at', 'blockchain_tx_hash']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProgressReviewSerializer(ProgressSerializer):
+    """
+    ✅ Duplicate Photo Detection - Progress with near-duplicate photos flagged
+    for the government review screen
+    """
+    duplicate_images = serializers.SerializerMethodField()
+
+    class Meta(ProgressSerializer.Meta):
+        fields = ProgressSerializer.Meta.fields + ["duplicate_images"]
+
+    def get_duplicate_images(self, obj):
+        image_ids = [image.id for image in obj.images.all()]
+        # The pending list looks up every submission's photos at once
+        near_duplicates = self.context.get('near_duplicates')
+        if near_duplicates is None:
+            near_duplicates = ImageFingerprint.near_duplicates_by_source('ProgressImage', image_ids)
+        return [
+            {
+                'image': image_id,
+                'matches': [
+                    {
+                        'source_model': match.source_model,
+                        'source_id': match.source_id,
+                        'project': match.project_id,
+                        'distance': distance,
+                    }
+                    for match, distance in near_duplicates[image_id]
+                ]
+            }
+            for image_id in image_ids
+            if image_id in near_duplicates
+        ]
+
+
+class ProjectSerializer(TimedModelSerializer):
     progress = ProgressSerializer(many=True, read_only=True)
     funds = FundSerializer(many=True, read_only=True)
     materials = MaterialSerializer(many=True, read_only=True)
@@ -127,10 +163,33 @@ class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = "__all__"
-        read_only_fields = ['contract_size', 'min_contractor_rating']
+        read_only_fields = [
+            'contract_size', 'min_contractor_rating',
+            'latitude', 'longitude', 'geohash', 'district_code', 'geocoded_place',
+        ]
+
+
+class ProjectMapSerializer(TimedModelSerializer):
+    """✅ Project Map - The few columns a map marker needs"""
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'name', 'status', 'total_budget', 'contract_size',
+            'location', 'geocoded_place', 'district_code', 'latitude', 'longitude',
+        ]
+
+
+class ProjectSyncSerializer(TimedModelSerializer):
+    """
+    ✅ Incremental Sync - Project row without nested progress, funds and
+    materials, which the sync endpoint sends separately
+    """
+    class Meta:
+        model = Project
+        fields = "__all__"
 
 
-class AuditLogSerializer(serializers.ModelSerializer):
+class AuditLogSerializer(TimedModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     
     class Meta:
@@ -139,7 +198,7 @@ class AuditLogSerializer(serializers.ModelSerializer):
 
 
 # ✅ Issue Reporting System Serializers
-class IssueEvidenceSerializer(serializers.ModelSerializer):
+class IssueEvidenceSerializer(TimedModelSerializer):
     uploaded_by_username = serializers.CharField(source='uploaded_by.username', read_only=True)
     
     class Meta:
@@ -148,7 +207,7 @@ class IssueEvidenceSerializer(serializers.ModelSerializer):
         read_only_fields = ['uploaded_by', 'uploaded_at']
 
 
-class IssueReportSerializer(serializers.ModelSerializer):
+class IssueReportSerializer(TimedModelSerializer):
     evidence = IssueEvidenceSerializer(many=True, read_only=True)
     reported_by_username = serializers.CharField(source='reported_by.username', read_only=True)
     verified_by_username = serializers.CharField(source='verified_by.username', read_only=True)
@@ -173,13 +232,13 @@ class IssueReportSerializer(serializers.ModelSerializer):
 
 
 # ✅ Proof-Based Ratings Serializers
-class RatingEvidenceSerializer(serializers.ModelSerializer):
+class RatingEvidenceSerializer(TimedModelSerializer):
     class Meta:
         model = RatingEvidence
         fields = '__all__'
 
 
-class ContractorRatingSerializer(serializers.ModelSerializer):
+class ContractorRatingSerializer(TimedModelSerializer):
     evidence = RatingEvidenceSerializer(many=True, read_only=True)
     rated_by_username = serializers.CharField(source='rated_by.username', read_only=True)
     contractor_username = serializers.CharField(source='contractor.user.username', read_only=True)
@@ -220,3 +279,43 @@ class ContractorRatingSerializer(serializers.ModelSerializer):
                     })
         return data
 
+
+
+# ✅ Resumable Uploads Serializers
+class UploadSessionSerializer(TimedModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'target', 'issue', 'rating', 'evidence_type', 'description',
+            'filename', 'total_size', 'received_size', 'status', 'evidence_id',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['received_size', 'status', 'evidence_id']
+
+    def validate_total_size(self, value):
+        if value <= 0 or value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'File size must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.'
+            )
+        return value
+
+    def validate(self, data):
+        parent_field = 'issue' if data['target'] == 'ISSUE_EVIDENCE' else 'rating'
+        other_field = 'rating' if parent_field == 'issue' else 'issue'
+        if not data.get(parent_field):
+            raise serializers.ValidationError({parent_field: f'Required for {data["target"]} uploads.'})
+        if data.get(other_field):
+            raise serializers.ValidationError({other_field: f'Not allowed for {data["target"]} uploads.'})
+        return data
+
+
+class DistrictStatsSerializer(TimedModelSerializer):
+    """✅ District Rollups"""
+    name = serializers.ReadOnlyField()
+
+    class Meta:
+        model = DistrictStats
+        fields = [
+            'district_code', 'name', 'residents', 'reporters', 'reported_issues',
+            'projects', 'total_budget', 'issues', 'refreshed_at',
+        ]
@@ -1,10 +1,22 @@
-from django.db.models.signals import post_save, post_delete
+import shutil
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
+from django.utils import timezone
 from .models import (
     Project, Fund, Progress, AuditLog,
     ContractorProfile, ContractorCertificate, ContractorSkill,
-    Material, MaterialPayment, IssueReport, ContractorRating
+    Material, MaterialPayment, IssueReport, ContractorRating,
+    ProgressImage, IssueEvidence, RatingEvidence, ImageFingerprint,
+    StoredBlob, Tombstone, RequestProfile, SearchEntry, UserProfile
 )
+from .storage import is_blob, file_field_names
+from .public_snapshot import schedule_publish
+from .events import publish_on_commit
+from .performance import record_query
+from . import districts
 
 
 def create_audit(instance, action):
@@ -42,3 +54,273 @@ def log_save(sender, instance, created, **kwargs):
 @receiver(post_delete, sender=ContractorRating)
 def log_delete(sender, instance, **kwargs):
     create_audit(instance, "DELETE")
+
+
+# ✅ Duplicate Photo Detection - Fingerprint photos as they are uploaded
+@receiver(post_init, sender=ProgressImage)
+@receiver(post_init, sender=IssueEvidence)
+@receiver(post_init, sender=RatingEvidence)
+def remember_photo_name(sender, instance, **kwargs):
+    instance._photo_name = ImageFingerprint.photo_name(instance)
+
+
+@receiver(post_save, sender=ProgressImage)
+@receiver(post_save, sender=IssueEvidence)
+@receiver(post_save, sender=RatingEvidence)
+def index_image_fingerprint(sender, instance, created, **kwargs):
+    # Only a new photo is hashed again; editing a description keeps the fingerprint
+    previous, current = instance._photo_name, ImageFingerprint.photo_name(instance)
+    instance._photo_name = current
+    if current == previous and not created:
+        return
+    if current is None and created:
+        return
+    if current is None or ImageFingerprint.index_instance(instance) is None:
+        # No longer a photo, or the new file cannot be read
+        ImageFingerprint.objects.filter(source_model=sender.__name__, source_id=instance.id).delete()
+
+
+@receiver(post_delete, sender=ProgressImage)
+@receiver(post_delete, sender=IssueEvidence)
+@receiver(post_delete, sender=RatingEvidence)
+def delete_image_fingerprint(sender, instance, **kwargs):
+    ImageFingerprint.objects.filter(source_model=sender.__name__, source_id=instance.id).delete()
+
+
+# ✅ Deduplicated Uploads - Keep blob reference counts in step with file fields
+@receiver(post_init, sender=ProgressImage)
+@receiver(post_init, sender=IssueEvidence)
+@receiver(post_init, sender=RatingEvidence)
+@receiver(post_init, sender=ContractorCertificate)
+def remember_file_names(sender, instance, **kwargs):
+    instance._stored_file_names = file_field_names(instance)
+
+
+@receiver(post_save, sender=ProgressImage)
+@receiver(post_save, sender=IssueEvidence)
+@receiver(post_save, sender=RatingEvidence)
+@receiver(post_save, sender=ContractorCertificate)
+def update_file_references(sender, instance, created, **kwargs):
+    # Runs in the saving transaction, so a rollback undoes the new reference too
+    current = file_field_names(instance)
+    for attname, previous in instance._stored_file_names.items():
+        name = current.get(attname, previous)
+        if created:
+            previous = ''  # even a blob name given to the constructor is a new reference
+        if name == previous:
+            continue
+        if is_blob(name):
+            StoredBlob.retain(name)
+        if is_blob(previous):
+            StoredBlob.release(previous)
+    instance._stored_file_names = current
+
+
+@receiver(post_delete, sender=ProgressImage)
+@receiver(post_delete, sender=IssueEvidence)
+@receiver(post_delete, sender=RatingEvidence)
+@receiver(post_delete, sender=ContractorCertificate)
+def release_deleted_files(sender, instance, **kwargs):
+    # The names as stored: FieldFile.delete(save=False) may have cleared the field since
+    for name in instance._stored_file_names.values():
+        if is_blob(name):
+            StoredBlob.release(name)
+
+
+# ✅ Public Snapshot - Re-publish the static public dashboard after writes
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Fund)
+@receiver(post_save, sender=Progress)
+@receiver(post_save, sender=ContractorProfile)
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=MaterialPayment)
+@receiver(post_save, sender=IssueReport)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Fund)
+@receiver(post_delete, sender=Progress)
+@receiver(post_delete, sender=ContractorProfile)
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=MaterialPayment)
+@receiver(post_delete, sender=IssueReport)
+def publish_public_snapshot(sender, instance, **kwargs):
+    schedule_publish(instance)
+
+
+# ✅ Incremental Sync - Record deletions for /api/sync/ and the open data snapshots
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Fund)
+@receiver(post_delete, sender=Progress)
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=MaterialPayment)
+@receiver(post_delete, sender=IssueReport)
+@receiver(post_delete, sender=ContractorRating)
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model_name=sender.__name__, object_id=instance.id)
+
+
+# Nested rows are synced inside their parent, so changing them re-syncs the parent
+SYNC_PARENTS = {
+    MaterialPayment: 'material',
+    ProgressImage: 'progress',
+    IssueEvidence: 'issue',
+    RatingEvidence: 'rating',
+}
+
+
+@receiver(post_save, sender=MaterialPayment)
+@receiver(post_save, sender=ProgressImage)
+@receiver(post_save, sender=IssueEvidence)
+@receiver(post_save, sender=RatingEvidence)
+@receiver(post_delete, sender=MaterialPayment)
+@receiver(post_delete, sender=ProgressImage)
+@receiver(post_delete, sender=IssueEvidence)
+@receiver(post_delete, sender=RatingEvidence)
+def touch_sync_parent(sender, instance, **kwargs):
+    parent = sender._meta.get_field(SYNC_PARENTS[sender])
+    parent.related_model.objects.filter(
+        pk=getattr(instance, parent.attname)
+    ).update(updated_at=timezone.now())
+
+
+# ✅ Live Activity - Push review activity to /api/events/
+REVIEW_STATE_FIELDS = {
+    Progress: 'status',
+    IssueReport: 'status',
+    ContractorProfile: 'is_suspended',
+}
+
+
+@receiver(post_init, sender=Progress)
+@receiver(post_init, sender=IssueReport)
+@receiver(post_init, sender=ContractorProfile)
+def remember_review_state(sender, instance, **kwargs):
+    # __dict__ avoids loading deferred fields
+    instance._review_state = instance.__dict__.get(REVIEW_STATE_FIELDS[sender])
+
+
+@receiver(post_save, sender=Progress)
+def publish_progress_event(sender, instance, created, **kwargs):
+    previous_status, instance._review_state = instance._review_state, instance.status
+    if created:
+        event_type = 'progress.submitted'
+    elif instance.status != previous_status and instance.status in ('APPROVED', 'REJECTED'):
+        event_type = f'progress.{instance.status.lower()}'
+    else:
+        return
+    publish_on_commit(event_type, {
+        'id': instance.id,
+        'project': instance.project_id,
+        'status': instance.status,
+        'submitted_by': instance.submitted_by_id,
+        'reviewed_by': instance.reviewed_by_id,
+    })
+
+
+@receiver(post_save, sender=IssueReport)
+def publish_issue_event(sender, instance, created, **kwargs):
+    previous_status, instance._review_state = instance._review_state, instance.status
+    if not created and instance.status == previous_status:
+        return
+    publish_on_commit('issue.reported' if created else 'issue.status_changed', {
+        'id': instance.id,
+        'project': instance.project_id,
+        'title': instance.title,
+        'severity': instance.severity,
+        'status': instance.status,
+        'previous_status': None if created else previous_status,
+    })
+
+
+@receiver(post_save, sender=ContractorProfile)
+def publish_suspension_event(sender, instance, **kwargs):
+    was_suspended, instance._review_state = instance._review_state, instance.is_suspended
+    if instance.is_suspended and not was_suspended:
+        publish_on_commit('contractor.suspended', {
+            'id': instance.id,
+            'user': instance.user_id,
+            'rating': instance.rating,
+            'reason': instance.suspension_reason,
+            'suspended_at': instance.suspended_at,
+        })
+
+
+# ✅ Performance Instrumentation - Count and time SQL on every connection
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# ✅ Request Profiling - Profiles dropped from the ring take their files along
+@receiver(post_delete, sender=RequestProfile)
+def delete_profile_files(sender, instance, **kwargs):
+    shutil.rmtree(instance.directory, ignore_errors=True)
+
+
+# ✅ Full-Text Search - Keep SearchEntry rows in step with what they index
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=IssueReport)
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=ContractorProfile)
+def index_search_entry(sender, instance, **kwargs):
+    SearchEntry.index_instance(instance)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=IssueReport)
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=ContractorProfile)
+def remove_search_entry(sender, instance, **kwargs):
+    SearchEntry.remove_instance(instance)
+
+
+CONTRACTOR_NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_contractor_name(sender, instance, created, update_fields=None, **kwargs):
+    # Logins save last_login alone; that is not worth a lookup
+    if created or (update_fields is not None and not CONTRACTOR_NAME_FIELDS & set(update_fields)):
+        return
+    profile = getattr(instance, 'contractor_profile', None)
+    if profile is not None:
+        SearchEntry.index_instance(profile)
+
+
+# ✅ District Rollups - Refresh the DistrictStats rows a write touches
+DISTRICT_SOURCES = {
+    Project: ['district_code'],
+    IssueReport: ['project_id', 'reported_by_id'],
+    UserProfile: ['nid_district'],
+}
+
+
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=IssueReport)
+@receiver(post_init, sender=UserProfile)
+def remember_district_sources(sender, instance, **kwargs):
+    # __dict__ avoids loading deferred fields
+    instance._district_sources = [instance.__dict__.get(name) for name in DISTRICT_SOURCES[sender]]
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=IssueReport)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=IssueReport)
+@receiver(post_delete, sender=UserProfile)
+def refresh_district_stats(sender, instance, created=True, **kwargs):
+    previous = instance._district_sources
+    current = instance._district_sources = [getattr(instance, name) for name in DISTRICT_SOURCES[sender]]
+    if not created and previous == current and sender is not Project:
+        # Status reviews and the like change no count; a project's budget may have
+        return
+    if sender is IssueReport:
+        (old_project, old_reporter), (project, reporter) = previous, current
+        codes = [
+            *districts.project_districts({old_project, project} - {None}),
+            *districts.resident_districts({old_reporter, reporter} - {None}),
+        ]
+    else:
+        codes = previous + current
+    districts.schedule_refresh(codes)
@@ -0,0 +1,95 @@
+"""
+✅ Deduplicated Uploads - Content-addressed file storage
+
+Uploads are hashed (SHA-256) while they are streamed to a temporary file and
+then moved to ``blobs/<aa>/<bb>/<digest><ext>``. Uploading the same bytes
+again resolves to the same blob, so it is stored once no matter how many
+FileField/ImageField values point at it. The storage is selected through
+``STORAGES['default']`` and needs no changes to field declarations.
+
+Storing a blob only records it (StoredBlob.register); the reference is
+taken by the model signals once the row pointing at it is saved, so an
+upload whose row is never saved, or is rolled back, holds none and is
+collected by collect_orphan_blobs.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db.models import FileField
+
+BLOB_DIR = 'blobs'
+TEMP_DIR = os.path.join(BLOB_DIR, 'tmp')
+# The client names the file; anything else is dropped so blob names stay
+# well within FileField's default max_length of 100
+EXTENSION_RE = re.compile(r'^\.[a-z0-9]{1,10}$')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # The stored name is derived from the content in _save(), and identical
+        # content is meant to collide, so there is nothing to de-conflict here
+        return name
+
+    def _save(self, name, content):
+        from .models import StoredBlob
+
+        extension = os.path.splitext(name)[1].lower()
+        if not EXTENSION_RE.match(extension):
+            extension = ''
+        temp_dir = self.path(TEMP_DIR)
+        os.makedirs(temp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+
+            hexdigest = digest.hexdigest()
+            blob_name = f'{BLOB_DIR}/{hexdigest[:2]}/{hexdigest[2:4]}/{hexdigest}{extension}'
+            StoredBlob.register(blob_name, size)
+
+            blob_path = self.path(blob_name)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(temp_path, self.file_permissions_mode)
+            # Same name means same bytes, so replacing an existing blob is
+            # harmless and also restores one that was collected concurrently
+            os.replace(temp_path, blob_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return blob_name
+
+    def delete(self, name):
+        """
+        Keep blobs: other fields may share them. References are released by
+        the model signals (core.signals) when a row stops pointing at a blob,
+        which FieldFile.delete(save=True) also triggers, and the bytes are
+        removed by collect_orphan_blobs.
+        """
+        if name and not is_blob(name):
+            super().delete(name)
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(f'{BLOB_DIR}/')
+
+
+def file_field_names(instance):
+    """Map each loaded file field of a model instance to the stored file name"""
+    deferred = instance.get_deferred_fields()
+    return {
+        field.attname: getattr(instance, field.attname).name
+        for field in instance._meta.concrete_fields
+        if isinstance(field, FileField) and field.attname not in deferred
+    }
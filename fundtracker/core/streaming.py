@@ -0,0 +1,45 @@
+"""
+✅ Streaming Responses - Streamed bodies that stay streamed under ASGI
+
+Django serves a StreamingHttpResponse over ASGI by iterating its body
+asynchronously. Given a synchronous iterator it cannot do that, so it
+reads the whole iterator into a list first ("StreamingHttpResponse must
+consume synchronous iterators") and only then sends it: an export or a
+large file is held in memory before the first byte goes out. Views pass
+their synchronous iterator through streaming_content(), which leaves it
+alone under WSGI and, under ASGI, advances it one chunk at a time in a
+worker thread.
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+DONE = object()
+
+
+def is_asgi(request):
+    """Whether a Django HttpRequest (or the one behind a DRF Request) came in over ASGI"""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def iterate_in_thread(iterator, thread_sensitive=True):
+    """
+    Yield the items of a synchronous iterator, each next() run through
+    sync_to_async. Keep thread_sensitive for iterators that read the
+    database, so they use the request's connection.
+    """
+    advance = sync_to_async(next, thread_sensitive=thread_sensitive)
+    iterator = iter(iterator)
+    try:
+        while (item := await advance(iterator, DONE)) is not DONE:
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=thread_sensitive)()
+
+
+def streaming_content(request, iterator, thread_sensitive=True):
+    """The body for a StreamingHttpResponse: iterator as is under WSGI, an async iterator under ASGI"""
+    if is_asgi(request):
+        return iterate_in_thread(iterator, thread_sensitive)
+    return iterator
@@ -0,0 +1,184 @@
+"""
+✅ Incremental Sync - Rows created, updated or deleted after an opaque cursor
+
+Each feed is read in ``(updated_at, id)`` keyset order from its indexed
+``updated_at`` column; deletions come from ``Tombstone`` rows written by a
+post_delete signal. The cursor is a signed token holding the last
+``(timestamp, id)`` seen per feed, so clients never need to parse it.
+
+Rows newer than SYNC_SETTLE_SECONDS are held back until the next request:
+``updated_at`` is set before the transaction commits, so a slow transaction
+could otherwise commit a row older than a cursor already handed out. That
+is a bound, not a guarantee: a row whose transaction commits more than
+SYNC_SETTLE_SECONDS after its ``updated_at`` was set is skipped by every
+client that synced in between, until the row changes again or the client
+syncs from scratch. Keep write transactions well under that (request
+transactions are short; bulk jobs should commit in batches), or raise it
+at the cost of fresher rows arriving later. Deletions are held back the
+same way.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import (
+    Project, Fund, Progress, Material, MaterialPayment, IssueReport,
+    ContractorRating, Tombstone
+)
+from .serializers import (
+    ProjectSyncSerializer, FundSerializer, ProgressSerializer,
+    MaterialSerializer, IssueReportSerializer, ContractorRatingSerializer
+)
+
+CURSOR_SALT = 'core.sync.cursor'
+CURSOR_VERSION = 1
+
+
+class SyncCursorError(Exception):
+    pass
+
+
+class SyncCursorExpired(SyncCursorError):
+    pass
+
+
+def feed_querysets():
+    """Feed name -> (model, serializer, queryset loading everything the serializer reads)"""
+    return {
+        'projects': (Project, ProjectSyncSerializer, Project.objects.all()),
+        'funds': (Fund, FundSerializer, Fund.objects.all()),
+        'progress': (
+            Progress,
+            ProgressSerializer,
+            Progress.objects.select_related('submitted_by', 'reviewed_by').prefetch_related('images'),
+        ),
+        'materials': (
+            Material,
+            MaterialSerializer,
+            Material.objects.prefetch_related(
+                Prefetch('payments', queryset=MaterialPayment.objects.order_by('id'))
+            ),
+        ),
+        'issues': (
+            IssueReport,
+            IssueReportSerializer,
+            IssueReport.objects.select_related(
+                'reported_by', 'verified_by', 'forgiven_by'
+            ).prefetch_related('evidence__uploaded_by'),
+        ),
+        'contractor_ratings': (
+            ContractorRating,
+            ContractorRatingSerializer,
+            ContractorRating.objects.select_related(
+                'contractor__user', 'rated_by', 'verified_by'
+            ).prefetch_related('evidence'),
+        ),
+    }
+
+
+# Model name stored on tombstones -> feed name
+TOMBSTONE_FEEDS = {
+    'Project': 'projects',
+    'Fund': 'funds',
+    'Progress': 'progress',
+    'Material': 'materials',
+    'IssueReport': 'issues',
+    'ContractorRating': 'contractor_ratings',
+}
+
+
+def visible_feeds(user):
+    """Ratings are only listed to signed-in users, like /api/contractor-ratings/"""
+    feeds = feed_querysets()
+    if not user.is_authenticated:
+        feeds.pop('contractor_ratings')
+    return feeds
+
+
+def encode_cursor(state):
+    return signing.dumps(state, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token):
+    try:
+        state = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise SyncCursorError("Invalid sync cursor.")
+    if state.get('v') != CURSOR_VERSION:
+        raise SyncCursorError("Unsupported sync cursor, sync again without 'since'.")
+    return state
+
+
+def after(field, mark):
+    """Rows strictly after a (timestamp, id) mark in keyset order"""
+    moment, pk = parse_datetime(mark[0]), mark[1]
+    # One index range (field >= moment) already in (field, id) order; a bare
+    # OR is read as two ranges and then sorted
+    return Q(**{f'{field}__gte': moment}) & (Q(**{f'{field}__gt': moment}) | Q(pk__gt=pk))
+
+
+def page(queryset, field, mark, cutoff, limit):
+    queryset = queryset.filter(**{f'{field}__lte': cutoff})
+    if mark:
+        queryset = queryset.filter(after(field, mark))
+    rows = list(queryset.order_by(field, 'pk')[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def changes_since(token, user, context=None):
+    """
+    Return the changes after token (everything when empty) and the cursor
+    to send next time. ``has_more`` means another request returns more rows.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    limit = settings.SYNC_PAGE_SIZE
+
+    if token:
+        state = decode_cursor(token)
+        oldest = now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        if parse_datetime(state['deleted'][0]) < oldest:
+            raise SyncCursorExpired(
+                "Sync cursor is older than the deletion history, sync again without 'since'."
+            )
+    else:
+        # A fresh client has nothing to delete; start the deletion feed now
+        state = {'v': CURSOR_VERSION, 'feeds': {}, 'deleted': [cutoff.isoformat(), 0]}
+
+    feeds = visible_feeds(user)
+    changes, has_more = {}, False
+    for name, (model, serializer_class, queryset) in feeds.items():
+        rows, more = page(queryset, 'updated_at', state['feeds'].get(name), cutoff, limit)
+        has_more = has_more or more
+        if rows:
+            state['feeds'][name] = [rows[-1].updated_at.isoformat(), rows[-1].pk]
+        changes[name] = serializer_class(rows, many=True, context=context).data
+
+    tombstones, more = page(
+        Tombstone.objects.filter(model_name__in=[
+            model_name for model_name, name in TOMBSTONE_FEEDS.items() if name in feeds
+        ]),
+        'deleted_at', state['deleted'], cutoff, limit
+    )
+    has_more = has_more or more
+    deleted = {name: [] for name in feeds}
+    for tombstone in tombstones:
+        deleted[TOMBSTONE_FEEDS[tombstone.model_name]].append(tombstone.object_id)
+    if more:
+        state['deleted'] = [tombstones[-1].deleted_at.isoformat(), tombstones[-1].pk]
+    else:
+        # Every deletion up to the cutoff has been sent; moving the mark keeps
+        # quiet clients from expiring when nothing is deleted for a while
+        last_pk = tombstones[-1].pk if tombstones and tombstones[-1].deleted_at == cutoff else 0
+        state['deleted'] = [cutoff.isoformat(), last_pk]
+
+    return {
+        'changes': changes,
+        'deleted': deleted,
+        'cursor': encode_cursor(state),
+        'has_more': has_more,
+    }
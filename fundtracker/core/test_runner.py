@@ -0,0 +1,18 @@
+import logging
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class FundtrackerTestRunner(DiscoverRunner):
+    """
+    ✅ N+1 Detection - Instrument every request made in tests, and fail the
+    test when one repeats a query (see core.nplusone)
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.PERFORMANCE_SAMPLE_RATE = 1.0
+        settings.NPLUSONE_RAISE = True
+        # Keep the per-request timing lines out of the test output
+        logging.getLogger('core.performance').setLevel(logging.WARNING)
@@ -1,3 +1,1861 @@
-from django.test import TestCase
+import hashlib
+import importlib
+import json
+import os
+import random
+import re
+import runpy
+import shutil
+import tempfile
+import time
+import unittest
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+import msgpack
+from PIL import Image
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .api_views import (
+    AuditLogViewSet, ContractorCertificateViewSet, ContractorProfileViewSet, ContractorRatingViewSet,
+    MaterialViewSet, ProjectViewSet, UploadSessionViewSet
+)
+from . import districts, geo, perceptual_hash
+from .benchmarking import api_cases
+from .compression import compress_response
+from .db_routers import PrimaryReplicaRouter, pin_to_primary, replica_reads_allowed
+from .models import (
+    Project, Fund, Progress, AuditLog, ContractorProfile, ContractorCertificate, IssueEvidence,
+    Material, MaterialPayment, IssueReport, ContractorRating, RatingEvidence, UploadSession, Tombstone, StoredBlob,
+    ImageFingerprint, ProgressImage, SearchEntry, UserProfile, DistrictStats, PendingPublish, RequestProfile,
+    parse_nepal_nid
+)
+from .nid_registry import RegistryError, RegistryIndex, nid_key, profiles_to_check, verify
+from .open_data import FORMATS, SnapshotExporter, read_part
+from . import profiling, public_snapshot
+from .performance import RequestTimings, current_timings
+from .renderers import MessagePackRenderer, ORJSONRenderer
+from .querysets import (
+    audit_log_queryset, contractor_profile_queryset, issue_queryset, material_queryset, progress_queryset
+)
+from .serializers import AuditLogSerializer, ProgressSerializer
+from .sync import after, feed_querysets
+from .values_serializers import ValuesSerializer
+
+
+# ✅ Query Plans - The querysets the viewsets and admin filters run; none may scan a whole table
+def view_queryset(viewset, user, action='list', pk=None, **params):
+    """The queryset a viewset action reads for a GET by user, narrowed to pk like get_object()"""
+    request = APIRequestFactory().get('/', params)
+    force_authenticate(request, user)
+    view = viewset(action_map={'get': action}, format_kwarg=None, args=(), kwargs={'pk': pk} if pk else {})
+    view.request = view.initialize_request(request)
+    queryset = view.filter_queryset(view.get_queryset())
+    return queryset.filter(pk=pk) if pk else queryset
+
+
+def changelist_queryset(model, user, **params):
+    """
+    The rows of model's admin changelist filtered by params, as its paginator
+    counts them: pages walk the primary key backwards, the count needs the index
+    """
+    request = RequestFactory().get('/', params)
+    request.user = user
+    return admin.site._registry[model].get_changelist_instance(request).get_queryset(request).order_by()
+
+
+def sync_page(queryset, field, since):
+    """A page of an /api/sync/ feed as core.sync.page() reads it"""
+    mark = [since.isoformat(), 0]
+    return queryset.filter(**{f'{field}__lte': timezone.now()}).filter(after(field, mark)).order_by(field, 'pk')
+
+
+def plan_cases(government, contractor, superuser):
+    since = timezone.now() - timedelta(days=7)
+    return {
+        'projects: retrieve': view_queryset(ProjectViewSet, government, 'retrieve', pk=1),
+        'projects: materials': material_queryset().filter(project=1),
+        'projects: issues': issue_queryset().filter(project=1),
+        'progress: pending': progress_queryset().filter(status='PENDING'),
+        'materials: of project': view_queryset(MaterialViewSet, government, project=1),
+        'contractor-profiles: own': view_queryset(ContractorProfileViewSet, contractor),
+        'contractor-profiles: suspended': contractor_profile_queryset().filter(is_suspended=True),
+        'contractor-certificates: own': view_queryset(ContractorCertificateViewSet, contractor),
+        'audit-logs: list': view_queryset(AuditLogViewSet, government)[:50],
+        'audit-logs: export': audit_log_queryset().filter(timestamp__gte=since).order_by('timestamp', 'id'),
+        'upload-sessions: own': view_queryset(UploadSessionViewSet, contractor),
+        'sync: project feed': sync_page(feed_querysets()['projects'][2], 'updated_at', since),
+        'sync: deletions': sync_page(Tombstone.objects.all(), 'deleted_at', since),
+        'admin projects: by status': changelist_queryset(Project, superuser, status='IN_PROGRESS'),
+        'admin projects: by ministry and status': changelist_queryset(
+            Project, superuser, ministry='Ministry of Physical Infrastructure', status='IN_PROGRESS'
+        ),
+        'admin projects: by contract size': changelist_queryset(Project, superuser, contract_size='LARGE'),
+        'admin progress: by status': changelist_queryset(Progress, superuser, status='PENDING'),
+        'admin issues: by status': changelist_queryset(IssueReport, superuser, status='REPORTED'),
+        'admin issues: by severity': changelist_queryset(IssueReport, superuser, severity='CRITICAL'),
+        'admin issues: by type': changelist_queryset(IssueReport, superuser, issue_type='CONTRACTOR_FAULT'),
+        'admin contractor profiles: suspended': changelist_queryset(
+            ContractorProfile, superuser, is_suspended__exact='1'
+        ),
+    }
+
+
+# "SCAN core_project" reads every row; "SCAN ... USING INDEX" walks an index in order
+FULL_SCAN_RE = re.compile(r'\bSCAN (\w+)\b(?! USING (COVERING )?INDEX)')
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([User(username=f'user{i}') for i in range(50)])
+        contractors = ContractorProfile.objects.bulk_create([
+            ContractorProfile(user=user, is_suspended=i % 10 == 0) for i, user in enumerate(users)
+        ])
+        projects = Project.objects.bulk_create([
+            Project(
+                name=f'Project {i}',
+                location='Kathmandu',
+                ministry=['Ministry of Physical Infrastructure', 'Ministry of Health'][i % 2],
+                contractor=contractors[i % 50].user.username,
+                contractor_profile=contractors[i % 50],
+                total_budget=Decimal(100000 * (i + 1)),
+                contract_size=['SMALL', 'MEDIUM', 'LARGE'][i % 3],
+                status=['PLANNING', 'IN_PROGRESS', 'COMPLETED'][i % 3],
+                start_date=date(2024, 7, 16),
+                end_date=date(2025, 7, 15),
+            )
+            for i in range(200)
+        ])
+        Progress.objects.bulk_create([
+            Progress(
+                project=project,
+                physical_progress=i % 100,
+                financial_progress=i % 100,
+                status=['PENDING', 'APPROVED', 'REJECTED'][i % 3],
+            )
+            for i, project in enumerate(projects)
+        ])
+        IssueReport.objects.bulk_create([
+            IssueReport(
+                project=project,
+                title=f'Issue {i}',
+                description='Seeded',
+                issue_type=['CONTRACTOR_FAULT', 'MATERIAL_DEFECT', 'DESIGN_FLAW', 'OTHER'][i % 4],
+                severity=['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'][i % 4],
+                status=['REPORTED', 'UNDER_REVIEW', 'VERIFIED', 'RESOLVED'][i % 4],
+            )
+            for i, project in enumerate(projects)
+        ])
+        AuditLog.objects.bulk_create([
+            AuditLog(action='UPDATE', model_name='Project', object_id=project.id)
+            for project in projects
+        ])
+        cls.government = User.objects.create(username='government')
+        UserProfile.objects.create(user=cls.government, role='GOVERNMENT')
+        cls.contractor = contractors[0].user
+        cls.superuser = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_no_full_table_scans(self):
+        for name, queryset in plan_cases(self.government, self.contractor, self.superuser).items():
+            with self.subTest(name):
+                plan = queryset.explain()
+                self.assertIsNone(FULL_SCAN_RE.search(plan), f'{name} scans a table:\n{plan}')
+                self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan, f'{name} sorts in memory:\n{plan}')
+
+
+# ✅ N+1 Detection - Every API route against seeded data. The test runner
+# instruments each request and raises NPlusOneQueries on a repeated query.
+class EndpointQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=40, stdout=StringIO())
+
+    def request_every_route(self, username):
+        user = User.objects.get(username=username)
+        auth = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+        cases, _ = api_cases(auth, username, 'fundtracker')
+        self.assertGreater(len(cases), 20)
+        for case in cases:
+            with self.subTest(case.key):
+                response = self.client.generic(
+                    case.method, case.path, case.body or '',
+                    content_type='application/json', headers=case.headers
+                )
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                self.assertLess(response.status_code, 500)
+
+    def test_government_routes(self):
+        self.request_every_route('seed_government_0')
+
+    def test_auditor_routes(self):
+        self.request_every_route('seed_auditor_0')
+
+    def test_contractor_routes(self):
+        self.request_every_route('seed_contractor_0')
+
+    def test_public_routes(self):
+        self.request_every_route('seed_public_0')
+
+    def test_admin_changelists(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        for model in admin.site._registry:
+            url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_reports_the_serializer_field(self):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            ProgressSerializer(Progress.objects.all()[:10], many=True).data
+        finally:
+            current_timings.reset(token)
+        field_paths = {field_path for field_path, _ in timings.repeated.values()}
+        self.assertIn('ProgressSerializer.submitted_by_username', field_paths)
+        self.assertIn('ProgressSerializer.images', field_paths)
+
+
+# ✅ Fast Lists - Lists built from .values() rows must match their serializers byte for byte
+class ValuesListParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=15, stdout=StringIO())
+        government = User.objects.get(username='seed_government_0')
+        cls.auth = {'Authorization': f'Bearer {AccessToken.for_user(government)}'}
+        # Rows the seed does not produce: a user on an audit entry, a verified
+        # rating and rating evidence (bulk_create: no file is written)
+        AuditLog.objects.create(
+            user=government, action='UPDATE', model_name='Project', object_id=1, description='Verified'
+        )
+        rating = ContractorRating.objects.order_by('id').first()
+        ContractorRating.objects.filter(pk=rating.pk).update(
+            is_verified=True, verified_by=government, verified_at=timezone.now()
+        )
+        RatingEvidence.objects.bulk_create([
+            RatingEvidence(rating=rating, file='rating_evidence/crack.jpg', description='Crack in the slab'),
+            RatingEvidence(rating=rating, evidence_type='VIDEO', file='rating_evidence/walkthrough.mp4'),
+        ])
+
+    def assertSameAsSerializer(self, viewset, path):
+        fast = self.client.get(path, headers=self.auth)
+        with mock.patch.object(viewset, 'use_values_list', False):
+            regular = self.client.get(path, headers=self.auth)
+        self.assertEqual(fast.status_code, 200)
+        self.assertTrue(fast.json())
+        self.assertEqual(fast.content, regular.content)
+
+    def test_audit_logs(self):
+        self.assertTrue(AuditLog.objects.filter(user=None).exists())
+        self.assertSameAsSerializer(AuditLogViewSet, '/api/audit-logs/')
+
+    def test_materials(self):
+        self.assertTrue(Material.objects.filter(total_actual_cost=None).exists())
+        self.assertSameAsSerializer(MaterialViewSet, '/api/materials/')
+        project = Material.objects.order_by('id').first().project_id
+        self.assertSameAsSerializer(MaterialViewSet, f'/api/materials/?project={project}')
+
+    def test_contractor_ratings(self):
+        self.assertSameAsSerializer(ContractorRatingViewSet, '/api/contractor-ratings/')
+
+    def test_msgpack(self):
+        fast = self.client.get('/api/materials/', headers={**self.auth, 'Accept': 'application/msgpack'})
+        with mock.patch.object(MaterialViewSet, 'use_values_list', False):
+            regular = self.client.get('/api/materials/', headers={**self.auth, 'Accept': 'application/msgpack'})
+        self.assertEqual(fast.content, regular.content)
+
+    def test_rejects_fields_that_need_instances(self):
+        class AuditLogWithMethodSerializer(AuditLogSerializer):
+            summary = serializers.SerializerMethodField()
+
+            class Meta(AuditLogSerializer.Meta):
+                fields = AuditLogSerializer.Meta.fields + ['summary']
+
+            def get_summary(self, obj):
+                return str(obj)
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(AuditLogWithMethodSerializer())
+
+
+# ✅ Duplicate Photo Detection - Hashes, band lookups and when a photo is (re)fingerprinted
+def photo(seed, width=90, name='photo.jpg'):
+    """A JPEG whose dHash depends on seed alone, whatever the width"""
+    rnd = random.Random(seed)
+    small = Image.new('L', (perceptual_hash.HASH_SIZE + 1, perceptual_hash.HASH_SIZE))
+    small.putdata([rnd.randrange(256) for _ in range(72)])
+    buffer = BytesIO()
+    small.resize((width, width * 8 // 9), Image.BILINEAR).convert('RGB').save(buffer, 'JPEG', quality=90)
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+class ImageFingerprintTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        project = Project.objects.create(
+            name='Bridge', location='Pokhara', ministry='Ministry of Physical Infrastructure',
+            contractor='builder', total_budget=Decimal('100000'),
+            start_date=date(2024, 7, 16), end_date=date(2025, 7, 15),
+        )
+        cls.progress = Progress.objects.create(project=project, physical_progress=40, financial_progress=35)
+        cls.issue = IssueReport.objects.create(
+            project=project, title='Cracked pier', description='Photos attached',
+            issue_type='CONTRACTOR_FAULT',
+        )
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def fingerprint(self, instance):
+        return ImageFingerprint.objects.filter(
+            source_model=type(instance).__name__, source_id=instance.id
+        ).first()
+
+    def store(self, source_id, value):
+        return ImageFingerprint.objects.create(
+            source_model='ProgressImage', source_id=source_id, phash=perceptual_hash.to_hex(value),
+            **{f'band_{i}': band for i, band in enumerate(perceptual_hash.split_bands(value))}
+        )
+
+    def test_resized_copies_hash_alike(self):
+        original = perceptual_hash.dhash(photo(1))
+        resized = perceptual_hash.dhash(photo(1, width=400))
+        self.assertLessEqual(perceptual_hash.hamming(original, resized), 2)
+        self.assertGreater(perceptual_hash.hamming(original, perceptual_hash.dhash(photo(2))), 10)
+
+    def test_near_duplicate_lookup(self):
+        value = 0x0123_4567_89ab_cdef
+        # Spread the flipped bits over every band: no band matches exactly
+        flips = {
+            1: 1,
+            3: 1 | 1 << 20 | 1 << 40,
+            6: 3 | 3 << 20 | 3 << 40,
+            7: 3 | 3 << 20 | 3 << 40 | 1 << 60,
+            9: 7 | 7 << 20 | 7 << 40,
+        }
+        for distance, mask in flips.items():
+            self.assertEqual(perceptual_hash.hamming(value, value ^ mask), distance)
+            self.store(distance, value ^ mask)
+        self.store(100, ~value & (1 << 64) - 1)
+
+        def found(matches):
+            return [(match.source_id, distance) for match, distance in matches]
+
+        self.assertEqual(found(ImageFingerprint.find_near_duplicates(value)), [(1, 1), (3, 3), (6, 6)])
+        matches = ImageFingerprint.find_near_duplicates(value, max_distance=7, exclude=('ProgressImage', 1))
+        self.assertEqual([distance for _, distance in matches], [3, 6, 7])
+
+        by_source = ImageFingerprint.near_duplicates_by_source('ProgressImage', [1, 9, 100])
+        self.assertEqual(found(by_source[1]), [(3, 2), (6, 5), (7, 6)])
+        self.assertNotIn(100, by_source)
+
+    def test_fingerprints_new_photos_only(self):
+        with mock.patch.object(perceptual_hash, 'dhash', wraps=perceptual_hash.dhash) as dhash:
+            image = ProgressImage.objects.create(progress=self.progress, image=photo(1))
+            self.assertEqual(self.fingerprint(image).value, perceptual_hash.dhash(photo(1)))
+            dhash.reset_mock()
+            image.save()
+            ProgressImage.objects.get(pk=image.pk).save()
+            self.assertEqual(dhash.call_count, 0)
+            image.image = photo(2)
+            image.save()
+            self.assertEqual(dhash.call_count, 1)
+        self.assertEqual(self.fingerprint(image).value, perceptual_hash.dhash(photo(2)))
+        image.delete()
+        self.assertFalse(ImageFingerprint.objects.exists())
+
+    def test_follows_the_evidence_type(self):
+        evidence = IssueEvidence.objects.create(
+            issue=self.issue, evidence_type='VIDEO', file=photo(1, name='site.mp4')
+        )
+        self.assertIsNone(self.fingerprint(evidence))
+        evidence.evidence_type = 'PHOTO'
+        evidence.save()
+        self.assertIsNotNone(self.fingerprint(evidence))
+        evidence = IssueEvidence.objects.get(pk=evidence.pk)
+        evidence.evidence_type = 'DOCUMENT'
+        evidence.save()
+        self.assertIsNone(self.fingerprint(evidence))
+
+    def test_unreadable_replacement_drops_the_fingerprint(self):
+        image = ProgressImage.objects.create(progress=self.progress, image=photo(1))
+        image.image = ContentFile(b'not an image', name='broken.jpg')
+        image.save()
+        self.assertIsNone(self.fingerprint(image))
+
+
+# ✅ Deduplicated Uploads - One reference per file field pointing at a blob
+class BlobReferenceTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.contractor = ContractorProfile.objects.create(user=User.objects.create(username='builder'))
+
+    def certificate(self, content, name='permit.pdf'):
+        return ContractorCertificate.objects.create(
+            contractor=self.contractor,
+            name='Building permit',
+            issuing_authority='Department of Urban Development',
+            issue_date=date(2024, 7, 16),
+            document=ContentFile(content, name=name) if isinstance(content, bytes) else content,
+        )
+
+    def ref_count(self, name):
+        return StoredBlob.objects.get(name=name).ref_count
+
+    def test_identical_uploads_share_a_blob(self):
+        first, second = self.certificate(b'permit'), self.certificate(b'permit')
+        self.assertEqual(first.document.name, second.document.name)
+        self.assertEqual(self.ref_count(first.document.name), 2)
+        self.assertEqual(len(os.listdir(os.path.dirname(first.document.path))), 1)
+
+    def test_replacing_releases_the_old_blob(self):
+        certificate = self.certificate(b'draft')
+        old = certificate.document.name
+        certificate.document = ContentFile(b'final', name='permit.pdf')
+        certificate.save()
+        self.assertEqual(self.ref_count(old), 0)
+        self.assertEqual(self.ref_count(certificate.document.name), 1)
+
+    def test_deleting_releases_once(self):
+        first, second = self.certificate(b'permit'), self.certificate(b'permit')
+        name = first.document.name
+        first.document.delete()  # saves the cleared field
+        self.assertEqual(self.ref_count(name), 1)
+        self.assertTrue(default_storage.exists(name))
+        second.document.delete(save=False)
+        second.delete()
+        self.assertEqual(self.ref_count(name), 0)
+        StoredBlob.release(name)
+        self.assertEqual(self.ref_count(name), 0)
+
+    def test_rolled_back_rows_hold_no_reference(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            name = self.certificate(b'permit').document.name
+            raise RuntimeError
+        self.assertFalse(StoredBlob.objects.filter(name=name, ref_count__gt=0).exists())
+        certificate = self.certificate(b'permit')
+        self.assertEqual(certificate.document.name, name)
+        self.assertEqual(self.ref_count(name), 1)
+
+    def test_collects_blobs_of_rolled_back_rows(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            name = self.certificate(b'permit').document.name
+            raise RuntimeError
+        self.assertTrue(default_storage.exists(name))
+        call_command('collect_orphan_blobs', grace_hours=0, stdout=StringIO())
+        self.assertFalse(default_storage.exists(name))
+
+    def test_rows_given_a_stored_blob_reference_it(self):
+        name = self.certificate(b'permit').document.name
+        self.certificate(name)
+        self.assertEqual(self.ref_count(name), 2)
+
+    def test_limits_extensions(self):
+        cases = (('scan.PDF', '.pdf'), ('permit.' + 'x' * 200, ''), ('permit.p df', ''), ('permit', ''))
+        for filename, extension in cases:
+            with self.subTest(filename):
+                name = self.certificate(filename.encode(), name=filename).document.name
+                self.assertEqual(os.path.splitext(name)[1], extension)
+                self.assertLessEqual(len(name), ContractorCertificate._meta.get_field('document').max_length)
+
+    def test_collects_unreferenced_blobs(self):
+        kept, dropped = self.certificate(b'kept'), self.certificate(b'dropped')
+        kept_name, dropped_name = kept.document.name, dropped.document.name
+        dropped.delete()
+        call_command('collect_orphan_blobs', grace_hours=0, stdout=StringIO())
+        self.assertFalse(StoredBlob.objects.filter(name=dropped_name).exists())
+        self.assertFalse(default_storage.exists(dropped_name))
+        self.assertEqual(self.ref_count(kept_name), 1)
+        self.assertTrue(default_storage.exists(kept_name))
+
+
+# ✅ Resumable Uploads - Content-Range chunks, resuming, finalize and expiry
+class UploadSessionTests(TestCase):
+    DATA = bytes(range(256)) * 4  # 1024 bytes
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='reporter')
+        project = Project.objects.create(
+            name='Bridge', location='Pokhara', ministry='Ministry of Physical Infrastructure',
+            contractor='builder', total_budget=Decimal('100000'),
+            start_date=date(2024, 7, 16), end_date=date(2025, 7, 15),
+        )
+        cls.issue = IssueReport.objects.create(
+            project=project, title='Cracked pier', description='Video attached',
+            issue_type='CONTRACTOR_FAULT',
+        )
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings_override = override_settings(
+            MEDIA_ROOT=os.path.join(root, 'media'), CHUNKED_UPLOAD_DIR=os.path.join(root, 'sessions')
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def create_session(self, total_size=len(DATA)):
+        response = self.client.post('/api/upload-sessions/', {
+            'target': 'ISSUE_EVIDENCE', 'issue': self.issue.id,
+            'filename': 'site.mp4', 'total_size': total_size,
+        }, content_type='application/json', headers=self.auth)
+        self.assertEqual(response.status_code, 201)
+        return UploadSession.objects.get(pk=response.json()['id'])
+
+    def put_chunk(self, session, start, end, content_range=None, data=None):
+        if content_range is None:
+            content_range = f'bytes {start}-{end}/{session.total_size}'
+        return self.client.put(
+            f'/api/upload-sessions/{session.id}/chunk/',
+            self.DATA[start:end + 1] if data is None else data,
+            content_type='application/octet-stream',
+            headers={**self.auth, 'Content-Range': content_range}
+        )
+
+    def finalize(self, session, **data):
+        return self.client.post(
+            f'/api/upload-sessions/{session.id}/finalize/', data,
+            content_type='application/json', headers=self.auth
+        )
+
+    def test_rejects_bad_content_ranges(self):
+        session = self.create_session()
+        cases = {
+            'missing': ('', 400),
+            'no total': ('bytes 0-9', 400),
+            'not bytes': ('items 0-9/1024', 400),
+            'end before start': ('bytes 9-0/1024', 400),
+            'wrong total': ('bytes 0-9/2048', 400),
+            'past the end': ('bytes 1020-1024/1024', 400),
+        }
+        for case, (content_range, status) in cases.items():
+            with self.subTest(case):
+                response = self.put_chunk(session, 0, 9, content_range=content_range)
+                self.assertEqual(response.status_code, status)
+        response = self.put_chunk(session, 0, 9, data=self.DATA[:5])
+        self.assertEqual(response.status_code, 400)
+        with override_settings(CHUNKED_UPLOAD_MAX_CHUNK_SIZE=100):
+            self.assertEqual(self.put_chunk(session, 0, 100).status_code, 413)
+        self.assertFalse(os.path.exists(session.part_path))
+
+    def test_resumes_from_the_received_offset(self):
+        session = self.create_session()
+        self.assertEqual(self.put_chunk(session, 0, 99).json()['received_size'], 100)
+        # A chunk past the received bytes would leave a hole
+        response = self.put_chunk(session, 200, 299)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['received_size'], 100)
+        # Re-sent and overlapping chunks (a retry after a lost response) are written again
+        self.assertEqual(self.put_chunk(session, 0, 99).json()['received_size'], 100)
+        self.assertEqual(self.put_chunk(session, 50, 199).json()['received_size'], 200)
+        response = self.client.get(f'/api/upload-sessions/{session.id}/', headers=self.auth)
+        self.assertEqual(response.json()['received_size'], 200)
+        self.put_chunk(session, 200, 1023)
+        with open(session.part_path, 'rb') as part:
+            self.assertEqual(part.read(), self.DATA)
+
+    def test_finalize_checks_size_and_checksum(self):
+        session = self.create_session()
+        self.put_chunk(session, 0, 511)
+        response = self.finalize(session)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['received_size'], 512)
+
+        self.put_chunk(session, 512, 1023)
+        self.assertEqual(self.finalize(session, sha256='0' * 64).status_code, 400)
+        session.refresh_from_db()
+        self.assertEqual(session.status, 'ACTIVE')
+
+        digest = hashlib.sha256(self.DATA).hexdigest()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.finalize(session, sha256=digest.upper())
+        self.assertEqual(response.status_code, 201)
+        evidence = IssueEvidence.objects.get(pk=response.json()['id'])
+        self.assertEqual(evidence.issue, self.issue)
+        self.assertEqual(evidence.uploaded_by, self.user)
+        self.assertIn(digest, evidence.file.name)
+        with evidence.file.open('rb') as f:
+            self.assertEqual(f.read(), self.DATA)
+        self.assertFalse(os.path.exists(session.part_path))
+
+        # Finalize is idempotent; the session takes no more chunks
+        response = self.finalize(session)
+        self.assertEqual((response.status_code, response.json()['id']), (200, evidence.id))
+        self.assertEqual(self.put_chunk(session, 0, 9).status_code, 409)
+
+    def test_expires_stale_sessions(self):
+        stale, fresh = self.create_session(), self.create_session()
+        self.put_chunk(stale, 0, 99)
+        self.put_chunk(fresh, 0, 99)
+        UploadSession.objects.filter(pk=stale.pk).update(
+            updated_at=timezone.now() - timedelta(hours=settings.CHUNKED_UPLOAD_EXPIRY_HOURS + 1)
+        )
+        call_command('expire_upload_sessions', stdout=StringIO())
+        self.assertEqual(list(UploadSession.objects.values_list('pk', flat=True)), [fresh.pk])
+        self.assertFalse(os.path.exists(stale.part_path))
+        self.assertTrue(os.path.exists(fresh.part_path))
+
+
+# ✅ Audit Export - Bad date filters are the client's mistake, not a server error
+class AuditExportTests(TestCase):
+    def test_rejects_invalid_dates(self):
+        user = User.objects.create(username='auditor')
+        auth = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+        for value in ('yesterday', '2024-13-45', '2024-02-30T10:00:00', '2024-01-01T25:00:00'):
+            with self.subTest(value):
+                response = self.client.get('/api/audit-logs/export/', {'start': value}, headers=auth)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+        response = self.client.get('/api/audit-logs/export/', {'end': '2024-02-29'}, headers=auth)
+        self.assertEqual(response.status_code, 200)
+
+    def export_rows(self, count):
+        AuditLog.objects.bulk_create([
+            AuditLog(action='UPDATE', model_name='Project', object_id=i, description=f'Update {i}')
+            for i in range(count)
+        ])
+        user = User.objects.create(username='auditor')
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def test_streams_one_chunk_per_batch(self):
+        auth = self.export_rows(25)
+        with mock.patch.object(AuditLogViewSet, 'EXPORT_CHUNK_SIZE', 10):
+            for export_format, lines in (('ndjson', [10, 10, 5]), ('csv', [10, 10, 6])):
+                with self.subTest(export_format):
+                    response = self.client.get(
+                        '/api/audit-logs/export/', {'export_format': export_format}, headers=auth
+                    )
+                    chunks = list(response.streaming_content)
+                    self.assertEqual([chunk.count(b'\n') for chunk in chunks], lines)
+
+    async def test_streams_under_asgi_before_reading_every_row(self):
+        auth = await sync_to_async(self.export_rows)(50)
+        read = []
+        export_row = AuditLogViewSet.export_row
+
+        def counting_export_row(view, log):
+            read.append(log.id)
+            return export_row(view, log)
+
+        with mock.patch.object(AuditLogViewSet, 'EXPORT_CHUNK_SIZE', 10), \
+                mock.patch.object(AuditLogViewSet, 'export_row', counting_export_row):
+            response = await self.async_client.get('/api/audit-logs/export/', headers=auth)
+            self.assertTrue(response.is_async)
+            content = aiter(response.streaming_content)
+            first = await anext(content)
+            self.assertEqual(first.count(b'\n'), 10)
+            self.assertLess(len(read), 50)
+            rest = [chunk async for chunk in content]
+        self.assertEqual(len(rest), 4)
+        self.assertEqual(len(read), 50)
+
+
+# ✅ Full-Text Search - The index follows SearchEntry rows; /api/search/ filters and validates
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.contractor = User.objects.create(
+            username='kathmandu_builders', first_name='Ram', last_name='Shrestha'
+        )
+        ContractorProfile.objects.create(user=cls.contractor)
+        cls.project = Project.objects.create(
+            name='Kathmandu Road Upgrade',
+            location='Kathmandu',
+            ministry='Ministry of Physical Infrastructure',
+            contractor=cls.contractor.username,
+            total_budget=Decimal('5000000'),
+            start_date=date(2024, 7, 16),
+            end_date=date(2025, 7, 15),
+        )
+        cls.issue = IssueReport.objects.create(
+            project=cls.project,
+            title='Road surface cracking',
+            description='Cracks along the new road',
+            issue_type='MATERIAL_DEFECT',
+            severity='HIGH',
+        )
+
+    def search(self, user=None, **params):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'} if user else {}
+        return self.client.get('/api/search/', params, headers=headers)
+
+    def found(self, query, **params):
+        response = self.search(q=query, **params)
+        self.assertEqual(response.status_code, 200)
+        return {(row['type'], row['id']) for row in response.json()}
+
+    def test_matches_word_prefixes(self):
+        project = ('project', self.project.id)
+        self.assertIn(project, self.found('kath road'))
+        self.assertIn(project, self.found('UPGRADE kathmandu'))
+        self.assertNotIn(project, self.found('athmandu'))
+        self.assertNotIn(project, self.found('kath bridge'))
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        # Queryset writes skip the signals, so these exercise the index itself
+        entry = SearchEntry.objects.create(kind='material', object_id=999, title='Portland cement')
+        self.assertEqual(self.found('portl'), {('material', 999)})
+        SearchEntry.objects.filter(pk=entry.pk).update(title='Steel rebar')
+        self.assertEqual(self.found('portl'), set())
+        self.assertEqual(self.found('rebar'), {('material', 999)})
+        SearchEntry.objects.filter(pk=entry.pk).delete()
+        self.assertEqual(self.found('rebar'), set())
+
+    def test_follows_saved_objects(self):
+        self.project.name = 'Pokhara Bridge'
+        self.project.save()
+        self.assertNotIn(('project', self.project.id), self.found('upgrade'))
+        self.assertIn(('project', self.project.id), self.found('pokh bridge'))
+        self.issue.delete()
+        self.assertNotIn(('issue', self.issue.id), self.found('cracking'))
+
+    def test_filters_by_type(self):
+        self.assertEqual(self.found('road', type='issue'), {('issue', self.issue.id)})
+        self.assertEqual(
+            self.found('road', type='issue, project'),
+            {('issue', self.issue.id), ('project', self.project.id)}
+        )
+
+    def test_hides_contractors_from_anonymous_users(self):
+        contractor = ('contractor', self.contractor.contractor_profile.id)
+        self.assertNotIn(contractor, self.found('shrestha'))
+        self.assertEqual(self.found('shrestha', type='contractor'), set())
+        response = self.search(self.contractor, q='shrestha')
+        self.assertIn(contractor, {(row['type'], row['id']) for row in response.json()})
+
+    def test_rejects_bad_parameters(self):
+        for params in ({}, {'q': '  '}, {'q': 'road', 'type': 'project,bridge'}, {'q': 'road', 'limit': 'ten'}):
+            with self.subTest(params):
+                response = self.search(**params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+
+# ✅ District Rollups - Writes refresh the districts they leave and enter
+class DistrictStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.kathmandu, cls.kaski = geo.geocode('Kathmandu').district_code, geo.geocode('Kaski').district_code
+        cls.reporter = User.objects.create(username='reporter')
+        cls.profile = UserProfile.objects.create(user=cls.reporter, nepal_nid=f'{cls.kathmandu:02d}-05-12345678')
+        cls.projects = [
+            Project.objects.create(
+                name=f'{location} Water Supply',
+                location=location,
+                ministry='Ministry of Water Supply',
+                contractor='contractor',
+                total_budget=Decimal('1000000'),
+                start_date=date(2024, 7, 16),
+                end_date=date(2025, 7, 15),
+            )
+            for location in ('Kathmandu', 'Pokhara, Kaski')
+        ]
+        cls.issue = IssueReport.objects.create(
+            project=cls.projects[0], reported_by=cls.reporter, title='Leaking pipe', description='Seeded'
+        )
+
+    def setUp(self):
+        districts.refresh()
+
+    def assertRefreshed(self, write):
+        before = {row.district_code: row.refreshed_at for row in DistrictStats.objects.all()}
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        codes = {self.kathmandu, self.kaski}
+        rows = DistrictStats.objects.filter(district_code__in=codes)
+        stored = {row.district_code: {name: getattr(row, name) for name in districts.STAT_FIELDS} for row in rows}
+        self.assertEqual(stored, districts.compute(codes))
+        for row in rows:
+            self.assertGreater(row.refreshed_at, before[row.district_code])
+
+    def test_moving_a_project(self):
+        project = self.projects[0]
+        project.location = 'Lakeside, Pokhara'
+        self.assertRefreshed(project.save)
+        self.assertEqual(DistrictStats.objects.get(district_code=self.kaski).projects, 2)
+        self.assertEqual(DistrictStats.objects.get(district_code=self.kathmandu).issues, 0)
+
+    def test_reassigning_an_issue(self):
+        self.issue.project = self.projects[1]
+        self.assertRefreshed(self.issue.save)
+        self.assertEqual(DistrictStats.objects.get(district_code=self.kaski).issues, 1)
+
+    def test_changing_a_nid(self):
+        self.profile.nepal_nid = f'{self.kaski:02d}-03-12345678'
+        self.assertRefreshed(self.profile.save)
+        kaski = DistrictStats.objects.get(district_code=self.kaski)
+        self.assertEqual((kaski.residents, kaski.reporters, kaski.reported_issues), (1, 1, 1))
+
+    def test_backfill_migration_parses_like_the_model(self):
+        backfill = importlib.import_module('core.migrations.0017_backfill_nid_codes')
+        nids = [
+            '01-01-00000001', '77-32-00000002', '27-05-12345678', '78-01-00000003', '01-33-00000004',
+            '00-05-00000005', '1-05-00000006', '01-05-0000007', 'not an nid', None,
+        ]
+        UserProfile.objects.bulk_create([
+            UserProfile(user=User.objects.create(username=f'resident{i}'), nepal_nid=nid)
+            for i, nid in enumerate(nids)
+        ])
+        UserProfile.objects.update(nid_district=None, nid_ward=None)
+        with mock.patch.object(backfill, 'BATCH_SIZE', 3):
+            backfill.backfill_nid_codes(django_apps, None)
+        for nid, district, ward in UserProfile.objects.values_list('nepal_nid', 'nid_district', 'nid_ward'):
+            with self.subTest(nid):
+                self.assertEqual((district, ward), parse_nepal_nid(nid))
+
+
+# ✅ Project Map - Geocoding, geohash covers and the map endpoints
+class GeoTests(TestCase):
+    def project_at(self, latitude, longitude):
+        project = Project.objects.create(
+            name='Bridge', location='Somewhere', ministry='Ministry of Physical Infrastructure',
+            contractor='contractor', total_budget=Decimal('1000000'),
+            start_date=date(2024, 7, 16), end_date=date(2025, 7, 15),
+        )
+        Project.objects.filter(pk=project.pk).update(
+            latitude=latitude, longitude=longitude, geohash=geo.geohash_encode(latitude, longitude)
+        )
+        return project
+
+    def test_geocode_precedence(self):
+        for location, expected in {
+            'Ward 4, Pokhara, Kaski': 'Pokhara, Kaski',
+            'POKHARA': 'Pokhara, Kaski',
+            'Taplejung': 'Taplejung',
+            # A municipality over its district...
+            'Kirtipur, Kathmandu': 'Kirtipur, Kathmandu',
+            'Kathmandu': 'Kathmandu, Kathmandu',
+            # ...but only one within the district named
+            'Kirtipur, Lalitpur': 'Lalitpur, Lalitpur',
+            'Kirtipur, Taplejung': 'Taplejung',
+            'Nowhere in particular': None,
+        }.items():
+            with self.subTest(location):
+                place = geo.geocode(location)
+                self.assertEqual(place and str(place), expected)
+
+    def test_covering_cells_include_the_edges(self):
+        for bbox in (
+            (26.3, 80.0, 30.5, 88.2),  # Nepal
+            (27.6, 85.2, 27.8, 85.5),
+            (0.0, 0.0, 22.5, 45.0),  # edges on cell boundaries
+            (-90.0, -180.0, 90.0, 180.0),
+            (27.7, 85.3, 27.7, 85.3),
+        ):
+            cells = geo.covering_cells(bbox, settings.GEO_MAX_COVER_CELLS)
+            if len(cells[0]) > 1:
+                self.assertLessEqual(len(cells), settings.GEO_MAX_COVER_CELLS)
+            min_lat, min_lng, max_lat, max_lng = bbox
+            for latitude in (min_lat, (min_lat + max_lat) / 2, max_lat):
+                for longitude in (min_lng, (min_lng + max_lng) / 2, max_lng):
+                    with self.subTest(bbox=bbox, point=(latitude, longitude)):
+                        geohash = geo.geohash_encode(latitude, longitude)
+                        self.assertTrue(any(geohash.startswith(cell) for cell in cells))
+
+    def test_bbox_includes_projects_on_its_edges(self):
+        inside = [self.project_at(27.6, 85.2), self.project_at(27.8, 85.5), self.project_at(27.7, 85.35)]
+        self.project_at(27.81, 85.35)
+        self.project_at(27.7, 85.19)
+        response = self.client.get('/api/projects/bbox/', {'bbox': '85.2,27.6,85.5,27.8'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(row['id'] for row in response.json()), sorted(project.id for project in inside))
+
+    def test_too_many_results(self):
+        for _ in range(3):
+            self.project_at(27.7, 85.3)
+        for path, params in (
+            ('/api/projects/bbox/', {'bbox': '85.2,27.6,85.5,27.8'}),
+            ('/api/projects/near/', {'lat': 27.7, 'lng': 85.3}),
+        ):
+            with self.subTest(path):
+                with override_settings(GEO_MAX_RESULTS=3):
+                    self.assertEqual(len(self.client.get(path, params).json()), 3)
+                with override_settings(GEO_MAX_RESULTS=2):
+                    response = self.client.get(path, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('/api/projects/grid/', response.json()['error'])
+
+    def test_near_orders_by_distance(self):
+        # About 5, 1 and 8 km north of the point, then one in the box's corner but outside the circle
+        far = self.project_at(27.745, 85.3)
+        nearest = self.project_at(27.709, 85.3)
+        farthest = self.project_at(27.772, 85.3)
+        self.project_at(27.78, 85.39)
+        response = self.client.get('/api/projects/near/', {'lat': 27.7, 'lng': 85.3, 'radius_km': 10})
+        rows = response.json()
+        self.assertEqual([row['id'] for row in rows], [nearest.id, far.id, farthest.id])
+        self.assertEqual([round(row['distance_km']) for row in rows], [1, 5, 8])
+
+    def test_grid_precision_per_zoom(self):
+        for zoom in range(0, 21):
+            with self.subTest(zoom=zoom):
+                precision = geo.precision_for_zoom(zoom)
+                quarter_tile = 360.0 / 2 ** (zoom + 2)
+                if precision < geo.GEOHASH_PRECISION:
+                    self.assertLessEqual(geo.cell_size(precision)[1], quarter_tile)
+                if precision > 1:
+                    # The shortest such geohash
+                    self.assertGreater(geo.cell_size(precision - 1)[1], quarter_tile)
+        self.assertEqual([geo.precision_for_zoom(zoom) for zoom in range(0, 20, 3)], [1, 2, 3, 5, 6, 7, 8])
+
+        self.project_at(27.7, 85.3)
+        self.project_at(28.2, 83.98)
+        for zoom in (3, 7, 12):
+            with self.subTest(grid_zoom=zoom):
+                grid = self.client.get('/api/projects/grid/', {'zoom': zoom}).json()
+                self.assertEqual(grid['precision'], geo.precision_for_zoom(zoom))
+                cells = grid['cells']
+                self.assertEqual({len(cell['cell']) for cell in cells}, {grid['precision']})
+                self.assertEqual(sum(cell['projects'] for cell in cells), 2)
+
+
+# ✅ Fast Rendering - orjson and MessagePack agree with DRF's JSON, both ways
+class RenderingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=3, stdout=StringIO())
+        user = User.objects.get(username='seed_government_0')
+        cls.auth = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def payload(self):
+        return {
+            'decimal': Decimal('12.50'),
+            'aware': timezone.make_aware(datetime(2026, 1, 2, 3, 4, 5, 678901), timezone.get_fixed_timezone(0)),
+            'local': timezone.make_aware(datetime(2026, 1, 2, 3, 4, 5), timezone.get_fixed_timezone(345)),
+            'date': date(2026, 1, 2),
+            'duration': timedelta(days=1, seconds=5),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Approved'),
+            'separators': 'a\u2028b\u2029c',
+            'nested': [{'one': 1}, (2, 3)],
+        }
+
+    def test_json_matches_drf(self):
+        # Non-string keys become strings, as with json.dumps
+        data = {**self.payload(), 'keys': {1: 'one', None: 'none'}}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_msgpack_matches_json(self):
+        data = self.payload()
+        unpacked = msgpack.unpackb(MessagePackRenderer().render(data))
+        self.assertEqual(unpacked, json.loads(JSONRenderer().render(data)))
+        self.assertEqual(unpacked['decimal'], 12.5)
+        self.assertEqual(unpacked['aware'], '2026-01-02T03:04:05.678901Z')
+        self.assertEqual(unpacked['local'], '2026-01-02T03:04:05+05:45')
+
+    def test_accept_negotiation(self):
+        expected = self.client.get('/api/materials/', headers=self.auth).json()
+        for name, kwargs in {
+            'accept': {'headers': {**self.auth, 'Accept': 'application/msgpack'}},
+            'format': {'data': {'format': 'msgpack'}, 'headers': self.auth},
+        }.items():
+            with self.subTest(name):
+                response = self.client.get('/api/materials/', **kwargs)
+                self.assertEqual(response['Content-Type'], 'application/msgpack')
+                # Decimal fields stay strings, as in JSON
+                self.assertEqual(msgpack.unpackb(response.content), expected)
+
+        response = self.client.get('/api/materials/', headers={**self.auth, 'Accept': 'application/json; indent=4'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn(b'\n    "id": ', response.content)
+        self.assertEqual(json.loads(response.content), expected)
+
+        response = self.client.get('/api/materials/', headers={**self.auth, 'Accept': 'image/png'})
+        self.assertEqual(response.status_code, 406)
+
+    def test_msgpack_request_body(self):
+        material = Material.objects.order_by('id').first()
+        response = self.client.patch(
+            f'/api/materials/{material.id}/', msgpack.packb({'name': 'Cement', 'unit_price': '12.50'}),
+            content_type='application/msgpack', headers={**self.auth, 'Accept': 'application/msgpack'}
+        )
+        self.assertEqual(response.status_code, 200)
+        body = msgpack.unpackb(response.content)
+        self.assertEqual((body['name'], body['unit_price']), ('Cement', '12.50'))
+        material.refresh_from_db()
+        self.assertEqual((material.name, material.unit_price), ('Cement', Decimal('12.50')))
+
+        response = self.client.post(
+            '/api/auth/login/', msgpack.packb({'username': 'seed_public_0', 'password': 'fundtracker'}),
+            content_type='application/msgpack'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_malformed_bodies(self):
+        material = Material.objects.order_by('id').first()
+        for content_type, body, message in (
+            ('application/msgpack', b'\xc1', 'MessagePack parse error'),
+            ('application/msgpack', b'\x92\x01', 'MessagePack parse error'),
+            ('application/json', b'{"name": ', 'JSON parse error'),
+        ):
+            with self.subTest(content_type=content_type, body=body):
+                response = self.client.patch(
+                    f'/api/materials/{material.id}/', body, content_type=content_type, headers=self.auth
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(message, response.json()['detail'])
+
+
+# ✅ Response Compression - API bodies are compressed, media is sent as stored
+class CompressionTests(TestCase):
+    def response(self, **headers):
+        body = json.dumps([{'name': 'Kathmandu Road Upgrade'}] * 100)
+        response = HttpResponse(body, content_type='application/json')
+        for header, value in headers.items():
+            response[header] = value
+        request = RequestFactory().get('/', headers={'Accept-Encoding': 'gzip'})
+        return compress_response(request, response)
+
+    def test_compresses_api_responses(self):
+        self.assertEqual(self.response()['Content-Encoding'], 'gzip')
+
+    def test_passes_media_through(self):
+        for header, value in (
+            ('Accept-Ranges', 'bytes'),
+            ('X-Accel-Redirect', '/protected-media/report.json'),
+            ('X-Sendfile', '/srv/media/report.json'),
+        ):
+            with self.subTest(header):
+                self.assertFalse(self.response(**{header: value}).has_header('Content-Encoding'))
+
+
+# ✅ Open Data - Incremental snapshots drop the rows deleted since the last run
+class OpenDataTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=6, stdout=StringIO())
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def exported_ids(self, exporter, dataset):
+        """The ids in every part of dataset, one entry per copy"""
+        ids = []
+        for part in exporter.load_manifest()['datasets'][dataset]['parts']:
+            ids += read_part(os.path.join(exporter.root, part), exporter.file_format, ['id'])['id'].to_pylist()
+        return ids
+
+    def test_removes_deleted_rows(self):
+        for file_format in FORMATS:
+            with self.subTest(file_format):
+                exporter = SnapshotExporter(os.path.join(self.root, file_format), file_format)
+                exporter.run()
+                project = Project.objects.order_by('id').last()
+                materials = set(project.materials.values_list('id', flat=True))
+                self.assertTrue(materials)
+                project.delete()
+                manifest = exporter.run()
+                projects = set(Project.objects.values_list('id', flat=True))
+                self.assertEqual(set(self.exported_ids(exporter, 'projects')), projects)
+                self.assertFalse(set(self.exported_ids(exporter, 'materials')) & materials)
+                self.assertGreaterEqual(manifest['datasets']['materials']['last_removed_count'], len(materials))
+
+    def test_starts_over_when_tombstones_may_be_pruned(self):
+        exporter = SnapshotExporter(self.root)
+        exporter.run(['funds'])
+        manifest = exporter.load_manifest()
+        manifest['datasets']['funds']['last_snapshot_at'] = (
+            timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+        ).isoformat()
+        exporter.save_manifest(manifest)
+        exporter.run(['funds'])
+        # One copy of each fund: the earlier parts are gone
+        funds = sorted(Fund.objects.values_list('id', flat=True))
+        self.assertEqual(sorted(self.exported_ids(exporter, 'funds')), funds)
+
+    def test_reexports_updated_payments(self):
+        exporter = SnapshotExporter(self.root)
+        exporter.run(['material_payments'])
+        payment = MaterialPayment.objects.order_by('id').first()
+        payment.status = 'COMPLETED'
+        payment.save()
+        manifest = exporter.run(['material_payments'])
+        self.assertEqual(manifest['datasets']['material_payments']['last_row_count'], 1)
+        # The first run's copy and the updated one
+        self.assertEqual(self.exported_ids(exporter, 'material_payments').count(payment.id), 2)
+
+
+# ✅ Public Snapshot - Writes are queued, then only the touched documents and list shards are rebuilt
+class PublicSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=6, stdout=StringIO())
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings_override = override_settings(PUBLIC_SNAPSHOT_ROOT=root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        shard_size = mock.patch.object(public_snapshot, 'PROJECT_LIST_SHARD_SIZE', 2)
+        shard_size.start()
+        self.addCleanup(shard_size.stop)
+        self.publisher = public_snapshot.SnapshotPublisher()
+        self.projects = list(Project.objects.order_by('id'))
+
+    def read(self, manifest, name):
+        with open(os.path.join(self.publisher.root, manifest['files'][name]), 'rb') as f:
+            return json.load(f)
+
+    def listed_ids(self, manifest):
+        return [entry['id'] for name in manifest['project_list'] for entry in self.read(manifest, name)]
+
+    def test_writes_queue_projects_once(self):
+        project = self.projects[0]
+        project.save()
+        queued_at = PendingPublish.objects.get().queued_at
+        project.save()
+        Fund.objects.create(project=project, amount=Decimal('1000'))
+        self.assertEqual(
+            list(PendingPublish.objects.values_list('project_id', 'queued_at')), [(project.id, queued_at)]
+        )
+
+    def test_rolled_back_writes_are_not_queued(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.projects[0].save()
+            raise RuntimeError
+        self.assertFalse(PendingPublish.objects.exists())
+
+    def test_publishes_after_the_debounce_delay(self):
+        project = self.projects[0]
+        project.save()
+        self.assertIsNone(public_snapshot.publish_pending(self.publisher))
+        self.assertFalse(os.path.exists(self.publisher.manifest_path))
+
+        PendingPublish.objects.update(queued_at=timezone.now() - timedelta(seconds=31))
+        manifest = public_snapshot.publish_pending(self.publisher)
+        self.assertEqual(self.read(manifest, f'projects/{project.id}.json')['name'], project.name)
+        self.assertFalse(PendingPublish.objects.exists())
+        self.assertIsNone(public_snapshot.publish_pending(self.publisher))
+
+    def test_failed_publish_requeues(self):
+        self.projects[0].save()
+        PendingPublish.objects.update(queued_at=timezone.now() - timedelta(seconds=31))
+        with mock.patch.object(self.publisher, 'publish', side_effect=OSError), self.assertRaises(OSError):
+            public_snapshot.publish_pending(self.publisher)
+        self.assertEqual(PendingPublish.objects.get().project_id, self.projects[0].id)
+
+    def test_rebuilds_only_touched_shards(self):
+        before = self.publisher.publish()
+        self.assertEqual(self.listed_ids(before), [project.id for project in self.projects])
+        self.assertGreater(len(before['project_list']), 2)
+
+        renamed, deleted = self.projects[0].id, self.projects[-1].id
+        Project.objects.filter(id=renamed).update(name='Renamed bridge')
+        Project.objects.filter(id=deleted).delete()
+        after = self.publisher.publish([renamed, deleted])
+
+        def shard_name(project_id):
+            return public_snapshot.project_list_name(public_snapshot.project_list_shard(project_id))
+
+        # The deleted project's shard is rewritten, or dropped if it held only that project
+        changed = {name for name in after['files'] if after['files'][name] != before['files'].get(name)}
+        self.assertEqual(changed - {shard_name(deleted)}, {shard_name(renamed), f'projects/{renamed}.json'})
+        self.assertNotIn(f'projects/{deleted}.json', after['files'])
+        self.assertEqual(self.listed_ids(after), [project.id for project in self.projects[:-1]])
+        self.assertEqual(self.read(after, f'projects/{renamed}.json')['name'], 'Renamed bridge')
+
+    @unittest.skipUnless(public_snapshot.brotli, 'brotli is not installed')
+    def test_brotli_quality(self):
+        compress = public_snapshot.brotli.compress
+        with mock.patch.object(public_snapshot.brotli, 'compress', wraps=compress) as brotli_compress:
+            call_command('publish_public_snapshot', stdout=StringIO())
+            self.assertEqual({call.kwargs['quality'] for call in brotli_compress.call_args_list}, {11})
+            brotli_compress.reset_mock()
+            Project.objects.filter(id=self.projects[0].id).update(name='Renamed bridge')
+            PendingPublish.objects.create(
+                project_id=self.projects[0].id, queued_at=timezone.now() - timedelta(hours=1)
+            )
+            public_snapshot.publish_pending()
+            self.assertEqual({call.kwargs['quality'] for call in brotli_compress.call_args_list}, {5})
+
+    def test_replaces_files_atomically(self):
+        path = os.path.join(self.publisher.root, 'manifest.json')
+        self.publisher.replace(path, b'old')
+        self.assertEqual(os.stat(path).st_mode & 0o777, public_snapshot.FILE_MODE)
+        with mock.patch('os.replace', side_effect=OSError), self.assertRaises(OSError):
+            self.publisher.replace(path, b'new')
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'old')
+        self.assertEqual(os.listdir(self.publisher.root), ['manifest.json'])
+
+
+# ✅ Incremental Sync - Keyset pages over (updated_at, id), tombstones and cursor expiry
+@override_settings(SYNC_PAGE_SIZE=2, SYNC_SETTLE_SECONDS=0)
+class SyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.projects = [
+            Project.objects.create(
+                name=f'Road {i}', location='Kathmandu', ministry='Ministry of Physical Infrastructure',
+                contractor='builder', total_budget=Decimal('100000'),
+                start_date=date(2024, 7, 16), end_date=date(2025, 7, 15),
+            )
+            for i in range(5)
+        ]
+
+    def sync(self, cursor=None, **params):
+        response = self.client.get('/api/sync/', {'since': cursor, **params} if cursor else params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def sync_all(self, cursor=None):
+        """Follow has_more; returns (project ids per page, deleted project ids, last cursor)"""
+        pages, deleted = [], []
+        while True:
+            payload = self.sync(cursor)
+            pages.append([row['id'] for row in payload['changes']['projects']])
+            deleted += payload['deleted']['projects']
+            cursor = payload['cursor']
+            if not payload['has_more']:
+                return pages, deleted, cursor
+
+    def test_pages_through_every_row_once(self):
+        # Rows sharing a timestamp are ordered by id, also across pages
+        Project.objects.filter(id__in=[p.id for p in self.projects[1:4]]).update(updated_at=timezone.now())
+        pages, _, cursor = self.sync_all()
+        ids = [project_id for page in pages for project_id in page]
+        self.assertEqual(sorted(ids), [project.id for project in self.projects])
+        self.assertTrue(all(len(page) <= 2 for page in pages))
+        self.assertEqual(self.sync_all(cursor)[0], [[]])
+
+        project = self.projects[2]
+        project.name = 'Road 2 (resurfaced)'
+        project.save()
+        pages, _, _ = self.sync_all(cursor)
+        self.assertEqual(pages, [[project.id]])
+
+    def test_holds_back_fresh_rows(self):
+        with override_settings(SYNC_SETTLE_SECONDS=60):
+            self.assertEqual(self.sync()['changes']['projects'], [])
+            Project.objects.update(updated_at=timezone.now() - timedelta(minutes=2))
+            self.assertEqual(len(self.sync_all()[0][0]), 2)
+
+    def test_reports_deletions_after_the_cursor(self):
+        _, deleted, cursor = self.sync_all()
+        self.assertEqual(deleted, [])
+        gone = [self.projects[0].id, self.projects[3].id, self.projects[4].id]
+        Project.objects.filter(id__in=gone).delete()
+        pages, deleted, cursor = self.sync_all(cursor)
+        self.assertEqual(sorted(deleted), gone)
+        self.assertEqual(pages[-1], [])
+        self.assertEqual(self.sync_all(cursor)[1], [])
+
+    def test_rejects_bad_and_expired_cursors(self):
+        self.assertEqual(self.client.get('/api/sync/', {'since': 'garbage'}).status_code, 400)
+        cursor = self.sync()['cursor']
+        later = timezone.now() + timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+        with mock.patch('core.sync.timezone.now', return_value=later):
+            self.assertEqual(self.client.get('/api/sync/', {'since': cursor}).status_code, 410)
+
+    def test_ratings_only_for_signed_in_users(self):
+        self.assertNotIn('contractor_ratings', self.sync()['changes'])
+        user = User.objects.create(username='resident')
+        response = self.client.get('/api/sync/', headers={'Authorization': f'Bearer {AccessToken.for_user(user)}'})
+        self.assertIn('contractor_ratings', response.json()['changes'])
+
+
+# ✅ Live Activity - The stream needs ASGI; under WSGI the dashboards are told to poll
+# ✅ Async Read Path - Same bytes and negotiation as the DRF project routes
+class AsyncReadPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=10, stdout=StringIO())
+
+    async def assert_same_response(self, drf_path, async_path, **kwargs):
+        expected = await self.async_client.get(drf_path, **kwargs)
+        response = await self.async_client.get(async_path, **kwargs)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response['Content-Type'], expected['Content-Type'])
+        self.assertEqual(response['Vary'], expected['Vary'])
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    async def test_matches_the_drf_routes(self):
+        project = await Project.objects.order_by('id').afirst()
+        missing = await Project.objects.order_by('-id').values_list('id', flat=True).afirst() + 1
+        paths = ['projects/', f'projects/{project.id}/', f'projects/{project.id}/materials/',
+                 f'projects/{project.id}/issues/', f'projects/{missing}/', f'projects/{missing}/issues/']
+        negotiations = {
+            'default': {},
+            'json': {'headers': {'Accept': 'application/json'}},
+            'msgpack': {'headers': {'Accept': 'application/msgpack'}},
+            'format': {'data': {'format': 'msgpack'}},
+            'any': {'headers': {'Accept': '*/*'}},
+            'unacceptable': {'headers': {'Accept': 'image/png'}},
+        }
+        for path in paths:
+            for name, kwargs in negotiations.items():
+                with self.subTest(path=path, negotiation=name):
+                    await self.assert_same_response(f'/api/{path}', f'/api/public/{path}', **kwargs)
+
+    async def test_msgpack_payload(self):
+        response = await self.async_client.get('/api/public/projects/', headers={'Accept': 'application/msgpack'})
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(len(msgpack.unpackb(response.content)), await Project.objects.acount())
+
+    async def test_browser_accept_gets_json(self):
+        # No browsable API on the async routes: a browser's */* falls through to JSON
+        response = await self.async_client.get('/api/public/projects/', headers={'Accept': 'text/html, */*;q=0.8'})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(json.loads(response.content)), await Project.objects.acount())
+
+    async def test_unacceptable(self):
+        response = await self.async_client.get('/api/public/projects/', headers={'Accept': 'image/png'})
+        self.assertEqual(response.status_code, 406)
+
+
+# ✅ Database Profiles - Every FUNDTRACKER_DB profile yields DATABASES Django accepts
+class DatabaseProfileTests(SimpleTestCase):
+    ENVIRONMENT = ('FUNDTRACKER_DB', 'FUNDTRACKER_READ_REPLICA')
+
+    def load_databases(self, **environ):
+        """DATABASES of settings.py run with environ, ignoring the database variables of this shell"""
+        with mock.patch.dict(os.environ, environ):
+            for name in list(os.environ):
+                if (name in self.ENVIRONMENT or name.startswith('POSTGRES_')) and name not in environ:
+                    del os.environ[name]
+            databases = runpy.run_path(str(settings.BASE_DIR / 'fundtracker' / 'settings.py'))['DATABASES']
+        handler = ConnectionHandler(databases)
+        handler.settings  # fills in the defaults, or raises ImproperlyConfigured
+        return handler
+
+    def test_sqlite(self):
+        handler = self.load_databases()
+        self.assertEqual(list(handler.settings), ['default', 'replica'])
+        for alias in handler:
+            with self.subTest(alias):
+                # Checks OPTIONS such as transaction_mode without opening the file
+                params = handler[alias].get_connection_params()
+                self.assertEqual(params['timeout'], 20)
+        self.assertEqual(handler.settings['replica']['TEST']['MIRROR'], 'default')
+        self.assertTrue(handler['replica'].get_connection_params()['database'].endswith('?mode=ro'))
+        self.assertEqual(list(self.load_databases(FUNDTRACKER_READ_REPLICA='0').settings), ['default'])
+
+    def test_postgres(self):
+        for name, environ in (
+            ('pool', {}),
+            ('pool and replica', {'POSTGRES_REPLICA_HOST': 'replica.internal'}),
+            ('persistent connections', {'POSTGRES_POOL': '0', 'POSTGRES_REPLICA_HOST': 'replica.internal'}),
+        ):
+            with self.subTest(name):
+                databases = self.load_databases(FUNDTRACKER_DB='postgres', **environ).settings
+                aliases = ['default', 'replica'] if 'POSTGRES_REPLICA_HOST' in environ else ['default']
+                self.assertEqual(list(databases), aliases)
+                for alias, database in databases.items():
+                    self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+                    pooled = environ.get('POSTGRES_POOL', '1') == '1'
+                    # Django refuses a pool together with persistent connections
+                    self.assertEqual('pool' in database['OPTIONS'], pooled)
+                    self.assertEqual(database['CONN_MAX_AGE'], 0 if pooled else 600)
+                if 'replica' in databases:
+                    self.assertEqual(databases['replica']['HOST'], 'replica.internal')
+                    self.assertEqual(databases['replica']['TEST']['MIRROR'], 'default')
+                    self.assertIsNot(databases['replica']['OPTIONS'], databases['default']['OPTIONS'])
+
+    @unittest.skipUnless(importlib.util.find_spec('psycopg'), 'psycopg is not installed (requirements-postgres.txt)')
+    def test_postgres_backend_accepts_the_options(self):
+        for environ in ({}, {'POSTGRES_POOL': '0'}):
+            handler = self.load_databases(
+                FUNDTRACKER_DB='postgres', POSTGRES_REPLICA_HOST='replica.internal', **environ
+            )
+            for alias in handler:
+                with self.subTest(alias=alias, **environ):
+                    self.assertEqual(handler[alias].get_connection_params()['dbname'], 'fundtracker')
+
+    def test_unknown_profile(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "FUNDTRACKER_DB must be 'sqlite' or 'postgres'"):
+            self.load_databases(FUNDTRACKER_DB='mysql')
+
+
+# ✅ Read Replicas - The test replica mirrors default, so both aliases see the same rows
+class ReplicaRoutingTests(TransactionTestCase):
+    # Not TestCase: its wrapping transaction would keep every read on the primary
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        call_command('seed_fundtracker', projects=2, stdout=StringIO())
+        self.material = Material.objects.order_by('id').first()
+        user = User.objects.get(username='seed_government_0')
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def queries_by_alias(self, method, path, **kwargs):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.generic(method, path, **kwargs)
+        return response, len(primary), len(replica)
+
+    def write(self):
+        return self.client.patch(
+            f'/api/materials/{self.material.id}/', {'name': 'Renamed'},
+            content_type='application/json', headers=self.auth
+        )
+
+    def test_reads_use_the_replica(self):
+        response, primary, replica = self.queries_by_alias('GET', '/api/projects/', headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_writes_use_the_primary(self):
+        response, primary, replica = self.queries_by_alias(
+            'PATCH', f'/api/materials/{self.material.id}/', data=json.dumps({'name': 'Renamed'}),
+            content_type='application/json', headers=self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_write_pins_reads_to_the_primary(self):
+        response = self.write()
+        self.assertEqual(response.status_code, 200)
+        marker = response[settings.PIN_PRIMARY_HEADER]
+        cookie = response.cookies[settings.PIN_PRIMARY_COOKIE]
+        self.assertEqual(cookie.value, marker)
+        self.assertEqual(cookie['max-age'], settings.READ_YOUR_WRITES_SECONDS)
+
+        # The test client sends the cookie back
+        response, primary, replica = self.queries_by_alias('GET', f'/api/materials/{self.material.id}/')
+        self.assertEqual(response.json()['name'], 'Renamed')
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        # API clients echo the header instead
+        self.client.cookies.clear()
+        _, primary, replica = self.queries_by_alias(
+            'GET', '/api/projects/', headers={settings.PIN_PRIMARY_HEADER: marker}
+        )
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_pin_expires(self):
+        # A marker signed more than READ_YOUR_WRITES_SECONDS ago
+        with mock.patch('time.time', return_value=time.time() - settings.READ_YOUR_WRITES_SECONDS - 1):
+            self.write()
+        _, primary, replica = self.queries_by_alias('GET', '/api/projects/')
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_forged_or_failed_writes_do_not_pin(self):
+        _, primary, _ = self.queries_by_alias(
+            'GET', '/api/projects/', headers={settings.PIN_PRIMARY_HEADER: 'primary:forged:marker'}
+        )
+        self.assertEqual(primary, 0)
+
+        response = self.client.patch(
+            f'/api/materials/{self.material.id}/', {'name': 'Renamed'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn(settings.PIN_PRIMARY_HEADER, response)
+        self.assertNotIn(settings.PIN_PRIMARY_COOKIE, response.cookies)
+
+    def test_router(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Project), 'default')
+        token = replica_reads_allowed.set(True)
+        try:
+            self.assertEqual(router.db_for_read(Project), 'replica')
+            self.assertEqual(router.db_for_write(Project), 'default')
+            with transaction.atomic():
+                self.assertEqual(router.db_for_read(Project), 'default')
+            self.assertEqual(pin_to_primary(lambda: router.db_for_read(Project))(), 'default')
+            self.assertEqual(router.db_for_read(Project), 'replica')
+        finally:
+            replica_reads_allowed.reset(token)
+        self.assertFalse(router.allow_migrate('replica', 'core'))
+
+
+class EventStreamTests(TestCase):
+    def test_refused_under_wsgi(self):
+        response = self.client.get('/api/events/')
+        self.assertEqual(response.status_code, 503)
+
+    async def test_served_under_asgi(self):
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response.status_code, 401)
+
+
+# ✅ Protected Media - Files are served with the API's read permissions
+class MediaTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, MEDIA_SENDFILE_BACKEND=None)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.contractor = ContractorProfile.objects.create(user=User.objects.create(username='builder'))
+        self.certificate = ContractorCertificate.objects.create(
+            contractor=self.contractor,
+            name='Building permit',
+            issuing_authority='Department of Urban Development',
+            issue_date=date(2024, 7, 16),
+            document=ContentFile(b'0123456789' * 10000, name='permit.pdf'),
+        )
+        self.url = settings.MEDIA_URL + self.certificate.document.name
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.contractor.user)}'}
+
+    def auth_for(self, username, role=None):
+        user = User.objects.create(username=username)
+        if role == 'CONTRACTOR':
+            ContractorProfile.objects.create(user=user)
+        if role:
+            UserProfile.objects.create(user=user, role=role)
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+    def test_certificate_readers(self):
+        readers = {
+            'owner': (self.auth, 200),
+            'government': (self.auth_for('official', 'GOVERNMENT'), 200),
+            'auditor': (self.auth_for('auditor', 'AUDITOR'), 200),
+            'other contractor': (self.auth_for('rival', 'CONTRACTOR'), 403),
+            'public': (self.auth_for('resident', 'PUBLIC'), 403),
+            'anonymous': ({}, 401),
+        }
+        for reader, (headers, status) in readers.items():
+            with self.subTest(reader):
+                self.assertEqual(self.client.get(self.url, headers=headers).status_code, status)
+
+    def test_unreferenced_and_outside_files_are_not_found(self):
+        default_storage.save('stray.pdf', ContentFile(b'stray'))
+        for url in (settings.MEDIA_URL + 'stray.pdf', settings.MEDIA_URL + '../settings.py'):
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url, headers=self.auth).status_code, 404)
+
+    def test_ranges(self):
+        cases = {
+            'bytes=0-9': (206, b'0123456789', 'bytes 0-9/100000'),
+            'bytes=99995-': (206, b'56789', 'bytes 99995-99999/100000'),
+            'bytes=-3': (206, b'789', 'bytes 99997-99999/100000'),
+            'bytes=99990-200000': (206, b'0123456789', 'bytes 99990-99999/100000'),
+            'bytes=100000-': (416, b'', 'bytes */100000'),
+            'bytes=5-2': (416, b'', 'bytes */100000'),
+            'bytes=0-1,5-6': (200, b'0123456789' * 10000, None),
+            'items=0-9': (200, b'0123456789' * 10000, None),
+        }
+        for header, (status, body, content_range) in cases.items():
+            with self.subTest(header):
+                response = self.client.get(self.url, headers={**self.auth, 'Range': header})
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(response.getvalue(), body)
+                self.assertEqual(response.get('Content-Range'), content_range)
+                if status != 416:
+                    self.assertEqual(response['Content-Length'], str(len(body)))
+
+    def test_if_range(self):
+        response = self.client.get(self.url, headers=self.auth)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        for if_range, status in ((etag, 206), (last_modified, 206), ('"stale"', 200),
+                                 ('Mon, 01 Jan 2024 00:00:00 GMT', 200)):
+            with self.subTest(if_range):
+                headers = {**self.auth, 'Range': 'bytes=0-9', 'If-Range': if_range}
+                response = self.client.get(self.url, headers=headers)
+                self.assertEqual(response.status_code, status)
+
+    def test_conditional_requests(self):
+        response = self.client.get(self.url, headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        for headers in ({'If-None-Match': etag}, {'If-Modified-Since': last_modified}):
+            with self.subTest(headers):
+                response = self.client.get(self.url, headers={**self.auth, **headers})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+        response = self.client.get(self.url, headers={**self.auth, 'If-None-Match': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='nginx', MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_hands_off_to_nginx(self):
+        response = self.client.get(self.url, headers=self.auth)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.certificate.document.name)
+        self.assertEqual(response.content, b'')
+
+    async def test_streams_under_asgi(self):
+        response = await self.async_client.get(self.url, headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(b''.join(chunks), b'0123456789' * 10000)
+
+
+# ✅ Performance Instrumentation - Server-Timing on sampled requests, /metrics for scrapers only
+class PerformanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=2, stdout=StringIO())
+
+    def test_server_timing_on_sampled_requests(self):
+        with override_settings(PERFORMANCE_SAMPLE_RATE=1.0):
+            response = self.client.get('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        phases = dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+        self.assertEqual(list(phases), ['db', 'auth', 'serialize', 'render', 'total'])
+        self.assertRegex(phases['db'], r'^dur=\d+\.\d;desc="[1-9]\d* queries"$')
+        with override_settings(PERFORMANCE_SAMPLE_RATE=0):
+            self.assertNotIn('Server-Timing', self.client.get('/api/projects/'))
+
+    def bucket_count(self, body, metric, route):
+        match = re.search(rf'^{metric}_count{{method="GET",route="{route}"}} (\d+)$', body, re.M)
+        return int(match.group(1)) if match else 0
+
+    def test_metrics_count_every_request(self):
+        metric = 'fundtracker_request_duration_seconds'
+        before = self.bucket_count(self.client.get('/metrics').content.decode(), metric, 'project-list')
+        with override_settings(PERFORMANCE_SAMPLE_RATE=0):
+            self.client.get('/api/projects/')
+            self.client.get('/api/projects/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.content.decode()
+        self.assertEqual(self.bucket_count(body, metric, 'project-list'), before + 2)
+        self.assertIn(f'{metric}_bucket{{method="GET",route="project-list",le="+Inf"}} {before + 2}', body)
+        self.assertIn('# TYPE fundtracker_request_queries histogram', body)
+
+    def test_metrics_access_by_address(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='203.0.113.7').status_code, 404)
+        # A local reverse proxy connects from 127.0.0.1 on behalf of anyone
+        response = self.client.get('/metrics', headers={'X-Forwarded-For': '203.0.113.7'})
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_access_by_token(self):
+        for headers, status in (
+            ({}, 404),
+            ({'Authorization': 'Bearer wrong'}, 404),
+            ({'Authorization': 'Bearer scrape-secret'}, 200),
+            ({'Authorization': 'Bearer scrape-secret', 'X-Forwarded-For': '203.0.113.7'}, 200),
+        ):
+            with self.subTest(headers):
+                response = self.client.get('/metrics', REMOTE_ADDR='203.0.113.7', headers=headers)
+                self.assertEqual(response.status_code, status)
+
+
+# ✅ Request Profiling - Only privileged ?_profile requests are profiled, and the admin shows them
+class ProfilingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_fundtracker', projects=2, stdout=StringIO())
+
+    def setUp(self):
+        profile_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profile_root)
+        settings_override = override_settings(PROFILE_ROOT=profile_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def auth(self, username):
+        return {'Authorization': f'Bearer {AccessToken.for_user(User.objects.get(username=username))}'}
+
+    def profile(self, path='/api/projects/?_profile=1', **headers):
+        response = self.client.get(path, headers=headers)
+        if 'X-Profile-Id' not in response:
+            return None
+        return RequestProfile.objects.get(pk=response['X-Profile-Id'])
+
+    def test_token_gating(self):
+        with mock.patch('time.time', return_value=time.time() - settings.PROFILE_TOKEN_MAX_AGE - 1):
+            expired = profiling.profile_token()
+        for name, headers, allowed in (
+            ('anonymous', {}, False),
+            ('public', self.auth('seed_public_0'), False),
+            ('contractor', self.auth('seed_contractor_0'), False),
+            ('government', self.auth('seed_government_0'), True),
+            ('auditor', self.auth('seed_auditor_0'), True),
+            ('profile token', {settings.PROFILE_HEADER: profiling.profile_token()}, True),
+            ('expired token', {settings.PROFILE_HEADER: expired}, False),
+            ('forged token', {settings.PROFILE_HEADER: 'profile:forged:token'}, False),
+            ('invalid access token', {'Authorization': 'Bearer forged'}, False),
+        ):
+            with self.subTest(name):
+                self.assertEqual(self.profile(**headers) is not None, allowed)
+        self.assertIsNone(self.profile('/api/projects/', **self.auth('seed_government_0')))
+        self.assertIsNone(self.profile('/api/projects/?_profile=0', **self.auth('seed_government_0')))
+        self.assertEqual(RequestProfile.objects.count(), 3)
+
+        out = StringIO()
+        call_command('profile_token', stdout=out, stderr=StringIO())
+        name, token = out.getvalue().strip().split(': ')
+        self.assertEqual(name, settings.PROFILE_HEADER)
+        self.assertIsNotNone(self.profile(**{name: token}))
+
+    def test_saves_the_profile(self):
+        record = self.profile(**self.auth('seed_government_0'))
+        self.assertEqual(
+            (record.mode, record.method, record.route, record.status), ('SAMPLE', 'GET', 'project-list', 200)
+        )
+        self.assertEqual(record.user.username, 'seed_government_0')
+        self.assertGreater(record.queries, 0)
+        self.assertTrue(os.path.exists(os.path.join(record.directory, 'stacks.folded')))
+        data = record.load()
+        self.assertEqual(len(data['sql']), record.queries)
+        self.assertIn('ProjectSerializer.progress', [row['field'] for row in data['fields']])
+
+        record = self.profile('/api/projects/?_profile=cprofile', **self.auth('seed_government_0'))
+        self.assertEqual(record.mode, 'CPROFILE')
+        self.assertTrue(os.path.exists(os.path.join(record.directory, 'cprofile.prof')))
+        self.assertTrue(record.load()['functions'])
+
+    async def test_profiles_async_views(self):
+        token = await sync_to_async(profiling.profile_token)()
+        response = await self.async_client.get(
+            '/api/public/projects/?_profile=cprofile', headers={settings.PROFILE_HEADER: token}
+        )
+        record = await RequestProfile.objects.aget(pk=response['X-Profile-Id'])
+        # cProfile only sees the event loop thread; the sampler watches them all
+        self.assertEqual((record.mode, record.route), ('SAMPLE', 'public-project-list'))
+
+    @override_settings(PROFILE_RING_SIZE=2)
+    def test_keeps_the_newest(self):
+        auth = self.auth('seed_auditor_0')
+        records = [self.profile(**auth) for _ in range(3)]
+        self.assertEqual(
+            list(RequestProfile.objects.order_by('id').values_list('id', flat=True)),
+            [record.id for record in records[1:]]
+        )
+        self.assertFalse(os.path.exists(records[0].directory))
+        self.assertTrue(os.path.exists(records[2].directory))
+
+    def test_admin(self):
+        record = self.profile(**self.auth('seed_government_0'))
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        response = self.client.get(reverse('admin:core_requestprofile_changelist'))
+        self.assertContains(response, '/api/projects/?_profile=1')
+
+        response = self.client.get(reverse('admin:core_requestprofile_change', args=[record.id]))
+        self.assertContains(response, 'ProjectSerializer.progress')
+        self.assertContains(response, 'FROM &quot;core_project&quot;')
+        self.assertContains(response, reverse('admin:core_requestprofile_stacks', args=[record.id]))
+
+        response = self.client.get(reverse('admin:core_requestprofile_stacks', args=[record.id]))
+        self.assertEqual(
+            response['Content-Disposition'], f'attachment; filename="profile-{record.id}-stacks.folded"'
+        )
+        with open(os.path.join(record.directory, 'stacks.folded'), 'rb') as f:
+            self.assertEqual(b''.join(response.streaming_content), f.read())
+
+
+# ✅ Bulk NID Verification - Registry index and the profiles each run checks
+class NidRegistryTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.extract = os.path.join(self.directory, 'registry.csv')
+        self.index_path = f'{self.extract}.index.sqlite3'
+        self.write_extract(['name,nid', 'Sita,01-05-12345678', 'Ram,270112345678', 'Hari,not-an-nid'])
+
+    def write_extract(self, lines):
+        with open(self.extract, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def build(self):
+        index, read, skipped = RegistryIndex.build(self.extract, self.index_path)
+        self.addCleanup(index.close)
+        return index, read, skipped
+
+    def profile(self, username, nid):
+        return UserProfile.objects.create(user=User.objects.create(username=username), nepal_nid=nid)
+
+    def test_nid_key(self):
+        self.assertEqual(nid_key('01-05-12345678'), 10512345678)
+        self.assertEqual(nid_key(' 010512345678 '), 10512345678)
+        for value in (None, '', '01-05-1234567', '01/05/12345678', 'AB-05-12345678'):
+            with self.subTest(value):
+                self.assertIsNone(nid_key(value))
+
+    def test_index_is_reused_until_the_extract_changes(self):
+        index, read, skipped = self.build()
+        self.assertEqual((len(index), read, skipped), (2, 3, 1))
+        self.assertEqual(index.lookup([10512345678, 270112345678, 10512345679]), {10512345678, 270112345678})
+        reopened = RegistryIndex.open(self.extract, self.index_path)
+        self.assertIsNotNone(reopened)
+        reopened.close()
+        self.write_extract(['name,nid', 'Sita,01-05-12345678'])
+        self.assertIsNone(RegistryIndex.open(self.extract, self.index_path))
+        self.assertIsNone(RegistryIndex.open(self.extract, os.path.join(self.directory, 'missing.sqlite3')))
+
+    def test_rejects_an_extract_without_the_column(self):
+        with self.assertRaises(RegistryError):
+            RegistryIndex.build(self.extract, self.index_path, column='citizenship')
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_checks_new_profiles_and_rechecks_on_request(self):
+        index, _, _ = self.build()
+        listed = self.profile('sita', '01-05-12345678')
+        unlisted = self.profile('gita', '02-03-87654321')
+        self.assertEqual(list(verify(index, profiles_to_check(), batch_size=1)), [(1, 1), (1, 0)])
+        listed.refresh_from_db()
+        unlisted.refresh_from_db()
+        self.assertTrue(listed.nid_verified)
+        self.assertFalse(unlisted.nid_verified)
+        self.assertIsNotNone(unlisted.nid_checked_at)
+        self.assertFalse(profiles_to_check().exists())
+        self.assertEqual(list(profiles_to_check(recheck=True)), [unlisted])
+
+    def test_changing_the_nid_clears_the_stamp(self):
+        index, _, _ = self.build()
+        profile = self.profile('gita', '02-03-87654321')
+        list(verify(index, profiles_to_check()))
+        profile.refresh_from_db()
+        profile.role = 'AUDITOR'
+        profile.save()
+        self.assertIsNotNone(profile.nid_checked_at)
+        profile.nepal_nid = '01-05-12345678'
+        profile.save()
+        self.assertEqual(list(profiles_to_check()), [profile])
+
+    def test_leaves_profiles_whose_nid_changes_mid_run(self):
+        index, _, _ = self.build()
+        listed = self.profile('sita', '01-05-12345678')
+        unlisted = self.profile('gita', '02-03-87654321')
+        lookup = index.lookup
+
+        def lookup_while_users_edit(keys):
+            for profile, nid in ((listed, '03-04-11111111'), (unlisted, '27-01-12345678')):
+                profile.nepal_nid = nid
+                profile.save()
+            return lookup(keys)
+
+        with mock.patch.object(index, 'lookup', lookup_while_users_edit):
+            self.assertEqual(list(verify(index, profiles_to_check())), [(2, 1)])
+        self.assertEqual(set(profiles_to_check()), {listed, unlisted})
+        self.assertFalse(UserProfile.objects.filter(nid_verified=True).exists())
@@ -0,0 +1,223 @@
+"""
+✅ Fast Lists - Read-only list output built from ``.values()`` rows
+
+A ModelSerializer list builds a model instance per row and then runs
+``get_attribute``/``to_representation`` for every field. ValuesSerializer
+reads the same serializer's fields once and turns them into a plan: the
+``.values()`` lookups to fetch (``user.username`` becomes the join
+``user__username``), a converter per field, and one extra query per nested
+``many=True`` serializer of a reverse relation. Rows come out as the same
+dicts, in the same key order, so the JSON is identical; the parity suite in
+core.tests holds every opted-in viewset to that.
+
+Supported fields are model columns, columns across forward relations,
+primary-key relations, properties of the model (evaluated against the
+fetched row, so they may only read serialized columns) and nested
+serializers of reverse foreign keys. Anything else, e.g. a
+SerializerMethodField, raises ImproperlyConfigured; keep such viewsets on
+the regular path.
+
+Viewsets opt in with ValuesListMixin, which only replaces ``list``.
+"""
+import datetime
+import decimal
+from collections import defaultdict
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import ForeignObjectRel
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .performance import timed
+
+ISO_8601 = 'iso-8601'
+SKIP = object()  # the key is left out of the row, like DRF's SkipField
+
+
+def datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime.datetime) or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+    # DecimalField.quantize copies the context on every call; do it once
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    quantum = decimal.Decimal('.1') ** field.decimal_places
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            return field.to_representation(value)
+        return f'{value.quantize(quantum, rounding=field.rounding, context=context):f}'
+    return convert
+
+
+def file_converter(field, model_field):
+    if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+        return None
+    storage = model_field.storage
+    request = field.context.get('request')
+
+    def convert(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+def converter(field, model_field):
+    """Turns a fetched value into the field's output; None means use it as is"""
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return None if field.pk_field is None else field.pk_field.to_representation
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_converter(field)
+    if isinstance(field, serializers.DecimalField):
+        return decimal_converter(field)
+    if isinstance(field, serializers.FileField):
+        return file_converter(field, model_field)
+    if isinstance(field, serializers.RelatedField):
+        raise ImproperlyConfigured(f'{field.__class__.__name__} needs model instances')
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Renders the read output of a bound ModelSerializer (``.child`` of a
+    many=True one) from a queryset of the serializer's model.
+    """
+
+    def __init__(self, serializer):
+        self.model = serializer.Meta.model
+        self.lookups = {}  # values() lookups, as an ordered set
+        self.columns = []  # (output name, row key, converter, nullable relation keys, value when one is None)
+        self.properties = []  # (row key, property getter)
+        self.nested = []  # (row key, ValuesSerializer, reverse foreign key name)
+        for name, field in serializer.fields.items():
+            if not field.write_only:
+                self.add_field(name, field)
+        if self.nested:
+            self.lookups['pk'] = None
+
+    def add_field(self, name, field):
+        attrs = field.source_attrs
+        model, relation_keys = self.model, []
+        for depth, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                model_field = None
+            last = depth == len(attrs) - 1
+            if last and model_field is None and isinstance(getattr(model, attr, None), property):
+                if len(attrs) > 1:
+                    break
+                self.properties.append((attr, getattr(model, attr).fget))
+                self.columns.append((name, attr, converter(field, None), (), None))
+                return
+            if last and isinstance(model_field, ForeignObjectRel):
+                self.add_nested(name, field, model_field)
+                return
+            if model_field is None or model_field.many_to_many or isinstance(model_field, ForeignObjectRel):
+                break
+            if last:
+                key = '__'.join(attrs)
+                self.lookups[key] = None
+                for relation_key in relation_keys:
+                    self.lookups[relation_key] = None
+                self.columns.append((name, key, converter(field, model_field), tuple(relation_keys), self.missing(field)))
+                return
+            if not model_field.is_relation:
+                break
+            if model_field.null:
+                relation_keys.append('__'.join(attrs[:depth + 1]))
+            model = model_field.related_model
+        raise ImproperlyConfigured(
+            f'{self.model.__name__}.{field.source} ({name}) cannot be read from .values() rows'
+        )
+
+    def add_nested(self, name, field, relation):
+        if not (isinstance(field, serializers.ListSerializer)
+                and isinstance(field.child, serializers.ModelSerializer)
+                and relation.one_to_many):
+            raise ImproperlyConfigured(f'{name}: only many=True serializers of reverse foreign keys are supported')
+        child = ValuesSerializer(field.child)
+        child.lookups[relation.field.name] = None
+        self.nested.append((name, child, relation.field.name))
+        self.columns.append((name, name, None, (), None))
+
+    @staticmethod
+    def missing(field):
+        """What DRF's Field.get_attribute returns when a relation on the way is None"""
+        if field.default is not empty:
+            return field.get_default()
+        if field.allow_null:
+            return None
+        return SKIP
+
+    def rows(self, queryset):
+        # values() ignores select_related; prefetches would be wasted
+        return list(queryset.prefetch_related(None).values(*self.lookups))
+
+    def serialize(self, queryset):
+        with timed('serialize'):
+            return self.render(self.rows(queryset))
+
+    def render(self, rows):
+        for key, getter in self.properties:
+            for row in rows:
+                row[key] = getter(SimpleNamespace(**row))
+        for key, child, parent_field in self.nested:
+            manager = child.model._default_manager
+            child_rows = child.rows(
+                manager.filter(**{f'{parent_field}__in': [row['pk'] for row in rows]})
+                .order_by(*(child.model._meta.ordering or ['pk']))
+            )
+            by_parent = defaultdict(list)
+            for child_row, item in zip(child_rows, child.render(child_rows)):
+                by_parent[child_row[parent_field]].append(item)
+            for row in rows:
+                row[key] = by_parent.get(row['pk'], [])
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, key, convert, relation_keys, missing in self.columns:
+                if relation_keys and any(row[relation_key] is None for relation_key in relation_keys):
+                    if missing is not SKIP:
+                        item[name] = missing
+                    continue
+                value = row[key]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+class ValuesListMixin:
+    """
+    ✅ Fast Lists - Opt a viewset's ``list`` into ValuesSerializer.
+    Paginated viewsets, or use_values_list = False, keep the regular path.
+    """
+    use_values_list = True
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_list or self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = ValuesSerializer(self.get_serializer(many=True).child)
+        return Response(serializer.serialize(queryset))
@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,11 +50,14 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'core.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -84,12 +91,90 @@ WSGI_APPLICATION = 'fundtracker.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# ✅ Database Profile - Chosen with FUNDTRACKER_DB=sqlite (default) or postgres
+
+DATABASE_PROFILE = os.environ.get('FUNDTRACKER_DB', 'sqlite')
+
+if DATABASE_PROFILE == 'postgres':
+    # Requires psycopg 3 with its pool: pip install -r requirements-postgres.txt
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'fundtracker'),
+            'USER': os.environ.get('POSTGRES_USER', 'fundtracker'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    if os.environ.get('POSTGRES_REPLICA_HOST'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': os.environ['POSTGRES_REPLICA_HOST'],
+            'PORT': os.environ.get('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+            'OPTIONS': {},
+            'TEST': {'MIRROR': 'default'},
+        }
+    if os.environ.get('POSTGRES_POOL', '1') == '1':
+        # One pool per process; connections are reused across requests and threads
+        for alias in DATABASES:
+            DATABASES[alias]['OPTIONS']['pool'] = {
+                'min_size': int(os.environ.get('POSTGRES_POOL_MIN', 2)),
+                'max_size': int(os.environ.get('POSTGRES_POOL_MAX', 10)),
+                'timeout': 10,
+            }
+    else:
+        # Persistent per-thread connections, e.g. behind pgbouncer
+        for alias in DATABASES:
+            DATABASES[alias]['CONN_MAX_AGE'] = int(os.environ.get('POSTGRES_CONN_MAX_AGE', 600))
+elif DATABASE_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # Wait for a competing writer instead of failing with "database is locked"
+                'timeout': 20,
+                # Take the write lock when the transaction starts, so a read that
+                # turns into a write cannot deadlock against another writer
+                'transaction_mode': 'IMMEDIATE',
+                # Run on every new connection: readers no longer block the writer,
+                # commits fsync at checkpoints only, and reads use a 256 MB mmap
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA mmap_size=268435456;'
+                ),
+            },
+        }
+    }
+    if os.environ.get('FUNDTRACKER_READ_REPLICA', '1') == '1':
+        # Development stand-in for a replica: a read-only connection to the same file
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': f"file:{BASE_DIR / 'db.sqlite3'}?mode=ro",
+            'OPTIONS': {
+                'uri': True,
+                'timeout': 20,
+                'init_command': 'PRAGMA mmap_size=268435456;',
+            },
+            'TEST': {'MIRROR': 'default'},
+        }
+else:
+    raise ImproperlyConfigured(f"FUNDTRACKER_DB must be 'sqlite' or 'postgres', not {DATABASE_PROFILE!r}")
+
+# ✅ Read Replicas - Safe-method requests read from DATABASES['replica'] when
+# configured, unless the client wrote within READ_YOUR_WRITES_SECONDS
+DATABASE_ROUTERS = ['core.db_routers.PrimaryReplicaRouter']
+READ_YOUR_WRITES_SECONDS = 10
+PIN_PRIMARY_COOKIE = 'pin_primary'
+PIN_PRIMARY_HEADER = 'X-Pin-Primary'
+
+# Let the React app (another origin) read the marker and send it back
+CORS_ALLOW_HEADERS = (*default_headers, 'x-pin-primary', 'x-profile-token')
+CORS_EXPOSE_HEADERS = ['X-Pin-Primary', 'Server-Timing', 'X-Profile-Id']
 
 
 
@@ -141,11 +226,23 @@ MEDIA_ROOT = BASE_DIR / "media"
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.TimedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
+    # ✅ Fast Rendering - orjson by default, MessagePack on request
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'core.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 # Simple JWT settings
@@ -159,3 +256,126 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+
+# ✅ Duplicate Photo Detection - Max Hamming distance (0-7) between perceptual
+# hashes for two photos to be flagged as near-duplicates
+IMAGE_DUPLICATE_MAX_DISTANCE = 6
+
+# ✅ Deduplicated Uploads - Identical uploads are stored once under MEDIA_ROOT/blobs/
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# ✅ Resumable Uploads - Partial uploads are kept outside MEDIA_ROOT until finalized
+CHUNKED_UPLOAD_DIR = BASE_DIR / "upload_sessions"
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB per PUT
+CHUNKED_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024  # 2 GB per file
+CHUNKED_UPLOAD_EXPIRY_HOURS = 48
+
+# ✅ Protected Media - How permission-checked media bytes are delivered:
+#   None       - streamed by Django (development only)
+#   'nginx'    - X-Accel-Redirect to MEDIA_ACCEL_REDIRECT_PREFIX (an `internal` location)
+#   'sendfile' - X-Sendfile with the absolute path (Apache mod_xsendfile, lighttpd)
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+
+# ✅ Open Data - Columnar snapshots written by `manage.py export_open_data`,
+# served as static files by the front web server
+OPEN_DATA_ROOT = BASE_DIR / "open_data"
+OPEN_DATA_URL = "/open-data/"
+
+# Nepal's fiscal year starts on Shrawan 1 (mid-July)
+FISCAL_YEAR_START_MONTH = 7
+FISCAL_YEAR_START_DAY = 16
+
+# ✅ Public Snapshot - Pre-rendered, pre-compressed JSON for the public dashboard.
+# Writes queue touched projects; `publish_public_snapshot --watch` publishes
+# them this many seconds after the first write (None stops queueing).
+PUBLIC_SNAPSHOT_ROOT = BASE_DIR / "public_snapshot"
+PUBLIC_SNAPSHOT_URL = "/public-snapshot/"
+PUBLIC_SNAPSHOT_DEBOUNCE_SECONDS = 30
+# Brotli quality for queued publishes; full rebuilds by the command use 11
+PUBLIC_SNAPSHOT_BROTLI_QUALITY = 5
+
+# ✅ Incremental Sync - /api/sync/ paging and deletion history
+SYNC_PAGE_SIZE = 500  # rows per feed per request
+# Hold back rows this fresh, their transaction may still be open. A write
+# transaction that takes longer than this to commit can be missed by clients
+# that sync meanwhile (see core.sync), so keep transactions shorter.
+SYNC_SETTLE_SECONDS = 5
+SYNC_TOMBSTONE_RETENTION_DAYS = 30  # older cursors must sync from scratch
+
+# ✅ Live Activity - Server-sent events at /api/events/ (served by fundtracker.asgi)
+EVENT_STREAM_BROKER = "core.events.InProcessBroker"
+EVENT_STREAM_REPLAY_SIZE = 500  # recent events replayed to reconnecting clients
+EVENT_STREAM_QUEUE_SIZE = 1000  # a connection further behind than this is closed
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+
+# ✅ Performance Instrumentation - Fraction of requests that get a Server-Timing
+# header and a `core.performance` log line (0 disables; /metrics histograms
+# count every request). /metrics needs `Authorization: Bearer <METRICS_TOKEN>`
+# when a token is set, otherwise it answers METRICS_ALLOWED_IPS, which a
+# reverse proxy on the same host would match, see core.metrics_views.
+PERFORMANCE_SAMPLE_RATE = float(os.environ.get('FUNDTRACKER_PERF_SAMPLE_RATE', '1.0' if DEBUG else '0.05'))
+METRICS_TOKEN = os.environ.get('FUNDTRACKER_METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# ✅ N+1 Detection - A SELECT repeated this many times in one instrumented
+# request is logged as an N+1 (raised instead under `manage.py test`)
+NPLUSONE_THRESHOLD = 5
+NPLUSONE_RAISE = False
+TEST_RUNNER = 'core.test_runner.FundtrackerTestRunner'
+
+# ✅ Request Profiling - `?_profile=1` from a government/auditor token, or with
+# a PROFILE_HEADER printed by `manage.py profile_token`. The newest
+# PROFILE_RING_SIZE profiles are kept under PROFILE_ROOT (see the admin).
+PROFILE_ROOT = BASE_DIR / "request_profiles"
+PROFILE_RING_SIZE = 100
+PROFILE_SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_TOKEN_MAX_AGE = 60 * 60  # seconds a profile_token stays valid
+
+# ✅ Response Compression - Encodings in order of preference when the client
+# accepts several equally (zstd needs `pip install zstandard`). HTML is not
+# compressed: admin pages carry CSRF tokens (BREACH).
+COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']
+COMPRESSION_LEVELS = {'zstd': 3, 'br': 4, 'gzip': 6}
+COMPRESSION_MIN_SIZE = 1024  # bytes; smaller bodies are not worth the CPU
+COMPRESSION_STREAM_FLUSH_BYTES = 64 * 1024  # streamed input held back before a flush
+COMPRESSION_CONTENT_TYPES = [
+    'application/json',
+    'application/msgpack',
+    'application/x-ndjson',
+    'text/csv',
+    'text/plain',
+]
+
+# ✅ Full-Text Search - /api/search/ over SearchEntry (see core.search)
+SEARCH_RESULT_LIMIT = 20  # results when the request has no ?limit
+SEARCH_MAX_RESULTS = 100
+SEARCH_MAX_TERMS = 8  # query words beyond this are ignored
+SEARCH_RANK_WINDOW = 1000  # newest matches ranked per query; bounds broad queries
+
+# ✅ Project Map - Offline geocoding and map queries (see core.geo)
+GAZETTEER_PATH = BASE_DIR / 'core' / 'data' / 'nepal_gazetteer.csv'
+GEO_MAX_COVER_CELLS = 16  # geohash cells (index ranges) covering a bounding box
+GEO_MAX_RESULTS = 500  # projects per bbox/near response; zoom out to the grid beyond this
+GEO_NEAR_DEFAULT_KM = 10
+GEO_NEAR_MAX_KM = 200
+GEO_DEFAULT_ZOOM = 7  # grid zoom when the request has none: all of Nepal
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
@@ -1,13 +1,22 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.media_views import MediaView
+from core.metrics_views import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("core.api_urls")),
     path("api/auth/", include("core.auth_urls")),
+    # ✅ Protected Media - Permission-checked in every environment
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$", MediaView.as_view(), name="media"),
+    # ✅ Performance Instrumentation - Prometheus histograms, local scrapers only
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # Public open-data and dashboard snapshots; served by the front web server in production
+    urlpatterns += static(settings.OPEN_DATA_URL, document_root=settings.OPEN_DATA_ROOT)
+    urlpatterns += static(settings.PUBLIC_SNAPSHOT_URL, document_root=settings.PUBLIC_SNAPSHOT_ROOT)
@@ -4,3 +4,12 @@ export const getAuditLogs = async () => {
   const response = await api.get('/audit-logs/');
   return response.data;
 };
+
+// ✅ Audit Export - filters: { start, end, model_name, action }, format: "ndjson" | "csv"
+export const exportAuditLogs = async (filters = {}, format = 'csv') => {
+  const response = await api.get('/audit-logs/export/', {
+    params: { ...filters, export_format: format },
+    responseType: 'blob',
+  });
+  return response.data;
+};
@@ -4,6 +4,10 @@ const api = axios.create({
   baseURL: "http://127.0.0.1:8000/api/",
 });
 
+// ✅ Read Replicas - After a write the server returns a short-lived marker;
+// sending it back keeps our reads on the primary so we see our own changes
+let pinPrimary = null;
+
 // Add request interceptor to include token
 api.interceptors.request.use(
   (config) => {
@@ -11,6 +15,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (pinPrimary) {
+      config.headers['X-Pin-Primary'] = pinPrimary;
+    }
     return config;
   },
   (error) => {
@@ -21,6 +28,9 @@ api.interceptors.request.use(
 // Add response interceptor to handle 401 errors
 api.interceptors.response.use(
   (response) => {
+    if (response.headers['x-pin-primary']) {
+      pinPrimary = response.headers['x-pin-primary'];
+    }
     return response;
   },
   (error) => {
@@ -1,4 +1,5 @@
 import api from "./axios";
+import { cacheRow, syncFeed } from "./sync.api";
 
 // Contractor Profile APIs
 export const getContractorProfiles = async () => {
@@ -44,18 +45,25 @@ export const createContractorSkill = async (data) => {
 };
 
 // Contractor Rating APIs
+// ✅ Incremental Sync - Served from the sync cache, which only fetches changes
 export const getContractorRatings = async () => {
-  const response = await api.get("contractor-ratings/");
-  return response.data;
+  try {
+    return await syncFeed("contractor_ratings");
+  } catch (error) {
+    const response = await api.get("contractor-ratings/");
+    return response.data;
+  }
 };
 
 export const createContractorRating = async (data) => {
   const response = await api.post("contractor-ratings/", data);
+  cacheRow("contractor_ratings", response.data);
   return response.data;
 };
 
 export const verifyContractorRating = async (id) => {
   const response = await api.post(`contractor-ratings/${id}/verify/`);
+  cacheRow("contractor_ratings", response.data.rating);
   return response.data;
 };
 
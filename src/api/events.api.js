@@ -0,0 +1,36 @@
+// ✅ Live Activity - Server-sent review events (government and auditor users)
+const EVENTS_URL = "http://127.0.0.1:8000/api/events/";
+
+export const ACTIVITY_EVENTS = [
+  "progress.submitted",
+  "progress.approved",
+  "progress.rejected",
+  "issue.reported",
+  "issue.status_changed",
+  "contractor.suspended",
+];
+
+// Refresh interval when the backend cannot stream (served over WSGI: 503)
+const POLL_INTERVAL_MS = 30000;
+
+// Calls onEvent(type, data) for each event; returns a function that closes the stream.
+// EventSource reconnects by itself and resumes from the last event it received.
+// If the server refuses the stream, it closes for good and onEvent() is
+// called without arguments every POLL_INTERVAL_MS instead.
+export const subscribeToActivity = (onEvent) => {
+  const token = localStorage.getItem("token");
+  const source = new EventSource(`${EVENTS_URL}?token=${encodeURIComponent(token)}`);
+  let poller = null;
+  ACTIVITY_EVENTS.forEach((type) => {
+    source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)));
+  });
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED && poller === null) {
+      poller = setInterval(() => onEvent(), POLL_INTERVAL_MS);
+    }
+  };
+  return () => {
+    source.close();
+    clearInterval(poller);
+  };
+};
@@ -1,9 +1,15 @@
 import api from "./axios";
+import { cacheRow, syncFeed } from "./sync.api";
 
 // Issue Report APIs
+// ✅ Incremental Sync - Served from the sync cache, which only fetches changes
 export const getIssues = async () => {
-  const response = await api.get("issues/");
-  return response.data;
+  try {
+    return await syncFeed("issues");
+  } catch (error) {
+    const response = await api.get("issues/");
+    return response.data;
+  }
 };
 
 export const getIssueById = async (id) => {
@@ -13,27 +19,31 @@ export const getIssueById = async (id) => {
 
 export const createIssue = async (data) => {
   const response = await api.post("issues/", data);
+  cacheRow("issues", response.data);
   return response.data;
 };
 
 export const verifyIssue = async (id) => {
   const response = await api.post(`issues/${id}/verify/`);
+  cacheRow("issues", response.data);
   return response.data;
 };
 
 export const forgiveIssue = async (id, reason) => {
   const response = await api.post(`issues/${id}/forgive/`, { reason });
+  cacheRow("issues", response.data);
   return response.data;
 };
 
 export const penalizeIssue = async (id) => {
   const response = await api.post(`issues/${id}/penalize/`);
+  cacheRow("issues", response.data.issue);
   return response.data;
 };
 
 // Get project issues via project endpoint
 export const getProjectIssues = async (projectId) => {
-  const response = await api.get(`projects/${projectId}/issues/`);
+  const response = await api.get(`public/projects/${projectId}/issues/`);
   return response.data;
 };
 
@@ -35,6 +35,6 @@ export const createMaterialPayment = async (data) => {
 
 // Get project materials via project endpoint
 export const getProjectMaterials = async (projectId) => {
-  const response = await api.get(`projects/${projectId}/materials/`);
+  const response = await api.get(`public/projects/${projectId}/materials/`);
   return response.data;
 };
@@ -1,14 +1,34 @@
 import api from "./axios";
 
+// ✅ Async Read Path - Reads use the async public routes (same payloads)
 export const getProjects = async () => {
-  const response = await api.get("projects/");
+  const response = await api.get("public/projects/");
   return response.data;
 };
 
 export const getProjectById = async (id) => {
-  const response = await api.get(`projects/${id}/`);
+  const response = await api.get(`public/projects/${id}/`);
   return response.data;
 };
 
+// ✅ Public Snapshot - Pre-rendered project list, falls back to the API
+const PUBLIC_SNAPSHOT_URL = "http://127.0.0.1:8000/public-snapshot/";
+
+export const getPublicProjects = async () => {
+  try {
+    const manifest = await fetch(`${PUBLIC_SNAPSHOT_URL}manifest.json`, { cache: "no-cache" });
+    if (!manifest.ok) throw new Error(`Snapshot manifest: ${manifest.status}`);
+    const { files, project_list: shards } = await manifest.json();
+    const pages = await Promise.all(shards.map(async (name) => {
+      const response = await fetch(`${PUBLIC_SNAPSHOT_URL}${files[name]}`);
+      if (!response.ok) throw new Error(`Snapshot projects: ${response.status}`);
+      return response.json();
+    }));
+    return pages.flat();
+  } catch (error) {
+    return getProjects();
+  }
+};
+
 // Deprecated: Use getProjects instead
 export const fetchProjects = getProjects;
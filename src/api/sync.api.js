@@ -0,0 +1,65 @@
+import api from "./axios";
+
+// ✅ Incremental Sync - Keep a local copy of public data and fetch only changes
+const CACHE_KEY = "syncCache";
+
+const loadCache = () => {
+  try {
+    return JSON.parse(localStorage.getItem(CACHE_KEY)) || { cursor: null, feeds: {} };
+  } catch (error) {
+    return { cursor: null, feeds: {} };
+  }
+};
+
+const applyChanges = (cache, data) => {
+  Object.entries(data.changes).forEach(([feed, rows]) => {
+    const current = cache.feeds[feed] || {};
+    rows.forEach((row) => {
+      current[row.id] = row;
+    });
+    cache.feeds[feed] = current;
+  });
+  Object.entries(data.deleted).forEach(([feed, ids]) => {
+    ids.forEach((id) => {
+      if (cache.feeds[feed]) delete cache.feeds[feed][id];
+    });
+  });
+  cache.cursor = data.cursor;
+};
+
+// Bring the cache up to date; returns { projects: [...], funds: [...], ... }
+// Rows changed in the last few seconds (SYNC_SETTLE_SECONDS) arrive on a later
+// sync, so write helpers put their response into the cache with cacheRow.
+export const syncAll = async () => {
+  let cache = loadCache();
+  let hasMore = true;
+  while (hasMore) {
+    try {
+      const response = await api.get("sync/", { params: cache.cursor ? { since: cache.cursor } : {} });
+      applyChanges(cache, response.data);
+      hasMore = response.data.has_more;
+    } catch (error) {
+      if (error.response?.status !== 410 || !cache.cursor) throw error;
+      // Cursor older than the server's deletion history: start over
+      cache = { cursor: null, feeds: {} };
+    }
+  }
+  localStorage.setItem(CACHE_KEY, JSON.stringify(cache));
+  return Object.fromEntries(
+    Object.entries(cache.feeds).map(([feed, rows]) => [feed, Object.values(rows)])
+  );
+};
+
+// One feed of syncAll(), e.g. syncFeed("issues")
+export const syncFeed = async (feed) => (await syncAll())[feed] || [];
+
+// Store a row returned by a write, so it shows before the next sync brings it
+export const cacheRow = (feed, row) => {
+  const cache = loadCache();
+  if (!cache.cursor) return;
+  cache.feeds[feed] = { ...cache.feeds[feed], [row.id]: row };
+  localStorage.setItem(CACHE_KEY, JSON.stringify(cache));
+};
+
+// The feeds depend on who is signed in (ratings are for signed-in users only)
+export const clearSyncCache = () => localStorage.removeItem(CACHE_KEY);
@@ -0,0 +1,64 @@
+import api from "./axios";
+
+// ✅ Resumable Uploads - Large evidence files (videos) sent in chunks
+const CHUNK_SIZE = 4 * 1024 * 1024;
+const MAX_RETRIES = 5;
+
+export const createUploadSession = async (data) => {
+  const response = await api.post("upload-sessions/", data);
+  return response.data;
+};
+
+export const getUploadSession = async (id) => {
+  const response = await api.get(`upload-sessions/${id}/`);
+  return response.data;
+};
+
+const sendChunk = (session, file, start) => {
+  const end = Math.min(start + CHUNK_SIZE, file.size) - 1;
+  return api.put(`upload-sessions/${session.id}/chunk/`, file.slice(start, end + 1), {
+    headers: {
+      "Content-Type": "application/octet-stream",
+      "Content-Range": `bytes ${start}-${end}/${file.size}`,
+    },
+  });
+};
+
+// target is "ISSUE_EVIDENCE" (parent = issue id) or "RATING_EVIDENCE" (parent = rating id).
+// Pass a previous session id to resume an interrupted upload.
+export const uploadEvidenceResumable = async (
+  target,
+  parentId,
+  file,
+  { evidenceType = "VIDEO", description = "", sessionId = null, onProgress } = {}
+) => {
+  const session = sessionId
+    ? await getUploadSession(sessionId)
+    : await createUploadSession({
+        target,
+        [target === "ISSUE_EVIDENCE" ? "issue" : "rating"]: parentId,
+        evidence_type: evidenceType,
+        description,
+        filename: file.name,
+        total_size: file.size,
+      });
+
+  let offset = session.received_size;
+  let retries = 0;
+  while (offset < file.size) {
+    try {
+      const response = await sendChunk(session, file, offset);
+      offset = response.data.received_size;
+      retries = 0;
+      if (onProgress) onProgress(offset / file.size, session.id);
+    } catch (error) {
+      if (retries >= MAX_RETRIES) throw error;
+      retries += 1;
+      // Ask the server where to resume (also covers 409 offset mismatches)
+      offset = (await getUploadSession(session.id)).received_size;
+    }
+  }
+
+  const response = await api.post(`upload-sessions/${session.id}/finalize/`);
+  return response.data;
+};
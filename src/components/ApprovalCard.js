@@ -15,6 +15,21 @@ function ApprovalCard({ progress, onApprove, onReject, projectName }) {
         <p><strong>Financial Progress:</strong> {progress.financial_progress}%</p>
       </div>
 
+      {progress.duplicate_images && progress.duplicate_images.length > 0 && (
+        <div className="duplicate-warning">
+          <strong>⚠️ Possible reused photos</strong>
+          {progress.duplicate_images.map((flag) => (
+            <p key={flag.image}>
+              Image #{flag.image} matches{' '}
+              {flag.matches.map((match) => (
+                `${match.source_model} #${match.source_id}` +
+                (match.project ? ` (project ${match.project})` : '')
+              )).join(', ')}
+            </p>
+          ))}
+        </div>
+      )}
+
       <div className="approval-actions">
         <button 
           className="approve-btn"
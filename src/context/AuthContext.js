@@ -1,5 +1,6 @@
 import React, { createContext, useState, useEffect, useContext } from 'react';
 import axios from '../api/axios';
+import { clearSyncCache } from '../api/sync.api';
 
 const AuthContext = createContext();
 
@@ -44,6 +45,8 @@ export const AuthProvider = ({ children }) => {
     localStorage.setItem('token', access);
     localStorage.setItem('user', JSON.stringify(userData));
     localStorage.setItem('role', userRole);
+    // The cached sync feeds were fetched for whoever was signed in before
+    clearSyncCache();
 
     // Set default authorization header
     axios.defaults.headers.common['Authorization'] = `Bearer ${access}`;
@@ -57,6 +60,7 @@ export const AuthProvider = ({ children }) => {
     localStorage.removeItem('token');
     localStorage.removeItem('user');
     localStorage.removeItem('role');
+    clearSyncCache();
 
     delete axios.defaults.headers.common['Authorization'];
   };
@@ -5,6 +5,7 @@ import { getPendingProgress, approveProgress, rejectProgress } from '../api/prog
 import { getProjects } from '../api/projects.api';
 import { getSuspendedContractors } from '../api/contractor.api';
 import { getIssues } from '../api/issues.api';
+import { subscribeToActivity } from '../api/events.api';
 
 function GovernmentDashboard() {
   const [pendingProgress, setPendingProgress] = useState([]);
@@ -17,6 +18,8 @@ function GovernmentDashboard() {
 
   useEffect(() => {
     fetchData();
+    // ✅ Live Activity - Refresh when submissions, reviews or suspensions happen
+    return subscribeToActivity(() => fetchData());
   }, []);
 
   const fetchData = async () => {
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { getProjects } from '../api/projects.api';
+import { getPublicProjects } from '../api/projects.api';
 
 function PublicDashboard() {
   const [projects, setProjects] = useState([]);
@@ -12,7 +12,7 @@ function PublicDashboard() {
 
   const fetchProjects = async () => {
     try {
-      const data = await getProjects();
+      const data = await getPublicProjects();
       setProjects(data);
     } catch (error) {
       console.error('Error fetching projects:', error);
@@ -28,6 +28,7 @@ function PublicDashboard() {
   );
 
   const calculateProgress = (project) => {
+    if (project.latest_physical_progress !== undefined) return project.latest_physical_progress;
     if (!project.progress || project.progress.length === 0) return 0;
     const latestProgress = project.progress[project.progress.length - 1];
     return latestProgress.physical_progress || 0;
@@ -78,7 +78,7 @@ EOF
 
 echo ""
 echo "=========================================="
-echo "🚀 Starting Django Development Server"
+echo "🚀 Starting Django Development Server (ASGI)"
 echo "=========================================="
 echo ""
 echo "Backend API will be available at:"
@@ -87,4 +87,4 @@ echo ""
 echo "Press CTRL+C to stop the server"
 echo ""
 
-python manage.py runserver 8000
+uvicorn fundtracker.asgi:application --host 127.0.0.1 --port 8000 --reload